@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from .annealing import (
+    DEFAULT_NUM_REPLICAS,
+    DEFAULT_NUM_SWEEPS,
+    MetropolisSweeper,
+    beta_schedule,
+    default_beta_range,
+    simulated_annealing,
+)
+from .tempering import DEFAULT_NUM_TEMPERATURES, parallel_tempering
+
+__all__ = [
+    "DEFAULT_NUM_REPLICAS",
+    "DEFAULT_NUM_SWEEPS",
+    "DEFAULT_NUM_TEMPERATURES",
+    "MetropolisSweeper",
+    "beta_schedule",
+    "default_beta_range",
+    "parallel_tempering",
+    "simulated_annealing",
+]
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+import numpy as np
+import scipy.sparse
+import torch
+
+from qubosolver.qubo_types import StorageType
+from qubosolver.utils.sparse import is_sparse, sparse_diagonal, sparse_entries, to_storage
+
+# Default number of Metropolis sweeps of simulated annealing
+DEFAULT_NUM_SWEEPS: int = 1000
+
+# Default number of independent replicas of simulated annealing
+DEFAULT_NUM_REPLICAS: int = 100
+
+# Number of consecutive variables of a dense QUBO whose local-field updates are
+# delayed and applied with one matrix product
+DENSE_BLOCK_SIZE: int = 64
+
+
+def _color_classes(rows: np.ndarray, cols: np.ndarray, size: int) -> list[np.ndarray]:
+    """
+    Greedily colors the interaction graph of a sparse QUBO.
+
+    Variables of a color class do not interact, so they can be flipped simultaneously
+    without changing each other's flip energies.
+
+    Args:
+        rows (np.ndarray): Row indices of the off-diagonal non-zero entries, sorted.
+        cols (np.ndarray): Column indices of the off-diagonal non-zero entries.
+        size (int): Number of variables.
+
+    Returns:
+        list[np.ndarray]: Indices of the variables of each class.
+    """
+    row_ptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=size))))
+    colors = np.full(size, -1)
+    for i in range(size):
+        used = colors[cols[row_ptr[i] : row_ptr[i + 1]]]
+        colors[i] = np.setdiff1d(np.arange(used.size + 1), used)[0]
+    return [np.flatnonzero(colors == color) for color in range(colors.max(initial=-1) + 1)]
+
+
+class MetropolisSweeper:
+    """
+    Metropolis single-flip sweeps over many replicas of a QUBO at once.
+
+    The states of all replicas are stored column-wise in an (n, replicas) array
+    together with their local fields h = Q x. A sweep visits every variable once and
+    proposes its flip to all replicas simultaneously:
+
+    - for sparse instances, the variables are grouped in classes of non-interacting
+      variables which are flipped together, and the local fields are updated with
+      one sparse matrix product per class;
+    - for dense instances, the variables are visited in blocks: the fields are
+      corrected within the block with its small diagonal sub-matrix, and the
+      updates of the whole block are applied with one matrix product.
+
+    Flipping bit i changes the energy by delta_i = (1 - 2 x_i) (Q_ii + 2 h'_i), where
+    h'_i excludes the diagonal term. The engine is built once per QUBO matrix and is
+    shared by the annealing-based solvers, each replica having its own inverse
+    temperature.
+    """
+
+    def __init__(self, coefficients: torch.Tensor):
+        """
+        Prepare the sweeps for a given QUBO matrix.
+
+        Args:
+            coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+                dense or sparse (COO or CSR).
+        """
+        self.size: int = int(coefficients.shape[0])
+        self.sparse: bool = is_sparse(coefficients)
+        self.diagonal: np.ndarray = sparse_diagonal(coefficients).cpu().numpy().astype(np.float64)
+
+        if self.sparse:
+            csr = to_storage(coefficients.cpu(), StorageType.CSR)
+            self.matrix: np.ndarray | scipy.sparse.csr_matrix = scipy.sparse.csr_matrix(
+                (
+                    csr.values().numpy().astype(np.float64),
+                    csr.col_indices().numpy(),
+                    csr.crow_indices().numpy(),
+                ),
+                shape=(self.size, self.size),
+            )
+            # Off-diagonal part, whose columns give the field updates of each class
+            off_diagonal = (self.matrix - scipy.sparse.diags(self.diagonal)).tocsc()
+            coo = off_diagonal.tocsr().tocoo()
+            self.classes = _color_classes(coo.row, coo.col, self.size)
+            self._blocks = [off_diagonal[:, members].tocsr() for members in self.classes]
+        else:
+            self.matrix = coefficients.detach().cpu().numpy().astype(np.float64)
+            off_diagonal_dense = self.matrix - np.diag(self.diagonal)
+            self.classes = [
+                np.arange(start, min(start + DENSE_BLOCK_SIZE, self.size))
+                for start in range(0, self.size, DENSE_BLOCK_SIZE)
+            ]
+            self._blocks = [
+                np.ascontiguousarray(off_diagonal_dense[:, members]) for members in self.classes
+            ]
+
+    def fields(self, x: np.ndarray) -> np.ndarray:
+        """
+        Computes the off-diagonal local fields of a batch of states.
+
+        Args:
+            x (np.ndarray): States of shape (n, replicas).
+
+        Returns:
+            np.ndarray: Fields sum_{j != i} Q_ij x_j, of shape (n, replicas).
+        """
+        return np.asarray(self.matrix @ x) - self.diagonal[:, None] * x  # type: ignore[no-any-return]
+
+    def energies(self, x: np.ndarray, field: np.ndarray) -> np.ndarray:
+        """
+        Computes the energies x^T Q x of a batch of states from their local fields.
+
+        Args:
+            x (np.ndarray): States of shape (n, replicas).
+            field (np.ndarray): Off-diagonal local fields of shape (n, replicas).
+
+        Returns:
+            np.ndarray: Energies of shape (replicas,).
+        """
+        return (x * (field + self.diagonal[:, None])).sum(axis=0)  # type: ignore[no-any-return]
+
+    def sweep(
+        self, x: np.ndarray, field: np.ndarray, beta: np.ndarray, rng: np.random.Generator
+    ) -> None:
+        """
+        Applies one Metropolis sweep to all replicas, in place.
+
+        Args:
+            x (np.ndarray): States of shape (n, replicas), updated in place.
+            field (np.ndarray): Off-diagonal local fields of shape (n, replicas),
+                updated in place.
+            beta (np.ndarray): Inverse temperature of each replica, of shape (replicas,).
+            rng (np.random.Generator): Random generator.
+        """
+        # A flip is accepted when delta < -log(u) / beta, u ~ U[0, 1)
+        with np.errstate(divide="ignore"):
+            thresholds = -np.log(rng.random(x.shape)) / beta
+
+        for members, block in zip(self.classes, self._blocks):
+            if self.sparse:
+                sign = 1.0 - 2.0 * x[members]
+                delta = sign * (self.diagonal[members, None] + 2.0 * field[members])
+                step = sign * (delta < thresholds[members])
+                x[members] += step
+                field += block @ step
+                continue
+
+            # Dense block: sequential flips, with the fields corrected by the earlier
+            # flips of the block, then one update of all the fields
+            start = int(members[0])
+            steps = np.zeros((members.size, x.shape[1]))
+            inner = block[start : start + members.size]
+            for k in range(members.size):
+                i = start + k
+                h = field[i] + inner[k, :k] @ steps[:k] if k else field[i]
+                sign = 1.0 - 2.0 * x[i]
+                step = sign * (sign * (self.diagonal[i] + 2.0 * h) < thresholds[i])
+                x[i] += step
+                steps[k] = step
+            field += block @ steps
+
+
+def default_beta_range(coefficients: torch.Tensor) -> tuple[float, float]:
+    """
+    Derives an inverse-temperature range from the magnitudes of the flip energies.
+
+    The hot end accepts the largest possible uphill flip with probability 1/2, the
+    cold end accepts the smallest one with probability 1/100.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n).
+
+    Returns:
+        tuple[float, float]: Initial (hot) and final (cold) inverse temperatures.
+    """
+    rows, cols, values = (t.cpu() for t in sparse_entries(coefficients))
+    magnitudes = values.abs().to(torch.float64) * torch.where(rows == cols, 1.0, 2.0)
+    if magnitudes.numel() == 0:
+        return 1.0, 1.0
+
+    max_delta = torch.zeros(coefficients.shape[0], dtype=torch.float64)
+    max_delta.index_add_(0, rows, magnitudes)
+    hot = math.log(2) / float(max_delta.max())
+    cold = math.log(100) / float(magnitudes.min())
+    return hot, max(hot, cold)
+
+
+def beta_schedule(
+    beta_range: tuple[float, float], num_sweeps: int, schedule_type: str = "geometric"
+) -> np.ndarray:
+    """
+    Builds the inverse temperature of each sweep.
+
+    Args:
+        beta_range (tuple[float, float]): Initial and final inverse temperatures.
+        num_sweeps (int): Number of sweeps.
+        schedule_type (str, optional): "linear" or "geometric" interpolation.
+            Defaults to "geometric".
+
+    Returns:
+        np.ndarray: Inverse temperatures of shape (num_sweeps,).
+    """
+    beta_min, beta_max = beta_range
+    if schedule_type == "linear":
+        return np.linspace(beta_min, beta_max, num_sweeps)
+    if schedule_type == "geometric":
+        return np.geomspace(beta_min, beta_max, num_sweeps)
+    raise ValueError(f"Unknown beta schedule type: {schedule_type}")
+
+
+def simulated_annealing(
+    coefficients: torch.Tensor,
+    num_replicas: int,
+    num_sweeps: int = DEFAULT_NUM_SWEEPS,
+    beta_range: tuple[float, float] | None = None,
+    schedule_type: str = "geometric",
+    seed: int | None = None,
+    stop_callback: Callable[[float], bool] | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Runs simulated annealing on independent replicas of a QUBO at once.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        num_replicas (int): Number of independent replicas (samples).
+        num_sweeps (int, optional): Number of Metropolis sweeps.
+            Defaults to `DEFAULT_NUM_SWEEPS`.
+        beta_range (tuple[float, float] | None, optional): Initial and final inverse
+            temperatures. Defaults to None, derived with `default_beta_range`.
+        schedule_type (str, optional): "linear" or "geometric" interpolation of the
+            inverse temperature. Defaults to "geometric".
+        seed (int | None, optional): Seed for reproducible runs. Defaults to None.
+        stop_callback (Callable[[float], bool] | None, optional): Called after each
+            sweep with the lowest energy of the replicas; the annealing stops early
+            when it returns True. Defaults to None.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Final states of shape (num_replicas, n)
+            and their costs.
+    """
+    rng = np.random.default_rng(seed)
+    sweeper = MetropolisSweeper(coefficients)
+    betas = beta_schedule(beta_range or default_beta_range(coefficients), num_sweeps, schedule_type)
+
+    x = rng.integers(0, 2, (sweeper.size, num_replicas)).astype(np.float64)
+    field = sweeper.fields(x)
+    replica_betas = np.empty(num_replicas)
+    for beta in betas:
+        replica_betas.fill(beta)
+        sweeper.sweep(x, field, replica_betas, rng)
+        if stop_callback is not None and stop_callback(float(sweeper.energies(x, field).min())):
+            break
+
+    costs = sweeper.energies(x, sweeper.fields(x))
+    return (
+        torch.from_numpy(x.T.copy()).to(torch.float32),
+        torch.from_numpy(costs).to(torch.float32),
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+import numpy as np
+import torch
+
+from qubosolver.algorithms.annealing.annealing import (
+    DEFAULT_NUM_SWEEPS,
+    MetropolisSweeper,
+    beta_schedule,
+    default_beta_range,
+)
+
+# Default number of temperature replicas of parallel tempering
+DEFAULT_NUM_TEMPERATURES: int = 16
+
+
+def parallel_tempering(
+    coefficients: torch.Tensor,
+    num_replicas: int = DEFAULT_NUM_TEMPERATURES,
+    num_sweeps: int = DEFAULT_NUM_SWEEPS,
+    beta_range: tuple[float, float] | None = None,
+    exchange_interval: int = 1,
+    time_limit: float | None = None,
+    target_energy: float | None = None,
+    stagnation_sweeps: int | None = None,
+    seed: int | None = None,
+    stop_callback: Callable[[float], bool] | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Runs parallel tempering (replica exchange) on a QUBO.
+
+    One replica per inverse temperature of a geometric ladder is swept with
+    Metropolis moves, all replicas at once. Every `exchange_interval` sweeps,
+    replicas at adjacent temperatures swap temperatures with probability
+    min(1, exp((beta_k - beta_{k+1}) (E_k - E_{k+1}))), alternating between even and
+    odd pairs, so that good states reach the cold end while the hot replicas keep
+    exploring. The best state visited by each replica is tracked.
+
+    The run stops after `num_sweeps` sweeps, or earlier when the time limit is
+    reached, when a state at or below the target energy is found, when the best
+    energy has not improved for `stagnation_sweeps` sweeps, or when `stop_callback`
+    returns True.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        num_replicas (int, optional): Number of temperatures.
+            Defaults to `DEFAULT_NUM_TEMPERATURES`.
+        num_sweeps (int, optional): Maximal number of sweeps.
+            Defaults to `DEFAULT_NUM_SWEEPS`.
+        beta_range (tuple[float, float] | None, optional): Hottest and coldest inverse
+            temperatures. Defaults to None, derived with `default_beta_range`.
+        exchange_interval (int, optional): Number of sweeps between exchange attempts.
+            Defaults to 1.
+        time_limit (float | None, optional): Wall-clock budget in seconds.
+            Defaults to None (no limit).
+        target_energy (float | None, optional): Energy at which the search stops.
+            Defaults to None.
+        stagnation_sweeps (int | None, optional): Number of sweeps without improvement
+            of the best energy after which the search stops. Defaults to None.
+        seed (int | None, optional): Seed for reproducible runs. Defaults to None.
+        stop_callback (Callable[[float], bool] | None, optional): Called after each
+            sweep with the best energy so far; the search stops when it returns True.
+            Defaults to None.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Best state visited by each replica, of
+            shape (num_replicas, n), and their costs.
+    """
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    sweeper = MetropolisSweeper(coefficients)
+    ladder = beta_schedule(beta_range or default_beta_range(coefficients), num_replicas)
+
+    # Replica r runs at inverse temperature ladder[level[r]]; exchanges swap levels
+    # instead of moving states around
+    level = np.arange(num_replicas)
+    replica_at = np.arange(num_replicas)
+    x = rng.integers(0, 2, (sweeper.size, num_replicas)).astype(np.float64)
+    field = sweeper.fields(x)
+    energies = sweeper.energies(x, field)
+    best_x, best_energies = x.copy(), energies.copy()
+    best_energy, last_improvement = best_energies.min(), 0
+
+    for sweep in range(1, num_sweeps + 1):
+        sweeper.sweep(x, field, ladder[level], rng)
+        energies = sweeper.energies(x, field)
+
+        improved = energies < best_energies
+        best_x[:, improved] = x[:, improved]
+        best_energies[improved] = energies[improved]
+        if best_energies.min() < best_energy:
+            best_energy, last_improvement = best_energies.min(), sweep
+
+        if sweep % exchange_interval == 0 and num_replicas > 1:
+            # Attempt the exchanges of the pairs (k, k + 1) of a given parity
+            lower = np.arange((sweep // exchange_interval) % 2, num_replicas - 1, 2)
+            cold, hot = replica_at[lower + 1], replica_at[lower]
+            log_ratio = (ladder[lower + 1] - ladder[lower]) * (energies[cold] - energies[hot])
+            accepted = rng.random(lower.size) < np.exp(np.minimum(log_ratio, 0.0))
+            swapped = lower[accepted]
+            replica_at[swapped], replica_at[swapped + 1] = (
+                replica_at[swapped + 1],
+                replica_at[swapped],
+            )
+            level[replica_at] = np.arange(num_replicas)
+
+        if (
+            (target_energy is not None and best_energy <= target_energy)
+            or (stagnation_sweeps is not None and sweep - last_improvement >= stagnation_sweeps)
+            or (time_limit is not None and time.perf_counter() - start_time >= time_limit)
+            or (stop_callback is not None and stop_callback(float(best_energy)))
+        ):
+            break
+
+    # Recompute the costs exactly, free of the rounding of the incremental fields
+    costs = sweeper.energies(best_x, sweeper.fields(best_x))
+    return (
+        torch.from_numpy(best_x.T.copy()).to(torch.float32),
+        torch.from_numpy(costs).to(torch.float32),
+    )
@@ -8,7 +8,7 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 from pulser.devices._device_datacls import BaseDevice
 
-from ._helpers import interaction, distance_matrix_from_positions
+from qubosolver.utils.embedding_quality import embedded_interactions
 
 
 def compute_best_scaling_for_qubo(
@@ -68,12 +68,7 @@ def compute_best_scaling_for_qubo(
 def compute_best_scaling_for_pos(
     target_qubo: np.ndarray, positions: np.ndarray, device: BaseDevice, plot: bool = False
 ) -> Any:
-    distance_matrix = distance_matrix_from_positions(positions)
-
-    current_weights = np.vectorize(interaction, excluded=["device"], signature="(m,n)->(m,n)")(
-        device=device, dist=distance_matrix
-    )
-    current_weights = np.triu(current_weights, k=1)
+    current_weights = np.triu(embedded_interactions(positions, device).numpy(), k=1)
 
     return compute_best_scaling_for_qubo(
         target_qubo=target_qubo, embedded_qubo=current_weights, plot=plot
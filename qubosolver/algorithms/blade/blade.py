@@ -21,6 +21,7 @@ from ._helpers import find_center, distance_matrix_from_positions
 from ._interactions_forces import compute_interaction_forces
 from ._qubo_mapper import Qubo
 from .drawing import draw_graph_including_actual_weights
+from qubosolver.utils.embedding_quality import embedding_mismatch
 
 logger = logging.getLogger(__name__)
 
@@ -260,6 +261,8 @@ def evolve_with_forces_through_dim_change(
             print(
                 f"After {scaling=}, max/min is {np.max(scipy.spatial.distance.pdist(positions))}/{np.min(scipy.spatial.distance.pdist(positions))} with target {max_dist}/{min_dist}"
             )
+            mismatch = embedding_mismatch(dist_constr_calc.target_qubo, positions, device)
+            print(f"Mismatch with the target QUBO is {float(mismatch)}")
         assert not np.any(np.isinf(positions)) and not np.any(np.isnan(positions))
 
         positions = update_positions(
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from .exact import (
+    BLOCK_SIZE,
+    MAX_ENUMERATION_SIZE,
+    branch_and_bound,
+    brute_force,
+    exact_solve,
+)
+
+__all__ = [
+    "BLOCK_SIZE",
+    "MAX_ENUMERATION_SIZE",
+    "branch_and_bound",
+    "brute_force",
+    "exact_solve",
+]
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import torch
+
+from qubosolver.qubo_types import StorageType
+from qubosolver.utils.sparse import to_storage
+
+# Largest QUBO solved by exhaustive enumeration, branch-and-bound being used beyond it
+MAX_ENUMERATION_SIZE: int = 30
+
+# Number of variables whose 2**BLOCK_SIZE states are evaluated by one matrix product
+BLOCK_SIZE: int = 16
+
+# Number of consecutive Gray-code states of the other variables evaluated together
+GRAY_CODE_BATCH: int = 32
+
+
+def _dense(coefficients: torch.Tensor) -> np.ndarray:
+    """Returns the QUBO matrix as a dense float64 array."""
+    return to_storage(coefficients.detach().cpu(), StorageType.DENSE).numpy().astype(np.float64)
+
+
+def _bits(codes: np.ndarray, size: int) -> np.ndarray:
+    """Returns the binary states of shape (len(codes), size) whose bit j is bit j of the code."""
+    return ((codes[:, None] >> np.arange(size)) & 1).astype(np.float64)
+
+
+class _BestStates:
+    """
+    The k lowest-energy states seen by an exact search.
+
+    A state is split into the variables branched on or walked in Gray-code order
+    (the outer bits) and the block of variables enumerated at once (an index into
+    the states of the block).
+    """
+
+    def __init__(self, k: int, num_outer: int):
+        self.k = k
+        self.energies = np.empty(0)
+        self.outer = np.empty((0, num_outer))
+        self.inner = np.empty(0, dtype=np.int64)
+
+    @property
+    def threshold(self) -> float:
+        """Energy a state must beat to enter, infinite until k states are known."""
+        return float(self.energies.max()) if self.energies.size == self.k else np.inf
+
+    def add(self, energies: np.ndarray, outer: np.ndarray) -> None:
+        """
+        Offers the states of a block product.
+
+        Args:
+            energies (np.ndarray): Energies of shape (block states, len(outer)).
+            outer (np.ndarray): Outer bits of the columns, of shape (columns, num_outer).
+        """
+        if energies.min() >= self.threshold:
+            return
+        flat = energies.ravel()
+        if flat.size > self.k:
+            candidates = np.argpartition(flat, self.k - 1)[: self.k]
+        else:
+            candidates = np.arange(flat.size)
+        inner, column = np.divmod(candidates, energies.shape[1])
+
+        merged = np.concatenate([self.energies, flat[candidates]])
+        kept = np.argsort(merged, kind="stable")[: self.k]
+        self.energies = merged[kept]
+        self.outer = np.concatenate([self.outer, outer[column]])[kept]
+        self.inner = np.concatenate([self.inner, inner])[kept]
+
+    def solution(
+        self, Q: np.ndarray, order: np.ndarray, inner_states: np.ndarray
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Returns the states in the original variable order, sorted by exact cost."""
+        num_outer = self.outer.shape[1]
+        x = np.zeros((self.energies.size, Q.shape[0]))
+        x[:, order[:num_outer]] = self.outer
+        x[:, order[num_outer:]] = inner_states[self.inner]
+        costs = ((x @ Q) * x).sum(1)
+        ranking = np.argsort(costs, kind="stable")
+        return (
+            torch.from_numpy(x[ranking]).to(torch.float32),
+            torch.from_numpy(costs[ranking]).to(torch.float32),
+        )
+
+
+def _inner_block(Q: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns every state of the last `size` variables, and the matrix evaluating them.
+
+    Row s of the matrix is (x_s, x_s^T Q x_s, 1), so that its product with a column
+    (f, 1, e) gives the energies of the block states with fields f on the block from
+    the other variables, whose own energy is e.
+    """
+    states = _bits(np.arange(2**size, dtype=np.int64), size)
+    block = Q[Q.shape[0] - size :, Q.shape[0] - size :]
+    energies = ((states @ block) * states).sum(1)
+    return states, np.column_stack([states, energies, np.ones(len(states))])
+
+
+def brute_force(
+    coefficients: torch.Tensor,
+    top_k: int = 1,
+    block_size: int = BLOCK_SIZE,
+    time_limit: float | None = None,
+) -> tuple[torch.Tensor, torch.Tensor, bool]:
+    """
+    Finds the lowest-energy states of a QUBO by exhaustive enumeration.
+
+    The last `block_size` variables form a block whose states are all evaluated by
+    matrix products. The other variables are walked in Gray-code order, so that
+    each step flips a single bit and updates their energy and their field on the
+    block incrementally; the fields of `GRAY_CODE_BATCH` consecutive steps are
+    evaluated against the block together.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        top_k (int, optional): Number of lowest-energy states returned. Defaults to 1.
+        block_size (int, optional): Number of variables enumerated at once.
+            Defaults to `BLOCK_SIZE`.
+        time_limit (float | None, optional): Wall-clock budget in seconds, after which
+            the best states found so far are returned. Defaults to None (no limit).
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor, bool]: The `top_k` lowest-energy states of
+            shape (top_k, n) sorted by cost, their costs, and whether the enumeration
+            completed, i.e. whether they are exact.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    Q = _dense(coefficients)
+    size = min(Q.shape[0], block_size)
+    num_outer = Q.shape[0] - size
+    inner_states, evaluation = _inner_block(Q, size)
+
+    outer = Q[:num_outer, :num_outer].copy()
+    diagonal = outer.diagonal().copy()
+    np.fill_diagonal(outer, 0.0)
+    coupling = 2.0 * Q[num_outer:, :num_outer]
+
+    y = np.zeros(num_outer)
+    field = np.zeros(num_outer)
+    # Fields of the outer variables on the block, followed by 1 and their energy
+    column = np.zeros(size + 2)
+    column[size] = 1.0
+    best = _BestStates(top_k, num_outer)
+
+    num_steps = 2**num_outer
+    batch = min(GRAY_CODE_BATCH, num_steps)
+    columns = np.empty((size + 2, batch))
+    codes = np.empty(batch, dtype=np.int64)
+    filled = 0
+    complete = True
+    for step in range(num_steps):
+        if step > 0:
+            # The Gray code of step differs from the previous one by its lowest set bit
+            k = (step & -step).bit_length() - 1
+            sign = 1.0 - 2.0 * y[k]
+            column[size + 1] += sign * (diagonal[k] + 2.0 * field[k])
+            column[:size] += sign * coupling[:, k]
+            field += sign * outer[:, k]
+            y[k] += sign
+        columns[:, filled] = column
+        codes[filled] = step ^ (step >> 1)
+        filled += 1
+
+        if filled == batch or step == num_steps - 1:
+            best.add(evaluation @ columns[:, :filled], _bits(codes[:filled], num_outer))
+            filled = 0
+            if deadline is not None and time.perf_counter() >= deadline:
+                complete = step == num_steps - 1
+                break
+
+    bitstrings, costs = best.solution(Q, np.arange(Q.shape[0]), inner_states)
+    return bitstrings, costs, complete
+
+
+def branch_and_bound(
+    coefficients: torch.Tensor,
+    top_k: int = 1,
+    block_size: int = BLOCK_SIZE,
+    time_limit: float | None = None,
+) -> tuple[torch.Tensor, torch.Tensor, bool]:
+    """
+    Finds the lowest-energy states of a QUBO by depth-first branch-and-bound.
+
+    Variables are branched on by decreasing total coupling strength, exploring first
+    the value with the lower energy. Given the fixed variables, each free variable i
+    contributes at least min(0, Q_ii + f_i + sum_{j > i} min(0, 2 Q_ij)), f_i being
+    its field from the fixed variables, and subtrees whose bound does not beat the
+    k-th best energy found are pruned. The last `block_size` variables are not
+    branched on but enumerated at once at the leaves.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        top_k (int, optional): Number of lowest-energy states returned. Defaults to 1.
+        block_size (int, optional): Number of variables enumerated at the leaves.
+            Defaults to `BLOCK_SIZE`.
+        time_limit (float | None, optional): Wall-clock budget in seconds, after which
+            the best states found so far are returned. Defaults to None (no limit).
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor, bool]: The `top_k` lowest-energy states of
+            shape (top_k, n) sorted by cost, their costs, and whether the search
+            completed, i.e. whether they are exact.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    Q = _dense(coefficients)
+    order = np.argsort(-np.abs(Q).sum(1), kind="stable")
+    P = Q[np.ix_(order, order)]
+    size = min(P.shape[0], block_size)
+    num_outer = P.shape[0] - size
+    inner_states, evaluation = _inner_block(P, size)
+
+    diagonal = P.diagonal().copy()
+    couplings = 2.0 * P
+    np.fill_diagonal(couplings, 0.0)
+    # Lowest total contribution of the couplings of each variable with the next ones
+    negative = np.triu(np.minimum(couplings, 0.0), 1).sum(1)
+    best = _BestStates(top_k, num_outer)
+
+    # Nodes are (depth, values of the branched variables, their energy, their fields)
+    stack = [(0, np.zeros(num_outer), 0.0, np.zeros(P.shape[0]))]
+    complete = True
+    while stack:
+        if deadline is not None and time.perf_counter() >= deadline:
+            complete = False
+            break
+        depth, y, energy, field = stack.pop()
+        free = slice(depth, None)
+        bound = energy + np.minimum(0.0, diagonal[free] + field[free] + negative[free]).sum()
+        if bound >= best.threshold:
+            continue
+
+        if depth == num_outer:
+            column = np.concatenate([field[num_outer:], [1.0, energy]])
+            best.add(evaluation @ column[:, None], y[None, :])
+            continue
+
+        linear = diagonal[depth] + field[depth]
+        one = y.copy()
+        one[depth] = 1.0
+        children = [
+            (depth + 1, y, energy, field),
+            (depth + 1, one, energy + linear, field + couplings[depth]),
+        ]
+        # The last child pushed is explored first
+        stack.extend(children if linear < 0 else children[::-1])
+
+    bitstrings, costs = best.solution(Q, order, inner_states)
+    return bitstrings, costs, complete
+
+
+def exact_solve(
+    coefficients: torch.Tensor,
+    top_k: int = 1,
+    max_enumeration_size: int = MAX_ENUMERATION_SIZE,
+    time_limit: float | None = None,
+) -> tuple[torch.Tensor, torch.Tensor, bool]:
+    """
+    Finds the lowest-energy states of a QUBO exactly.
+
+    Instances of at most `max_enumeration_size` variables are enumerated with
+    `brute_force`, larger ones are solved with `branch_and_bound`.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        top_k (int, optional): Number of lowest-energy states returned. Defaults to 1.
+        max_enumeration_size (int, optional): Largest size solved by enumeration.
+            Defaults to `MAX_ENUMERATION_SIZE`.
+        time_limit (float | None, optional): Wall-clock budget in seconds, after which
+            the best states found so far are returned. Defaults to None (no limit).
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor, bool]: The `top_k` lowest-energy states of
+            shape (top_k, n) sorted by cost, their costs, and whether the search
+            completed, i.e. whether they are exact.
+    """
+    if coefficients.shape[0] <= max_enumeration_size:
+        return brute_force(coefficients, top_k, time_limit=time_limit)
+    return branch_and_bound(coefficients, top_k, time_limit=time_limit)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from .greedy import Greedy
+from .greedy import Greedy, LazyMismatch
 
 __all__ = [
     "Greedy",
+    "LazyMismatch",
 ]
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-import copy
 import typing
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Tuple, overload
 
 import torch
 from pulser.register.register_layout import RegisterLayout
 from qoolqit._solvers.types import DeviceType
 
-from qubosolver.qubo_types import LayoutType
+from qubosolver.qubo_types import GreedyStrategyType, LayoutType
+from qubosolver.utils.embedding_quality import embedded_interactions, embedding_mismatch
+
+# Relative difference below which the total mismatches of two embeddings are tied
+DISTANCE_RTOL: float = 1e-6
 
 # Optional imports for animation; guarded so library usage stays safe in non-notebook envs.
 try:
@@ -19,6 +24,55 @@ except Exception:
     _VIZ_OK = False
 
 
+class LazyMismatch:
+    """
+    Node-node vs trap-trap mismatch Z[i, j, p, q] = |Q[i, j] - U[p, q]|, evaluated
+    on demand from Q and the trap interaction matrix U.
+
+    It stands in for the dense tensor of `Greedy.precompute_coefficients`, whose
+    (n_nodes, n_nodes, n_traps, n_traps) entries do not fit in memory for large
+    instances, while only Q and U are stored here.
+    """
+
+    def __init__(self, Q: torch.Tensor, U: torch.Tensor):
+        self.Q = Q
+        self.U = U
+
+    @property
+    def shape(self) -> tuple[int, int, int, int]:
+        n_nodes, n_traps = self.Q.shape[0], self.U.shape[0]
+        return (n_nodes, n_nodes, n_traps, n_traps)
+
+    def _mismatch(self, coupling: torch.Tensor, interaction: torch.Tensor) -> torch.Tensor:
+        # Same promotion and rounding as the dense tensor, stored in float32
+        return torch.abs(coupling - interaction).to(torch.float32)
+
+    def __getitem__(self, index: tuple[int, int, int, int]) -> torch.Tensor:
+        i, j, p, q = index
+        if p == q:
+            return torch.zeros((), dtype=torch.float32)
+        return self._mismatch(self.Q[i, j], self.U[p, q])
+
+    def candidate_sums(
+        self, u: int, placed: torch.Tensor, placed_traps: torch.Tensor, traps: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Incremental mismatch of node u on each candidate trap, with one gather-and-reduce.
+
+        Args:
+            u (int): The node to place.
+            placed (torch.Tensor): The placed nodes, of shape (k,).
+            placed_traps (torch.Tensor): Their traps, of shape (k,).
+            traps (torch.Tensor): The candidate traps, none of them used, of shape (m,).
+
+        Returns:
+            torch.Tensor: sum_j Z[u, placed[j], p, placed_traps[j]] for each candidate
+                trap p, of shape (m,), in float64.
+        """
+        mismatch = self._mismatch(self.Q[u, placed][None, :], self.U[traps][:, placed_traps])
+        return mismatch.to(torch.float64).sum(1)
+
+
 @typing.no_type_check
 class Greedy:
     """
@@ -31,10 +85,13 @@ class Greedy:
     Adds:
       - optional `on_step(state: dict)` callback for instrumentation
       - post-run animation when params["animation"] or params["draw_steps"] is True
+      - greedy passes from the start nodes run in a thread pool, or batched as tensors
     """
 
-    MAPPING_COORDS_POSITIONS: dict = {}
-    MAPPING_POSITIONS_COORDS: dict = {}
+    # Read-only maps coord <-> trap index of the layout, set per instance by
+    # `get_predefined_coordinates`, so that concurrent passes can share them
+    MAPPING_COORDS_POSITIONS: Mapping[tuple, int] = MappingProxyType({})
+    MAPPING_POSITIONS_COORDS: Mapping[int, Any] = MappingProxyType({})
 
     # ----------------------------
     # Layout utilities
@@ -63,11 +120,10 @@ class Greedy:
             layout = LayoutType.SQUARE.value(n, n, spacing=spacing)
 
         # build fast maps coord <-> trap index
-        self.MAPPING_COORDS_POSITIONS.clear()
-        self.MAPPING_POSITIONS_COORDS.clear()
-        for i, coord in enumerate(layout.coords):
-            self.MAPPING_COORDS_POSITIONS[tuple(coord)] = i
-            self.MAPPING_POSITIONS_COORDS[i] = coord
+        self.MAPPING_COORDS_POSITIONS = MappingProxyType(
+            {tuple(coord): i for i, coord in enumerate(layout.coords)}
+        )
+        self.MAPPING_POSITIONS_COORDS = MappingProxyType(dict(enumerate(layout.coords)))
 
         return layout, torch.tensor(layout.coords)
 
@@ -85,14 +141,7 @@ class Greedy:
         n_traps = len(coordinates)
 
         # Physical interaction matrix U on traps
-        U = torch.zeros((n_traps, n_traps), dtype=torch.float32)
-        for p in range(n_traps):
-            for q in range(p + 1, n_traps):
-                U[p, q] = (
-                    params["device"].interaction_coeff
-                    / torch.norm(coordinates[p] - coordinates[q]) ** 6
-                )
-                U[q, p] = U[p, q]
+        U = self.precompute_interactions(coordinates, params)
 
         # Z: node-node vs trap-trap mismatch
         Z = torch.zeros((n_nodes, n_nodes, n_traps, n_traps), dtype=torch.float32)
@@ -104,30 +153,83 @@ class Greedy:
 
         return Z
 
+    def precompute_interactions(self, coordinates: torch.Tensor, params: dict) -> torch.Tensor:
+        """
+        Compute U[p,q] = C / ||r_p - r_q||^6, the physical interaction between traps
+        p and q (0 on the diagonal), in float32.
+        """
+        return embedded_interactions(coordinates, params["device"]).to(torch.float32)
+
+    def lazy_coefficients(
+        self, Q: torch.Tensor, coordinates: torch.Tensor, params: dict
+    ) -> LazyMismatch:
+        """
+        Memory-lean counterpart of `precompute_coefficients`: only keeps Q and the
+        trap interaction matrix U, the mismatches being evaluated on demand.
+        """
+        return LazyMismatch(Q, self.precompute_interactions(coordinates, params))
+
     # ----------------------------
     # Next node heuristic
     # ----------------------------
     def get_best(self, Q: torch.Tensor, positioned: set, all_vertices: set) -> Any:
         """
         Pick the next logical node: the one with the largest total coupling
-        to the already-positioned set.
+        to the already-positioned set (a column sum over the positioned nodes).
         """
-        all_vertices = all_vertices.difference(positioned)
-        node_contributes: List[Tuple[int, float]] = []
-        for u in all_vertices:
-            s: float = 0.0
-            for j in positioned:
-                s += float(Q[u, j].item())
-            node_contributes.append((u, s))
-        u = list(sorted(node_contributes, key=lambda x: x[1], reverse=True))[0][0]
-        return u
+        unplaced = list(all_vertices.difference(positioned))
+        placed = torch.tensor(list(positioned), dtype=torch.long)
+        contributions = Q[unplaced][:, placed].to(torch.float64).sum(1)
+        # argmax returns the first maximum, as the stable sort over unplaced did
+        return unplaced[int(torch.argmax(contributions))]
 
     # ----------------------------
     # Best trap for a node
     # ----------------------------
+    def candidate_sums(
+        self,
+        Z: torch.Tensor | LazyMismatch,
+        u: int,
+        placed: torch.Tensor,
+        placed_traps: torch.Tensor,
+        traps: torch.Tensor,
+    ) -> torch.Tensor:
+        """
+        Incremental mismatch s(p) = sum_j Z[u, placed[j], p, placed_traps[j]] of node u
+        on each candidate trap p, as one (traps x placed) gather-sum, in float64.
+        """
+        if isinstance(Z, LazyMismatch):
+            return Z.candidate_sums(u, placed, placed_traps, traps)
+        gathered = Z[u, placed[None, :], traps[:, None], placed_traps[None, :]]
+        return gathered.to(torch.float64).sum(1)
+
+    @overload
     def optimize_position(
         self,
-        Z: torch.Tensor,
+        Z: torch.Tensor | LazyMismatch,
+        u: int,
+        positioned: set,
+        positioned_coords: dict,
+        all_traps: set,
+        used_traps: set,
+        return_candidates: Literal[False] = False,
+    ) -> tuple[Any, Any, Any]: ...
+
+    @overload
+    def optimize_position(
+        self,
+        Z: torch.Tensor | LazyMismatch,
+        u: int,
+        positioned: set,
+        positioned_coords: dict,
+        all_traps: set,
+        used_traps: set,
+        return_candidates: Literal[True],
+    ) -> tuple[Any, Any, Any, List[Tuple[int, float]]]: ...
+
+    def optimize_position(
+        self,
+        Z: torch.Tensor | LazyMismatch,
         u: int,
         positioned: set,
         positioned_coords: dict,
@@ -137,33 +239,38 @@ class Greedy:
     ) -> tuple[Any, Any, Any] | tuple[Any, Any, Any, List[Tuple[int, float]]]:
         """
         Evaluate all available traps p for node u and pick the one that minimizes:
-            s(p) = sum_{j in positioned} Z[u, j, p, trap(j)].
+            s(p) = sum_{j in positioned} Z[u, j, p, trap(j)],
+        evaluated for all traps at once by `candidate_sums`.
 
         Returns (choice_p, choice_coordinates, min_val)
         or, if return_candidates=True:
                 (choice_p, choice_coordinates, min_val, candidates)
             where candidates = [(trap_index, incremental_mismatch), ...]
         """
-        available_traps = all_traps.difference(used_traps)
+        available_traps = list(all_traps.difference(used_traps))
 
-        i = u
         choice_p: int = -1
         choice_coordinates: tuple = (None, None)
         min_val: float = float("inf")
         candidates: List[Tuple[int, float]] = []
 
-        for p in available_traps:
-            s = 0.0
-            for j in positioned:
-                q = self.MAPPING_COORDS_POSITIONS[positioned_coords[j]]
-                s += Z[i, j, p, q].item()
-
-            candidates.append((p, float(s)))
-
-            if s < min_val:
-                min_val = float(s)
-                choice_coordinates = tuple(self.MAPPING_POSITIONS_COORDS[p])
-                choice_p = p
+        if available_traps:
+            placed = list(positioned)
+            placed_traps = [self.MAPPING_COORDS_POSITIONS[positioned_coords[j]] for j in placed]
+            sums = self.candidate_sums(
+                Z,
+                u,
+                torch.tensor(placed, dtype=torch.long),
+                torch.tensor(placed_traps, dtype=torch.long),
+                torch.tensor(available_traps, dtype=torch.long),
+            )
+            # argmin returns the first minimum, as the strict comparison over traps did
+            best = int(torch.argmin(sums))
+            choice_p = available_traps[best]
+            min_val = float(sums[best])
+            choice_coordinates = tuple(self.MAPPING_POSITIONS_COORDS[choice_p])
+            if return_candidates:
+                candidates = list(zip(available_traps, sums.tolist()))
 
         if return_candidates:
             return choice_p, choice_coordinates, min_val, candidates
@@ -174,7 +281,7 @@ class Greedy:
     # ----------------------------
     def greedy_algorithm(
         self,
-        Z: torch.Tensor,
+        Z: torch.Tensor | LazyMismatch,
         Q: torch.Tensor,
         layout: RegisterLayout,
         v: int,
@@ -239,7 +346,7 @@ class Greedy:
             if used_traps == n_traps:
                 break
 
-            u = self.get_best(Q, positioned, copy.deepcopy(vertices))
+            u = self.get_best(Q, positioned, vertices)
 
             # If visualization is enabled, ask for candidates too
             want_candidates = bool(params.get("draw_steps", False) or (on_step is not None))
@@ -249,12 +356,12 @@ class Greedy:
                     u=u,
                     positioned=positioned,
                     positioned_coords=positioned_coords,
-                    all_traps=copy.deepcopy(all_traps),
+                    all_traps=all_traps,
                     used_traps=used_traps,
                     return_candidates=True,
                 )
                 # Help mypy: explicitly cast 4-tuple
-                _, u_coordinates, _, candidates = typing.cast(
+                _, u_coordinates, inc_val, candidates = typing.cast(
                     Tuple[Any, Any, Any, List[Tuple[int, float]]], res4
                 )
                 candidates.sort(key=lambda t: t[1])  # ascending by mismatch
@@ -264,12 +371,12 @@ class Greedy:
                     u=u,
                     positioned=positioned,
                     positioned_coords=positioned_coords,
-                    all_traps=copy.deepcopy(all_traps),
+                    all_traps=all_traps,
                     used_traps=used_traps,
                     return_candidates=False,
                 )
                 # Help mypy: explicitly cast 3-tuple
-                _, u_coordinates, _ = typing.cast(Tuple[Any, Any, Any], res3)
+                _, u_coordinates, inc_val = typing.cast(Tuple[Any, Any, Any], res3)
                 candidates = []
 
             x, y = torch.tensor(u_coordinates)  # might be negative
@@ -313,15 +420,7 @@ class Greedy:
             used_coords.add(u_coordinates)
             used_traps.add(self.MAPPING_COORDS_POSITIONS[u_coordinates])
 
-            # incremental mismatch (recompute from Z for clarity)
-            inc_val = 0.0
-            for j in positioned:
-                if j == u:
-                    continue
-                q = self.MAPPING_COORDS_POSITIONS[positioned_coords[j]]
-                p = self.MAPPING_COORDS_POSITIONS[u_coordinates]
-                inc_val += float(Z[u, j, p, q])
-
+            # incremental mismatch of the chosen trap, as evaluated by optimize_position
             total_mismatch += float(inc_val)
             step_id += 1
 
@@ -356,19 +455,179 @@ class Greedy:
         used_coords.clear()
         used_traps.clear()
 
-        # compute final total distance (as in original code)
-        diff = 0.0
-        for i in range(Q.shape[0]):
-            for j in range(i + 1, Q.shape[0]):
-                uij = (
-                    params["device"].interaction_coeff
-                    / torch.norm(final_coords[i] - final_coords[j]) ** 6
-                )
-                diff += abs(Q[i, j] - uij)
+        # compute final total distance
+        diff = embedding_mismatch(Q, final_coords, params["device"])
 
         results[v] = {"coords": final_coords, "distance": diff}
         return results
 
+    # ----------------------------
+    # Greedy passes from all start nodes at once
+    # ----------------------------
+    def batched_greedy(
+        self, Q: torch.Tensor, U: torch.Tensor, coordinates: torch.Tensor, params: dict
+    ) -> dict:
+        """
+        Run the greedy passes from every start node together.
+
+        Row s of each state tensor is the pass started from node s. At each step,
+        every unfinished pass picks its next node (as `get_best`) and its trap (as
+        `optimize_position`) with batched reductions over the mismatch of
+        `LazyMismatch`, ties going to the lowest node and trap indices.
+
+        Returns {start node: {"coords": ..., "distance": ...}} as `greedy_algorithm`.
+        """
+        max_radial_distance = params["device"].max_radial_distance
+        n = Q.shape[0]
+        n_traps = U.shape[0]
+        starts = torch.arange(n)
+        init_trap = self.MAPPING_COORDS_POSITIONS[(0, 0)]
+
+        placed = torch.eye(n, dtype=torch.bool)
+        # trap of each node in each pass (meaningful where placed)
+        trap_of = torch.full((n, n), init_trap, dtype=torch.long)
+        used = torch.zeros((n, n_traps), dtype=torch.bool)
+        used[:, init_trap] = True
+        n_extra_traps = torch.full((n,), max(n_traps - n, 0), dtype=torch.long)
+        outside = (coordinates.abs() >= max_radial_distance).any(1)
+        couplings = Q.to(torch.float64)
+
+        while True:
+            passes = torch.nonzero(~placed.all(1)).flatten()
+            if len(passes) == 0:
+                break
+            u, sums = self._batched_step(Q, U, couplings, placed[passes], trap_of[passes])
+            # next trap: the lowest incremental mismatch with the placed ones
+            sums[used[passes]] = float("inf")
+            p = torch.argmin(sums, 1)
+
+            # traps beyond the maximal radial distance are discarded while extras remain
+            skip = outside[p]
+            if (skip & (n_extra_traps[passes] == 0)).any():
+                u_skipped = int(u[skip & (n_extra_traps[passes] == 0)][0])
+                raise ValueError(
+                    f"no traps found to place qubit '{u_skipped}' "
+                    f"within {max_radial_distance}µm from origin."
+                )
+            used[passes, p] = True
+            n_extra_traps[passes[skip]] -= 1
+            placing = passes[~skip]
+            placed[placing, u[~skip]] = True
+            trap_of[placing, u[~skip]] = p[~skip]
+
+        final_coords = coordinates.to(torch.float32)[trap_of]
+        diffs = self._final_distances(Q, final_coords, params)
+        return {int(v): {"coords": final_coords[v], "distance": diffs[v]} for v in starts.tolist()}
+
+    def _batched_step(
+        self,
+        Q: torch.Tensor,
+        U: torch.Tensor,
+        couplings: torch.Tensor,
+        placed: torch.Tensor,
+        trap_of: torch.Tensor,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Next node of each partial placement (the largest total coupling to its placed
+        nodes, as `get_best`) and its incremental mismatch on every trap, of shape
+        (partials, n_traps), in float64.
+        """
+        contributions = placed.to(torch.float64) @ couplings.T
+        contributions[placed] = float("-inf")
+        u = torch.argmax(contributions, 1)
+
+        interactions = U[:, trap_of].permute(1, 0, 2)
+        mismatch = torch.abs(Q[u][:, None, :] - interactions).to(torch.float32)
+        return u, (mismatch.to(torch.float64) * placed[:, None, :]).sum(2)
+
+    def _final_distances(
+        self, Q: torch.Tensor, final_coords: torch.Tensor, params: dict
+    ) -> torch.Tensor:
+        """Total mismatch sum_{i<j} |Q[i,j] - C / ||r_i - r_j||^6| of each embedding."""
+        return embedding_mismatch(Q, final_coords, params["device"])
+
+    # ----------------------------
+    # Beam search with branch-and-bound pruning
+    # ----------------------------
+    def beam_search(
+        self,
+        Q: torch.Tensor,
+        U: torch.Tensor,
+        coordinates: torch.Tensor,
+        layout: RegisterLayout,
+        params: dict,
+    ) -> dict:
+        """
+        Beam search over partial placements, pruned by the best complete embedding.
+
+        The beam starts with every start node on the central trap. At each step, the
+        next node of each partial placement is chosen as in `get_best`, all its free
+        traps within the maximal radial distance are tried, and the
+        params["beam_width"] expansions with the lowest running mismatch are kept.
+        The running mismatch only grows as nodes are placed, so expansions whose
+        mismatch already exceeds the best complete embedding, initially a greedy pass
+        from the most coupled node, are abandoned.
+
+        Returns {start node: {"coords": ..., "distance": ...}} with the best embedding.
+        """
+        beam_width = int(params.get("beam_width", 8))
+        max_radial_distance = params["device"].max_radial_distance
+        n = Q.shape[0]
+        n_traps = U.shape[0]
+        init_trap = self.MAPPING_COORDS_POSITIONS[(0, 0)]
+        outside = (coordinates.abs() >= max_radial_distance).any(1)
+        couplings = Q.to(torch.float64)
+
+        # incumbent: a greedy pass from the most coupled node
+        results: dict = {}
+        start = int(torch.argmax(couplings.abs().sum(1)))
+        bound = float("inf")
+        try:
+            self.greedy_algorithm(LazyMismatch(Q, U), Q, layout, start, results, params)
+            bound = float(results[start]["distance"])
+        except ValueError:
+            results.clear()  # no greedy pass fits in the radial distance
+
+        starts = torch.arange(n)
+        placed = torch.eye(n, dtype=torch.bool)
+        trap_of = torch.full((n, n), init_trap, dtype=torch.long)
+        used = torch.zeros((n, n_traps), dtype=torch.bool)
+        used[:, init_trap] = True
+        cost = torch.zeros(n, dtype=torch.float64)
+
+        for _ in range(n - 1):
+            u, sums = self._batched_step(Q, U, couplings, placed, trap_of)
+            totals = cost[:, None] + sums
+            totals[used | outside[None, :]] = float("inf")
+            feasible = torch.isfinite(totals)
+            if not feasible.any():
+                raise ValueError(
+                    f"no traps found to place all qubits within {max_radial_distance}µm "
+                    "from origin."
+                )
+            totals[totals > bound] = float("inf")  # branch-and-bound pruning
+            flat = totals.flatten()
+            order = torch.argsort(flat, stable=True)[:beam_width]
+            order = order[torch.isfinite(flat[order])]
+            if len(order) == 0:
+                break  # every partial placement is worse than the incumbent
+            parent, p = order // n_traps, order % n_traps
+            rows = torch.arange(len(order))
+            starts, cost = starts[parent], flat[order]
+            placed, trap_of, used = placed[parent], trap_of[parent], used[parent]
+            placed[rows, u[parent]] = True
+            trap_of[rows, u[parent]] = p
+            used[rows, p] = True
+        else:
+            final_coords = coordinates.to(torch.float32)[trap_of]
+            diffs = self._final_distances(Q, final_coords, params)
+            best = int(torch.argmin(diffs))
+            if float(diffs[best]) < bound:
+                best_result = {"coords": final_coords[best], "distance": diffs[best]}
+                results = {int(starts[best]): best_result}
+
+        return results
+
     # ----------------------------
     # Internal: post-run animation (only if animation=True)
     # ----------------------------
@@ -642,13 +901,19 @@ class Greedy:
           - If `on_step` is provided, we still instrument but do not necessarily render.
           - Else, no instrumentation (zero overhead).
 
+        Strategy rules (not instrumented runs only, instrumented ones are serial):
+          - params['strategy'] == GreedyStrategyType.BATCHED advances the passes of
+            all start nodes together (`batched_greedy`).
+          - params['strategy'] == GreedyStrategyType.BEAM runs a beam search of
+            width params['beam_width'] with branch-and-bound pruning (`beam_search`).
+          - Else, params['num_workers'] threads run the passes (default 1, serial;
+            None lets the thread pool choose).
+
         Returns:
           (best_result_item, None, coords, r_cut, omega)
         """
         layout, coordinates = self.get_predefined_coordinates(params)
         predefined_coordinates = coordinates.clone().detach()
-
-        Z = self.precompute_coefficients(Q, predefined_coordinates, params)
         nodes = list(range(Q.shape[0]))
 
         results: dict = {}
@@ -657,6 +922,18 @@ class Greedy:
         anim_flag = bool(params.get("animation", False) or params.get("draw_steps", False))
         instrument = bool(params.get("draw_steps", False) or on_step is not None or anim_flag)
 
+        # Instrumented runs emit their steps one pass after the other
+        strategy = params.get("strategy", GreedyStrategyType.MULTI_START)
+        batched = strategy == GreedyStrategyType.BATCHED and not instrument
+        beam = strategy == GreedyStrategyType.BEAM and not instrument
+        num_workers = 1 if instrument else params.get("num_workers", 1)
+
+        Z: torch.Tensor | LazyMismatch | None = None
+        if not (batched or beam) and params.get("lazy_mismatch", False):
+            Z = self.lazy_coefficients(Q, predefined_coordinates, params)
+        elif not (batched or beam):
+            Z = self.precompute_coefficients(Q, predefined_coordinates, params)
+
         frames: List[Dict[str, Any]] = []
 
         if instrument:
@@ -677,10 +954,35 @@ class Greedy:
         else:
             cb = None
 
-        for node in nodes:
-            self.greedy_algorithm(Z, Q, layout, node, results, params, on_step=cb)
+        if batched:
+            U = self.precompute_interactions(predefined_coordinates, params)
+            results = self.batched_greedy(Q, U, predefined_coordinates, params)
+        elif beam:
+            U = self.precompute_interactions(predefined_coordinates, params)
+            results = self.beam_search(Q, U, predefined_coordinates, layout, params)
+        elif num_workers == 1:
+            assert Z is not None
+            for node in nodes:
+                self.greedy_algorithm(Z, Q, layout, node, results, params, on_step=cb)
+        else:
+            assert Z is not None
+            # Passes only share read-only state and write their own key of results
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                list(
+                    executor.map(
+                        lambda node: self.greedy_algorithm(Z, Q, layout, node, results, params),
+                        nodes,
+                    )
+                )
 
-        best_result = min(results.items(), key=lambda x: x[1]["distance"])
+        # Ties, up to rounding, go to the lowest start node, whatever the completion order
+        lowest = min(float(result["distance"]) for result in results.values())
+        tolerance = DISTANCE_RTOL * max(abs(lowest), 1.0)
+        best_result = next(
+            item
+            for item in sorted(results.items())
+            if float(item[1]["distance"]) <= lowest + tolerance
+        )
         coords = best_result[1]["coords"]
 
         lb_radius = params["device"].rydberg_blockade_radius(1)
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from .local_search import IncrementalLocalSearch, batched_local_search
+from .tabu import TabuSearch, default_tenure, tabu_search
+
+__all__ = [
+    "IncrementalLocalSearch",
+    "TabuSearch",
+    "batched_local_search",
+    "default_tenure",
+    "tabu_search",
+]
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import numpy as np
+import torch
+
+from qubosolver.qubo_types import LocalSearchType, StorageType
+from qubosolver.utils.qubo_eval import calculate_qubo_costs
+from qubosolver.utils.sparse import gather_rows, is_sparse, sparse_diagonal, to_storage
+
+
+class IncrementalLocalSearch:
+    """
+    Bit-flip local search driven by incrementally maintained flip gains.
+
+    For a symmetric QUBO matrix Q and a binary vector x, flipping bit i changes
+    the energy x^T Q x by
+
+        delta_i = (1 - 2 x_i) (Q_ii + 2 h_i),   with h_i = sum_{j != i} Q_ij x_j.
+
+    The gains are updated in O(n) (O(degree) for sparse instances) after each
+    accepted flip, instead of re-evaluating x^T Q x for every candidate flip.
+
+    The engine is built once per QUBO matrix and can then improve any number of
+    solutions with `search`.
+    """
+
+    def __init__(self, coefficients: torch.Tensor, tol: float = 1e-9):
+        """
+        Prepare the engine for a given QUBO matrix.
+
+        Args:
+            coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+                dense or sparse (COO or CSR).
+            tol (float, optional): Minimal energy decrease for a flip to be accepted.
+                Defaults to 1e-9.
+        """
+        self.size: int = int(coefficients.shape[0])
+        self.tol = tol
+        self.diagonal: np.ndarray = sparse_diagonal(coefficients).cpu().numpy().astype(np.float64)
+
+        self._dense: np.ndarray | None = None
+        self._crow: np.ndarray | None = None
+        self._col: np.ndarray | None = None
+        self._values: np.ndarray | None = None
+        self._row_ids: np.ndarray | None = None
+
+        if is_sparse(coefficients):
+            csr = to_storage(coefficients.cpu(), StorageType.CSR)
+            self._crow = csr.crow_indices().numpy()
+            self._col = csr.col_indices().numpy()
+            self._values = csr.values().numpy().astype(np.float64)
+            self._row_ids = np.repeat(np.arange(self.size), np.diff(self._crow))
+        else:
+            self._dense = coefficients.detach().cpu().numpy().astype(np.float64)
+
+    def _row(self, k: int) -> tuple[np.ndarray | slice, np.ndarray]:
+        """Returns the column indices and values of row k of Q."""
+        if self._dense is not None:
+            return slice(None), self._dense[k]
+        assert self._crow is not None and self._col is not None and self._values is not None
+        start, end = self._crow[k], self._crow[k + 1]
+        return self._col[start:end], self._values[start:end]
+
+    def _matvec(self, x: np.ndarray) -> np.ndarray:
+        """Returns Q @ x."""
+        if self._dense is not None:
+            return self._dense @ x  # type: ignore[no-any-return]
+        assert self._row_ids is not None and self._col is not None and self._values is not None
+        return np.bincount(self._row_ids, weights=self._values * x[self._col], minlength=self.size)
+
+    def energy(self, x: np.ndarray) -> float:
+        """
+        Computes x^T Q x.
+
+        Args:
+            x (np.ndarray): Binary vector of shape (n,).
+
+        Returns:
+            float: The energy of x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        return float(x @ self._matvec(x))
+
+    def gains(self, x: np.ndarray) -> np.ndarray:
+        """
+        Computes the energy change of every single-bit flip of x.
+
+        Args:
+            x (np.ndarray): Binary vector of shape (n,).
+
+        Returns:
+            np.ndarray: Array of shape (n,) where entry i is the energy change
+                when flipping bit i.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        field = self._matvec(x) - self.diagonal * x
+        return (1.0 - 2.0 * x) * (self.diagonal + 2.0 * field)  # type: ignore[no-any-return]
+
+    def search(
+        self,
+        x: np.ndarray,
+        strategy: LocalSearchType | str = LocalSearchType.BEST_IMPROVEMENT,
+        shuffle: bool = True,
+        rng: np.random.Generator | None = None,
+    ) -> tuple[np.ndarray, float]:
+        """
+        Improves a solution by single-bit flips until no flip decreases the energy.
+
+        Args:
+            x (np.ndarray): Binary vector of shape (n,) to start from.
+            strategy (LocalSearchType | str, optional): `best_improvement` applies the
+                flip with the largest decrease at each step, `first_improvement` applies
+                the first improving flip found. Defaults to best improvement.
+            shuffle (bool, optional): With first improvement, scan the variables in a
+                new random order at each sweep to diversify. Defaults to True.
+            rng (np.random.Generator | None, optional): Random generator used for
+                shuffling. Defaults to a fresh default generator.
+
+        Returns:
+            tuple[np.ndarray, float]: The local optimum and its energy.
+        """
+        strategy = LocalSearchType(strategy)
+        if strategy == LocalSearchType.BATCHED:
+            raise ValueError(
+                "Batched local search runs on all samples: use `batched_local_search`."
+            )
+        if rng is None:
+            rng = np.random.default_rng()
+
+        x = np.asarray(x, dtype=np.float64).copy()
+        sign = 1.0 - 2.0 * x
+        gains = sign * (self.diagonal + 2.0 * (self._matvec(x) - self.diagonal * x))
+        order = rng.permutation(self.size) if shuffle else np.arange(self.size)
+        position = 0
+
+        while True:
+            if strategy == LocalSearchType.BEST_IMPROVEMENT:
+                k = int(np.argmin(gains))
+                if gains[k] >= -self.tol:
+                    break
+            else:
+                # Resume the scan of the current sweep order after the last flip
+                improving = np.flatnonzero(gains[order] < -self.tol)
+                if improving.size == 0:
+                    break
+                next_improving = int(np.searchsorted(improving, position))
+                if next_improving == improving.size:
+                    # Sweep finished: start a new one
+                    if shuffle:
+                        order = rng.permutation(self.size)
+                        improving = np.flatnonzero(gains[order] < -self.tol)
+                    next_improving = 0
+                position = int(improving[next_improving])
+                k = int(order[position])
+
+            # Apply the flip: the local field of each neighbour j of k moves by
+            # step * Q_jk, hence its gain by 2 * step * (1 - 2 x_j) * Q_jk.
+            gain_k = gains[k]
+            step = sign[k]
+            x[k] += step
+            columns, values = self._row(k)
+            gains[columns] += (2.0 * step) * sign[columns] * values
+            sign[k] = -step
+            # Flipping k back would exactly undo the move
+            gains[k] = -gain_k
+
+        return x, self.energy(x)
+
+
+def batched_local_search(
+    coefficients: torch.Tensor, bitstrings: torch.Tensor, tol: float = 1e-9
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Best-improvement bit-flip descent run on all samples at once.
+
+    Identical bitstrings are deduplicated first, so repeated shots are only
+    optimized once. The flip gains of all samples are kept in a
+    (num_unique, n) tensor; at each step, every sample that still has an
+    improving flip applies its best one, and converged samples are masked out.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        bitstrings (torch.Tensor): Samples of shape (num_samples, n).
+        tol (float, optional): Minimal energy decrease for a flip to be accepted.
+            Defaults to 1e-9.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: The improved bitstrings of shape
+            (num_samples, n), in the input order, and their costs.
+    """
+    Q = coefficients.to(torch.float64)
+    if is_sparse(Q):
+        Q = to_storage(Q, StorageType.COO)
+    diagonal = sparse_diagonal(Q)
+
+    unique, inverse = torch.unique(
+        bitstrings.to(dtype=torch.float64, device=Q.device), dim=0, return_inverse=True
+    )
+    x = unique.clone()
+    sign = 1.0 - 2.0 * x
+    field = torch.matmul(Q, x.T).T if is_sparse(Q) else torch.matmul(x, Q)
+    gains = sign * (diagonal + 2.0 * (field - diagonal * x))
+
+    # Converged samples are masked out of the updates, and compacted away once
+    # they make up a significant share of the working set.
+    samples = torch.arange(x.shape[0], device=Q.device)
+    converged_x: list[torch.Tensor] = []
+    converged_samples: list[torch.Tensor] = []
+    while x.shape[0] > 0:
+        best_gains, k = gains.min(dim=1)
+        improving = best_gains < -tol
+        n_converged = int((~improving).sum())
+        if n_converged > 0 and 4 * n_converged >= x.shape[0]:
+            converged_x.append(x[~improving])
+            converged_samples.append(samples[~improving])
+            x, sign = x[improving], sign[improving]
+            gains, samples = gains[improving], samples[improving]
+            best_gains, k = best_gains[improving], k[improving]
+            improving = improving[improving]
+        if x.shape[0] == 0:
+            break
+
+        # Apply the best flip of every improving sample and update their gains
+        rows = torch.arange(x.shape[0], device=Q.device)
+        step = sign[rows, k] * improving
+        x[rows, k] += step
+        gains.addcmul_((2.0 * step)[:, None] * sign, gather_rows(Q, k))
+        sign[rows, k] -= 2.0 * step
+        gains[rows, k] = torch.where(improving, -best_gains, gains[rows, k])
+
+    optimized = torch.empty_like(unique)
+    if converged_samples:
+        optimized[torch.cat(converged_samples)] = torch.cat(converged_x)
+    costs = calculate_qubo_costs(optimized, coefficients)
+    return optimized[inverse], costs[inverse]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import numpy as np
+import torch
+
+from qubosolver.algorithms.local_search.local_search import IncrementalLocalSearch
+
+# Maximal default tabu tenure, the tenure being a quarter of the QUBO size below it
+MAX_DEFAULT_TENURE: int = 20
+
+# Default number of iterations of a tabu search run, per variable
+DEFAULT_ITERATIONS_PER_VARIABLE: int = 100
+
+
+def default_tenure(size: int) -> int:
+    """
+    Returns the default tabu tenure of a QUBO of a given size.
+
+    Args:
+        size (int): Number of variables.
+
+    Returns:
+        int: min(`MAX_DEFAULT_TENURE`, size / 4), and at least 1.
+    """
+    return max(1, min(MAX_DEFAULT_TENURE, size // 4))
+
+
+class TabuSearch(IncrementalLocalSearch):
+    """
+    Single-flip tabu search driven by incrementally maintained flip gains.
+
+    At each iteration, the flip with the lowest energy change is applied even if it
+    increases the energy, and the flipped variable becomes tabu for a number of
+    iterations (the tenure) so that the search does not immediately undo it. A tabu
+    flip is still allowed when it leads to a new best energy (aspiration).
+
+    The tenure of each move is drawn between the base tenure and 1.5 times it, which
+    breaks the cycles a fixed tenure can fall into.
+    """
+
+    def run(
+        self,
+        x: np.ndarray,
+        tenure: int | None = None,
+        max_iterations: int | None = None,
+        time_limit: float | None = None,
+        rng: np.random.Generator | None = None,
+        stop_callback: Callable[[float], bool] | None = None,
+    ) -> tuple[np.ndarray, float]:
+        """
+        Runs a tabu search from a solution.
+
+        Args:
+            x (np.ndarray): Binary vector of shape (n,) to start from.
+            tenure (int | None, optional): Base tabu tenure.
+                Defaults to None, given by `default_tenure`.
+            max_iterations (int | None, optional): Number of iterations. Defaults to None,
+                `DEFAULT_ITERATIONS_PER_VARIABLE` iterations per variable.
+            time_limit (float | None, optional): Maximal duration of the run, in seconds.
+                Defaults to None (no limit).
+            rng (np.random.Generator | None, optional): Random generator of the tenure
+                schedule. Defaults to a fresh default generator.
+            stop_callback (Callable[[float], bool] | None, optional): Called after each
+                iteration with the best energy so far; the run stops when it returns
+                True. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, float]: The best solution visited and its energy.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if tenure is None:
+            tenure = default_tenure(self.size)
+        if max_iterations is None:
+            max_iterations = DEFAULT_ITERATIONS_PER_VARIABLE * self.size
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+        x = np.asarray(x, dtype=np.float64).copy()
+        sign = 1.0 - 2.0 * x
+        gains = self.gains(x)
+        energy = self.energy(x)
+        best_x, best_energy = x.copy(), energy
+        tabu_until = np.zeros(self.size, dtype=np.int64)
+        tenures = tenure + rng.integers(0, tenure // 2 + 1, max_iterations)
+
+        for iteration in range(max_iterations):
+            # Non-tabu moves, and tabu moves reaching a new best energy
+            allowed = (tabu_until <= iteration) | (gains < best_energy - energy - self.tol)
+            k = int(np.argmin(np.where(allowed, gains, np.inf)))
+            if not allowed[k]:
+                # Every move is tabu: release the oldest one
+                k = int(np.argmin(tabu_until))
+
+            # Apply the flip and update the gains of the neighbours of k
+            gain_k = gains[k]
+            step = sign[k]
+            x[k] += step
+            columns, values = self._row(k)
+            gains[columns] += (2.0 * step) * sign[columns] * values
+            sign[k] = -step
+            gains[k] = -gain_k
+            energy += gain_k
+            tabu_until[k] = iteration + 1 + tenures[iteration]
+
+            if energy < best_energy - self.tol:
+                best_x, best_energy = x.copy(), energy
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if stop_callback is not None and stop_callback(best_energy):
+                break
+
+        return best_x, self.energy(best_x)
+
+
+def tabu_search(
+    coefficients: torch.Tensor,
+    initial_states: torch.Tensor | None = None,
+    num_restarts: int | None = None,
+    tenure: int | None = None,
+    max_iterations: int | None = None,
+    time_limit: float | None = None,
+    num_workers: int | None = None,
+    seed: int | None = None,
+    stop_callback: Callable[[float], bool] | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Runs independent tabu searches on a QUBO, across a thread pool.
+
+    Run r starts from `initial_states[r % len(initial_states)]`, for instance samples
+    of another solver to polish, or from a random state if no initial states are given.
+    Each run draws from its own random stream spawned from `seed`, so results do not
+    depend on the scheduling of the threads.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        initial_states (torch.Tensor | None, optional): Starting states of shape (k, n).
+            Defaults to None (random starts).
+        num_restarts (int | None, optional): Number of runs. Defaults to None, one per
+            initial state, or a single run.
+        tenure (int | None, optional): Base tabu tenure.
+            Defaults to None, given by `default_tenure`.
+        max_iterations (int | None, optional): Number of iterations of each run.
+            Defaults to None, `DEFAULT_ITERATIONS_PER_VARIABLE` iterations per variable.
+        time_limit (float | None, optional): Maximal duration of each run, in seconds.
+            Defaults to None (no limit).
+        num_workers (int | None, optional): Number of threads.
+            Defaults to None, chosen by `ThreadPoolExecutor`.
+        seed (int | None, optional): Seed for reproducible runs. Defaults to None.
+        stop_callback (Callable[[float], bool] | None, optional): Called by each run
+            with its best energy so far, see `TabuSearch.run`; called from the worker
+            threads. Defaults to None.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Best state of each run, of shape
+            (num_restarts, n), and their costs.
+    """
+    engine = TabuSearch(coefficients)
+    if initial_states is not None:
+        starts = initial_states.detach().cpu().numpy().astype(np.float64)
+    else:
+        starts = np.empty((0, engine.size))
+    if num_restarts is None:
+        num_restarts = max(1, starts.shape[0])
+
+    seeds = np.random.SeedSequence(seed).spawn(num_restarts)
+    generators = [np.random.default_rng(restart_seed) for restart_seed in seeds]
+
+    def run(restart: int) -> tuple[np.ndarray, float]:
+        rng = generators[restart]
+        if starts.shape[0] > 0:
+            x = starts[restart % starts.shape[0]]
+        else:
+            x = rng.integers(0, 2, engine.size).astype(np.float64)
+        return engine.run(x, tenure, max_iterations, time_limit, rng, stop_callback)
+
+    if num_restarts == 1 or num_workers == 1:
+        results = [run(restart) for restart in range(num_restarts)]
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(run, range(num_restarts)))
+
+    states = np.array([state for state, _ in results]).reshape(num_restarts, engine.size)
+    return (
+        torch.from_numpy(states).to(torch.float32),
+        torch.tensor([cost for _, cost in results], dtype=torch.float32),
+    )
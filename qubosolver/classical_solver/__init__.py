@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from .classical_solver import get_classical_solver
+from .cplex_session import CplexSession
 
 __all__ = [
+    "CplexSession",
     "get_classical_solver",
 ]
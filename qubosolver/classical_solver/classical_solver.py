@@ -7,14 +7,23 @@ Description:
       - A solver based on CPLEX.
       - A solver using D-Wave Simulated Annealing.
       - A solver using D-Wave Tabu Search.
+      - A native vectorized Simulated Annealing solver.
+      - A native Parallel Tempering (replica exchange) solver.
+      - A native Tabu Search solver.
+      - An exact solver, by enumeration or branch-and-bound.
+      - A portfolio solver racing several of the above in worker processes.
 """
 
 from __future__ import annotations
 
+import math
+import multiprocessing
+import queue
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 
-import cplex
+import numpy as np
 import torch
 
 # D-Wave imports
@@ -25,10 +34,20 @@ from dwave.samplers.tabu import TabuSampler
 
 # QUBO solver imports
 from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.algorithms.annealing import (
+    DEFAULT_NUM_REPLICAS,
+    DEFAULT_NUM_SWEEPS,
+    parallel_tempering,
+    simulated_annealing,
+)
+from qubosolver.algorithms.exact import exact_solve
+from qubosolver.algorithms.local_search import tabu_search
+from qubosolver.classical_solver.cplex_session import CplexSession
+from qubosolver.config import PortfolioConfig, SamplerConfig
 
 # Import conversion utilities from classical_solver_conversion_tools.
 from qubosolver.classical_solver.classical_solver_conversion_tools import (
-    qubo_instance_to_sparsepairs,
+    samples_to_solution,
 )
 from qubosolver.classical_solver.classical_solver_conversion_tools import (
     run_sampler as conversion_run_sampler,
@@ -51,10 +70,28 @@ class BaseClassicalSolver(ABC):
         Args:
             instance (QUBOInstance): The QUBO problem instance to solve.
             config (Optional[Dict[str, Any]]): Solver configuration
-            (e.g., cplex_maxtime, cplex_log_path, classical_solver_type).
+            (e.g., cplex_maxtime, cplex_log_path, classical_solver_type, sampler).
         """
         self.instance = instance
         self.config = config if config is not None else {}
+        # Whether the last call to `solve` proved that its best solution is optimal
+        self.optimal: bool = False
+
+    @property
+    def sampler_config(self) -> SamplerConfig:
+        """
+        Returns the sampler parameters of the configuration.
+
+        Returns:
+            SamplerConfig: The `sampler` entry of the configuration, validated,
+                or the default parameters if absent.
+        """
+        sampler = self.config.get("sampler")
+        if sampler is None:
+            return SamplerConfig()
+        if isinstance(sampler, SamplerConfig):
+            return sampler
+        return SamplerConfig.model_validate(sampler)
 
     @abstractmethod
     def solve(self) -> QUBOSolution:
@@ -74,89 +111,419 @@ class BaseClassicalSolver(ABC):
 class CplexSolver(BaseClassicalSolver):
     """
     QUBO solver based on CPLEX.
+
+    Besides `cplex_maxtime` and `cplex_log_path`, the configuration may set warm-start
+    bitstrings (`cplex_warm_start`), the relative and absolute gap tolerances
+    (`cplex_mip_gap`, `cplex_mip_gap_abs`), the number of threads (`cplex_threads`),
+    the number of solutions returned from the solution pool (`cplex_pool_size`) and a
+    callback receiving each improving incumbent (`cplex_incumbent_callback`). The best
+    bound and the relative gap are reported on the returned solution.
+
+    Each call builds a new model; use a `CplexSession` to re-solve instances of the
+    same size with changing coefficients.
+    """
+
+    def solve(self) -> QUBOSolution:
+        with CplexSession(self.config) as session:
+            solution = session.solve(self.instance)
+            self.optimal = session.optimal
+        return solution
+
+
+# -----------------------------------------------------------------------------
+# D-Wave Simulated Annealing (SA) solver implementation.
+# -----------------------------------------------------------------------------
+class DwaveSASolver(BaseClassicalSolver):
+    """
+    QUBO solver using D-Wave's Simulated Annealing sampler.
+    """
+
+    def solve(self) -> QUBOSolution:
+        # Initialize the D-Wave Simulated Annealing sampler.
+        sampler = SimulatedAnnealingSampler()
+        # Use the conversion tool's run_sampler (which returns a QUBOSolution).
+        solution: QUBOSolution = conversion_run_sampler(
+            sampler, self.instance, **self.sampler_config.simulated_annealing_parameters()
+        )
+        return solution
+
+
+# -----------------------------------------------------------------------------
+# D-Wave Tabu Search solver implementation.
+# -----------------------------------------------------------------------------
+class DwaveTabuSolver(BaseClassicalSolver):
+    """
+    QUBO solver using D-Wave's Tabu Search heuristic.
     """
 
     def solve(self) -> QUBOSolution:
-        # Extract configuration parameters using new keys.
-        log_path: str = self.config.get("cplex_log_path", "solver.log")
-        maxtime: float = self.config.get("cplex_maxtime", 600.0)
+        # Initialize the D-Wave Tabu Search sampler.
+        sampler = TabuSampler()
+        solution: QUBOSolution = conversion_run_sampler(
+            sampler, self.instance, **self.sampler_config.tabu_parameters()
+        )
+        return solution
+
+
+# -----------------------------------------------------------------------------
+# Native Simulated Annealing solver implementation.
+# -----------------------------------------------------------------------------
+class SimulatedAnnealingSolver(BaseClassicalSolver):
+    """
+    QUBO solver running simulated annealing on many independent replicas at once.
+
+    The replicas are annealed together with incremental local fields, using sparse
+    products for sparse instances. `num_reads` sets the number of replicas and
+    `num_sweeps`, `beta_range`, `beta_schedule_type` and `seed` the annealing, which
+    the `stop_callback` of the configuration may end early.
+    """
 
+    def solve(self) -> QUBOSolution:
         if self.instance.coefficients is None:
             raise ValueError("The QUBO instance does not contain coefficients.")
 
-        # Determine the number of variables.
         N: int = self.instance.coefficients.shape[0]
-        # If there are no variables, return an empty solution.
         if N == 0:
             bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
             cost_tensor = torch.empty((0,), dtype=torch.float32)
             return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
 
-        # Convert the coefficient matrix into CPLEX sparse pairs format using the conversion tool.
-        sparsepairs: List[cplex.SparsePair] = qubo_instance_to_sparsepairs(self.instance)
+        sampler = self.sampler_config
+        bitstrings, costs = simulated_annealing(
+            self.instance.coefficients,
+            num_replicas=sampler.num_reads or DEFAULT_NUM_REPLICAS,
+            num_sweeps=sampler.num_sweeps or DEFAULT_NUM_SWEEPS,
+            beta_range=sampler.beta_range,
+            schedule_type=sampler.beta_schedule_type,
+            seed=sampler.seed,
+            stop_callback=self.config.get("stop_callback"),
+        )
+        return samples_to_solution(bitstrings, costs)
 
-        # Open a log file.
-        log_file = open(log_path, "w")
-        problem = cplex.Cplex()
 
-        # Redirect logging streams.
-        problem.set_log_stream(log_file)
-        problem.set_error_stream(log_file)
-        problem.set_warning_stream(log_file)
-        problem.set_results_stream(log_file)
+# -----------------------------------------------------------------------------
+# Native Parallel Tempering solver implementation.
+# -----------------------------------------------------------------------------
+class ParallelTemperingSolver(BaseClassicalSolver):
+    """
+    QUBO solver based on parallel tempering (replica exchange Monte Carlo).
 
-        problem.parameters.timelimit.set(maxtime)
-        problem.objective.set_sense(problem.objective.sense.minimize)
+    `num_temperatures` sets the number of temperatures. The best state visited by each
+    replica is returned; the search stops after `num_sweeps` sweeps or on the
+    `time_limit`, `target_energy` or `stagnation_sweeps` criteria, or when the
+    `stop_callback` of the configuration returns True.
+    """
 
-        # Add binary variables.
-        problem.variables.add(types="B" * N)
+    def solve(self) -> QUBOSolution:
+        if self.instance.coefficients is None:
+            raise ValueError("The QUBO instance does not contain coefficients.")
 
-        # Set the quadratic objective.
-        problem.objective.set_quadratic(sparsepairs)
+        N: int = self.instance.coefficients.shape[0]
+        if N == 0:
+            bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
+            cost_tensor = torch.empty((0,), dtype=torch.float32)
+            return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
 
-        problem.solve()
+        bitstrings, costs = parallel_tempering(
+            self.instance.coefficients,
+            **self.sampler_config.parallel_tempering_parameters(),
+            stop_callback=self.config.get("stop_callback"),
+        )
+        return samples_to_solution(bitstrings, costs)
 
-        # Retrieve solution.
-        solution_values = problem.solution.get_values()
-        solution_cost = problem.solution.get_objective_value()
 
-        log_file.close()
+# -----------------------------------------------------------------------------
+# Native Tabu Search solver implementation.
+# -----------------------------------------------------------------------------
+class TabuSolver(BaseClassicalSolver):
+    """
+    QUBO solver based on a native single-flip tabu search with incremental gains.
 
-        # Convert the solution into a QUBOSolution.
-        bitstring_tensor = torch.tensor([[int(b) for b in solution_values]], dtype=torch.float32)
-        cost_tensor = torch.tensor([solution_cost], dtype=torch.float32)
+    `num_restarts` sets the number of restarts, run across a thread pool of `num_workers`
+    threads, and `tenure`, `max_iterations` and `time_limit` each run, which the
+    `stop_callback` of the configuration may end early.
+    """
 
-        return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
+    def solve(self) -> QUBOSolution:
+        if self.instance.coefficients is None:
+            raise ValueError("The QUBO instance does not contain coefficients.")
+
+        N: int = self.instance.coefficients.shape[0]
+        if N == 0:
+            bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
+            cost_tensor = torch.empty((0,), dtype=torch.float32)
+            return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
+
+        bitstrings, costs = tabu_search(
+            self.instance.coefficients,
+            **self.sampler_config.native_tabu_parameters(),
+            stop_callback=self.config.get("stop_callback"),
+        )
+        return samples_to_solution(bitstrings, costs)
 
 
 # -----------------------------------------------------------------------------
-# D-Wave Simulated Annealing (SA) solver implementation.
+# Exact solver implementation.
 # -----------------------------------------------------------------------------
-class DwaveSASolver(BaseClassicalSolver):
+class ExactSolver(BaseClassicalSolver):
     """
-    QUBO solver using D-Wave's Simulated Annealing sampler.
+    QUBO solver finding the lowest-energy bitstrings exactly.
+
+    Small instances are enumerated with Gray-code incremental updates and vectorized
+    blocks, larger ones are solved by branch-and-bound. `top_k` sets the number of
+    lowest-energy bitstrings returned, and `time_limit` bounds the search, in which
+    case `optimal` tells whether the search completed.
     """
 
     def solve(self) -> QUBOSolution:
-        # Initialize the D-Wave Simulated Annealing sampler.
-        sampler = SimulatedAnnealingSampler()
-        # Use the conversion tool's run_sampler (which returns a QUBOSolution).
-        solution: QUBOSolution = conversion_run_sampler(sampler, self.instance)
-        return solution
+        if self.instance.coefficients is None:
+            raise ValueError("The QUBO instance does not contain coefficients.")
+
+        N: int = self.instance.coefficients.shape[0]
+        if N == 0:
+            bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
+            cost_tensor = torch.empty((0,), dtype=torch.float32)
+            return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
+
+        bitstrings, costs, self.optimal = exact_solve(
+            self.instance.coefficients, **self.sampler_config.exact_parameters()
+        )
+        return QUBOSolution(bitstrings=bitstrings, costs=costs)
 
 
 # -----------------------------------------------------------------------------
-# D-Wave Tabu Search solver implementation.
+# Portfolio solver implementation.
 # -----------------------------------------------------------------------------
-class DwaveTabuSolver(BaseClassicalSolver):
+# Time given to the solvers of a portfolio to report after the budget, in seconds
+PORTFOLIO_GRACE_PERIOD: float = 5.0
+
+
+class _PortfolioReport(NamedTuple):
+    """Outcome of one solver of a portfolio, sent back by its worker process."""
+
+    solver_type: str
+    bitstrings: np.ndarray
+    costs: np.ndarray
+    counts: Optional[np.ndarray]
+    optimal: bool
+    error: Optional[str]
+
+
+class _SharedIncumbent:
     """
-    QUBO solver using D-Wave's Tabu Search heuristic.
+    Best energy found by the solvers of a portfolio, shared between their processes.
+
+    The workers pass it to their solver as `stop_callback`: each call publishes the
+    best energy of the solver, and tells it to stop once the shared incumbent is
+    within the target. A `stop_callback` of the configuration is still honoured.
+    """
+
+    def __init__(
+        self,
+        context: Any,
+        threshold: Optional[float],
+        stop_callback: Optional[Callable[[float], bool]] = None,
+    ):
+        self._energy = context.Value("d", math.inf)
+        self.threshold = threshold
+        self.stop_callback = stop_callback
+
+    @property
+    def energy(self) -> float:
+        """The best energy published so far."""
+        return float(self._energy.value)
+
+    def publish(self, energy: float) -> bool:
+        """
+        Publishes an energy, keeping the lowest one.
+
+        Args:
+            energy (float): Energy of a solution.
+
+        Returns:
+            bool: Whether the incumbent is now within the target.
+        """
+        with self._energy.get_lock():
+            if energy < self._energy.value:
+                self._energy.value = energy
+            incumbent = self._energy.value
+        return self.threshold is not None and incumbent <= self.threshold
+
+    def __call__(self, energy: float) -> bool:
+        reached = self.publish(energy)
+        return reached or (self.stop_callback is not None and self.stop_callback(energy))
+
+
+def _portfolio_worker(
+    solver_type: str,
+    instance: QUBOInstance,
+    config: Dict[str, Any],
+    incumbent: _SharedIncumbent,
+    results: Any,
+) -> None:
+    """
+    Runs one solver of a portfolio and reports its solution.
+
+    Args:
+        solver_type (str): Type of the classical solver to run.
+        instance (QUBOInstance): The QUBO instance.
+        config (Dict[str, Any]): Configuration of the solver.
+        incumbent (_SharedIncumbent): Incumbent shared with the other solvers, polled
+            by the solver as its `stop_callback`.
+        results (multiprocessing.Queue): Queue receiving the `_PortfolioReport`.
+    """
+    try:
+        solver = get_classical_solver(instance, {**config, "stop_callback": incumbent})
+        solution = solver.solve()
+    except Exception as error:  # reported to the parent, which raises if all solvers fail
+        empty = np.empty((0,), dtype=np.float32)
+        results.put(_PortfolioReport(solver_type, empty, empty, None, False, repr(error)))
+        return
+
+    costs = solution.costs.detach().cpu().numpy()
+    counts = solution.counts.cpu().numpy() if solution.counts is not None else None
+    results.put(
+        _PortfolioReport(
+            solver_type, solution.bitstrings.cpu().numpy(), costs, counts, solver.optimal, None
+        )
+    )
+
+
+class PortfolioSolver(BaseClassicalSolver):
+    """
+    QUBO solver racing several classical solvers under one wall-clock budget.
+
+    Each solver of `PortfolioConfig.solvers` runs in its own worker process, with its
+    time limits capped by the budget. The incumbent, the best energy found so far, is
+    shared between the workers: the native samplers and CPLEX publish their
+    improvements while running, and stop as soon as the incumbent of any solver is
+    within `target_gap` of `target_energy`. The race is cancelled, and the running
+    solvers terminated, as soon as a report proves optimality or brings the incumbent
+    within the target. The solutions of all solvers which reported are merged, with
+    the name of their solver in `provenance`.
     """
 
+    @property
+    def portfolio_config(self) -> PortfolioConfig:
+        """
+        Returns the portfolio parameters of the configuration.
+
+        Returns:
+            PortfolioConfig: The `portfolio` entry of the configuration, validated,
+                or the default parameters if absent.
+        """
+        portfolio = self.config.get("portfolio")
+        if portfolio is None:
+            return PortfolioConfig()
+        if isinstance(portfolio, PortfolioConfig):
+            return portfolio
+        return PortfolioConfig.model_validate(portfolio)
+
+    def _solver_config(self, solver_type: str, budget: float) -> Dict[str, Any]:
+        """Returns the configuration of one solver, with its time limits capped."""
+        sampler = self.sampler_config
+        time_limit = min(sampler.time_limit or budget, budget)
+        timeout = min(sampler.timeout, max(1, int(budget * 1000)))
+        return {
+            **self.config,
+            "classical_solver_type": solver_type,
+            "cplex_maxtime": min(self.config.get("cplex_maxtime", 600.0), budget),
+            "sampler": sampler.model_copy(update={"time_limit": time_limit, "timeout": timeout}),
+        }
+
+    def _target_threshold(self) -> Optional[float]:
+        """Returns the energy at or below which the target is reached, if any."""
+        portfolio = self.portfolio_config
+        if portfolio.target_energy is None:
+            return None
+        target = portfolio.target_energy
+        return target + portfolio.target_gap * abs(target)
+
     def solve(self) -> QUBOSolution:
-        # Initialize the D-Wave Tabu Search sampler.
-        sampler = TabuSampler()
-        solution: QUBOSolution = conversion_run_sampler(sampler, self.instance)
+        if self.instance.coefficients is None:
+            raise ValueError("The QUBO instance does not contain coefficients.")
+
+        N: int = self.instance.coefficients.shape[0]
+        if N == 0:
+            bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
+            cost_tensor = torch.empty((0,), dtype=torch.float32)
+            return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
+
+        portfolio = self.portfolio_config
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        incumbent = _SharedIncumbent(
+            context, self._target_threshold(), self.config.get("stop_callback")
+        )
+        workers = [
+            context.Process(
+                target=_portfolio_worker,
+                args=(
+                    solver_type,
+                    self.instance,
+                    self._solver_config(solver_type, portfolio.time_limit),
+                    incumbent,
+                    results,
+                ),
+                daemon=True,
+            )
+            for solver_type in portfolio.solvers
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Collect the reports until all solvers are done, the race is won or time is up
+        deadline = time.perf_counter() + portfolio.time_limit + PORTFOLIO_GRACE_PERIOD
+        reports: List[_PortfolioReport] = []
+        errors: List[str] = []
+        self.optimal = False
+        while len(reports) + len(errors) < len(workers):
+            try:
+                report = results.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if report.error is not None:
+                errors.append(f"{report.solver_type}: {report.error}")
+                continue
+            reports.append(report)
+            # Solvers which do not poll the incumbent only publish it through their report
+            reached = report.costs.size > 0 and incumbent.publish(float(report.costs.min()))
+            self.optimal = self.optimal or report.optimal
+            if self.optimal or reached:
+                break
+
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+        if not reports:
+            raise RuntimeError(
+                "No solver of the portfolio returned a solution"
+                + (f": {'; '.join(errors)}" if errors else " within the time budget.")
+            )
+
+        # Merge the solutions, keeping track of the solver of each bitstring
+        bitstrings = torch.from_numpy(np.concatenate([r.bitstrings for r in reports]))
+        costs = torch.from_numpy(np.concatenate([r.costs for r in reports]))
+        counts = torch.from_numpy(
+            np.concatenate(
+                [
+                    r.counts if r.counts is not None else np.ones(len(r.costs), dtype=np.int32)
+                    for r in reports
+                ]
+            )
+        ).to(torch.int32)
+        provenance = [r.solver_type for r in reports for _ in range(len(r.costs))]
+
+        solution = QUBOSolution(
+            bitstrings=bitstrings.to(torch.float32),
+            costs=costs.to(torch.float32),
+            counts=counts,
+            provenance=provenance,
+        )
+        solution.probabilities = solution.compute_probabilities()
+        solution.sort_by_cost()
         return solution
 
 
@@ -189,5 +556,15 @@ def get_classical_solver(
         return DwaveSASolver(instance, config)
     elif solver_type == "dwave_tabu":
         return DwaveTabuSolver(instance, config)
+    elif solver_type == "simulated_annealing":
+        return SimulatedAnnealingSolver(instance, config)
+    elif solver_type == "parallel_tempering":
+        return ParallelTemperingSolver(instance, config)
+    elif solver_type == "tabu":
+        return TabuSolver(instance, config)
+    elif solver_type == "exact":
+        return ExactSolver(instance, config)
+    elif solver_type == "portfolio":
+        return PortfolioSolver(instance, config)
     else:
         raise ValueError(f"Solver type not supported: {solver_type}")
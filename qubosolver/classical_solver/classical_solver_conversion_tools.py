@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import warnings
-from typing import List
+from typing import Any, List
 
 import cplex
 import dimod
+import numpy as np
 import torch
 
 from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.utils.sparse import sparse_diagonal, sparse_entries
 
 
 def qubo_instance_to_dimod_bqm(
@@ -26,31 +28,27 @@ def qubo_instance_to_dimod_bqm(
     if qubo_instance.coefficients is None:
         raise ValueError("The QUBO instance does not have coefficients.")
 
-    # Convert the coefficient tensor to a NumPy array.
-    Q = qubo_instance.coefficients.cpu().numpy()
-
     if qubo_instance.size is None:
         raise ValueError("QUBO instance size is None.")
 
-    size: int = qubo_instance.size
-
-    linear: dict[int, float] = {}
-    quadratic: dict[tuple[int, int], float] = {}
-    offset: float = 0.0  # Adjust this offset if needed
+    # Read the diagonal and the non-zero entries, so that sparse instances stay sparse.
+    diagonal = sparse_diagonal(qubo_instance.coefficients).cpu().numpy()
+    rows, cols, values = (t.cpu().numpy() for t in sparse_entries(qubo_instance.coefficients))
 
-    # Populate the linear and quadratic terms.
+    # Linear terms are the diagonal, quadratic terms the upper triangle.
     # We assume that the matrix Q is symmetric.
-    for i in range(size):
-        linear[i] = Q[i, i]
-        for j in range(i + 1, size):
-            if Q[i, j] != 0:
-                quadratic[(i, j)] = Q[i, j]
-
-    # Create a BinaryQuadraticModel using binary variables (0,1).
-    return dimod.BinaryQuadraticModel(linear, quadratic, offset, dimod.BINARY)
+    upper = rows < cols
+
+    # Create a BinaryQuadraticModel using binary variables (0,1), in one shot from arrays.
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        linear=diagonal,
+        quadratic=(rows[upper], cols[upper], values[upper]),
+        offset=0.0,
+        vartype=dimod.BINARY,
+    )
 
 
-def run_sampler(sampler: dimod.Sampler, qubo: QUBOInstance) -> QUBOSolution:
+def run_sampler(sampler: dimod.Sampler, qubo: QUBOInstance, **parameters: Any) -> QUBOSolution:
     """
     Runs a given sampler on a QUBO instance and returns the sampled solutions
     along with their costs.
@@ -58,6 +56,7 @@ def run_sampler(sampler: dimod.Sampler, qubo: QUBOInstance) -> QUBOSolution:
     Parameters:
         sampler (dimod.Sampler): The sampler used to solve the QUBO problem.
         qubo (QUBOInstance): A QUBO problem instance encoded in the custom QUBOInstance format.
+        **parameters: Keyword arguments passed to `sampler.sample` (e.g. `num_reads`, `seed`).
 
     Returns:
         QUBOSolution: An object containing the sampled solutions (binary vectors)
@@ -69,39 +68,67 @@ def run_sampler(sampler: dimod.Sampler, qubo: QUBOInstance) -> QUBOSolution:
     # Use the provided sampler to find solutions to the BQM.
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        sampleset: dimod.SampleSet = sampler.sample(bqm)
+        sampleset: dimod.SampleSet = sampler.sample(bqm, **parameters)
 
-    # Convert the sampled solutions into a PyTorch tensor of binary values (0/1).
-    bitstrings = torch.tensor((sampleset.record.sample > 0).astype(int), dtype=torch.float32)
-
-    # Compute the cost of each solution using the QUBO's evaluation function.
-    costs = torch.tensor(
-        [qubo.evaluate_solution(sample.tolist()) for sample in bitstrings],
-        dtype=torch.float32,
+    # Convert the sampled solutions into a PyTorch tensor of binary values (0/1),
+    # with the columns ordered by variable index.
+    order = np.argsort(np.asarray(list(sampleset.variables)))
+    bitstrings = torch.tensor(
+        (sampleset.record.sample[:, order] > 0).astype(int), dtype=torch.float32
     )
 
+    # Compute the cost of all solutions at once using the QUBO's batched evaluation.
+    costs = qubo.evaluate_solutions(bitstrings).to(torch.float32)
+
     # Return the solutions and their costs wrapped in a QUBOSolution object.
     return QUBOSolution(bitstrings=bitstrings, costs=costs)
 
 
+def samples_to_solution(bitstrings: torch.Tensor, costs: torch.Tensor) -> QUBOSolution:
+    """
+    Aggregates raw samples into a QUBOSolution with one entry per distinct bitstring.
+
+    Parameters:
+        bitstrings (torch.Tensor): Samples of shape (num_samples, n).
+        costs (torch.Tensor): Cost of each sample, of shape (num_samples,).
+
+    Returns:
+        QUBOSolution: The distinct bitstrings sorted by increasing cost, with their
+            costs, counts and probabilities.
+    """
+    unique, inverse, counts = torch.unique(
+        bitstrings, dim=0, return_inverse=True, return_counts=True
+    )
+    unique_costs = torch.empty(unique.shape[0], dtype=torch.float32)
+    unique_costs[inverse] = costs.to(torch.float32)
+
+    solution = QUBOSolution(bitstrings=unique, costs=unique_costs, counts=counts.to(torch.int32))
+    solution.probabilities = solution.compute_probabilities()
+    solution.sort_by_cost()
+    return solution
+
+
 def qubo_instance_to_sparsepairs(
     instance: QUBOInstance, tol: float = 1e-8
 ) -> List[cplex.SparsePair]:
     if instance.coefficients is None:
         raise ValueError("The QUBO instance does not have coefficients.")
 
-    matrix = instance.coefficients.cpu().numpy()
-    size = matrix.shape[0]
-    sparsepairs: List[cplex.SparsePair] = []
-
-    for i in range(size):
-        indices: List[int] = []
-        values: List[float] = []
-        for j in range(size):
-            coeff = matrix[i, j] * 2
-            if abs(coeff) > tol:
-                indices.append(j)
-                values.append(float(coeff))  # <<< conversion ici
-        sparsepairs.append(cplex.SparsePair(ind=indices, val=values))
+    size = instance.coefficients.shape[0]
+    rows, cols, entries = (t.cpu().numpy() for t in sparse_entries(instance.coefficients))
+
+    # Keep the significant entries; they are already in row-major (CSR) order.
+    coeffs = entries.astype(np.float64) * 2
+    significant = np.abs(coeffs) > tol
+    rows, cols, coeffs = rows[significant], cols[significant], coeffs[significant]
+    row_ptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=size))))
+
+    # Slice each row out of the CSR arrays.
+    col_list: List[int] = cols.tolist()
+    coeff_list: List[float] = coeffs.tolist()
+    sparsepairs: List[cplex.SparsePair] = [
+        cplex.SparsePair(ind=col_list[start:end], val=coeff_list[start:end])
+        for start, end in zip(row_ptr[:-1].tolist(), row_ptr[1:].tolist())
+    ]
 
     return sparsepairs
@@ -0,0 +1,326 @@
+"""
+Module: classical_solver/cplex_session.py
+
+Description:
+    A CPLEX session keeping its model alive across solves, so that re-solving
+    instances of the same size only updates the changed objective coefficients.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from types import TracebackType
+from typing import IO, Any, Callable, Dict, Optional
+
+import cplex
+import numpy as np
+import torch
+
+from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.classical_solver.classical_solver_conversion_tools import (
+    qubo_instance_to_sparsepairs,
+)
+from qubosolver.utils.sparse import sparse_entries
+
+
+class _IncumbentStreamer:
+    """
+    CPLEX generic callback passing each improving incumbent to a user callback.
+
+    The callback receives a dictionary `{"bitstring", "cost", "best_bound", "time"}`.
+    The stop callback, if any, is polled with the best cost so far on each progress
+    report, once the candidates are accepted, and aborts the solve when it returns
+    True. CPLEX may invoke the callbacks from several threads, so improvements are
+    filtered under a lock.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        stop_callback: Optional[Callable[[float], bool]] = None,
+    ):
+        self.callback = callback
+        self.stop_callback = stop_callback
+        self.best_cost = math.inf
+        self.start_time = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def contexts(self) -> int:
+        """The CPLEX contexts in which the callback is invoked."""
+        contexts = cplex.callbacks.Context.id.candidate
+        if self.stop_callback is not None:
+            contexts |= cplex.callbacks.Context.id.global_progress
+        return int(contexts)
+
+    def invoke(self, context: cplex.callbacks.Context) -> None:
+        if context.in_candidate():
+            if context.is_candidate_point():
+                self._report(context)
+        elif self.stop_callback is not None and self.stop_callback(self.best_cost):
+            context.abort()
+
+    def _report(self, context: cplex.callbacks.Context) -> None:
+        """Records an improving candidate and passes it to the user callback."""
+        cost = context.get_candidate_objective()
+        with self._lock:
+            if cost >= self.best_cost:
+                return
+            self.best_cost = cost
+            if self.callback is None:
+                return
+            self.callback(
+                {
+                    "bitstring": torch.tensor(
+                        np.asarray(context.get_candidate_point()) > 0.5, dtype=torch.float32
+                    ),
+                    "cost": cost,
+                    "best_bound": context.get_double_info(cplex.callbacks.Context.info.best_bound),
+                    "time": time.perf_counter() - self.start_time,
+                }
+            )
+
+
+def _objective_entries(instance: QUBOInstance, tol: float = 1e-8) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the upper-triangular entries of the CPLEX objective of a QUBO instance.
+
+    CPLEX minimizes 1/2 x^T Q' x, so the coefficients are doubled, and dropped when
+    below `tol` in magnitude as in `qubo_instance_to_sparsepairs`.
+
+    Args:
+        instance (QUBOInstance): The QUBO instance.
+        tol (float, optional): Magnitude below which coefficients are dropped.
+            Defaults to 1e-8.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sorted row-major keys i * n + j of the entries
+            with i <= j, and their values.
+    """
+    assert instance.coefficients is not None
+    size = instance.coefficients.shape[0]
+    rows, cols, values = (t.cpu().numpy() for t in sparse_entries(instance.coefficients))
+    values = values.astype(np.float64) * 2
+    kept = (rows <= cols) & (np.abs(values) > tol)
+    keys = rows[kept].astype(np.int64) * size + cols[kept]
+    order = np.argsort(keys, kind="stable")
+    return keys[order], values[kept][order]
+
+
+class CplexSession:
+    """
+    CPLEX model kept alive across the solves of QUBO instances of the same size.
+
+    The first solve builds the model. The following ones only send the objective
+    coefficients that changed since the previous solve, and warm-start CPLEX from
+    the previous incumbent, which suits workloads re-solving the same structure with
+    changing coefficients. A solve with a different number of variables rebuilds
+    the model.
+
+    The configuration accepts the same `cplex_*` keys as `CplexSolver`. The session
+    should be closed with `close`, or used as a context manager.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize an empty session.
+
+        Args:
+            config (Optional[Dict[str, Any]]): Solver configuration
+            (e.g., cplex_maxtime, cplex_log_path, cplex_mip_gap).
+        """
+        self.config = config if config is not None else {}
+        self.problem: cplex.Cplex | None = None
+        self.size: int | None = None
+        # Whether the last solve proved that its best solution is optimal
+        self.optimal: bool = False
+        # Number of objective coefficients sent to CPLEX by the last solve
+        self.num_updated: int = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0)
+        self._incumbent: list[float] | None = None
+        self._log_file: IO[str] | None = None
+
+    def __enter__(self) -> CplexSession:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases the CPLEX model and closes the log file."""
+        if self.problem is not None:
+            self.problem.end()
+            self.problem = None
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self.size = None
+        self._incumbent = None
+
+    def _build(self, instance: QUBOInstance, size: int) -> None:
+        """Builds the model of an instance from scratch."""
+        self.close()
+        log_path: str | None = self.config.get("cplex_log_path", "solver.log")
+        self._log_file = open(log_path, "w") if log_path is not None else None
+
+        problem = cplex.Cplex()
+        # Redirect logging streams.
+        problem.set_log_stream(self._log_file)
+        problem.set_error_stream(self._log_file)
+        problem.set_warning_stream(self._log_file)
+        problem.set_results_stream(self._log_file)
+
+        self._set_parameters(problem)
+        problem.objective.set_sense(problem.objective.sense.minimize)
+        # Add binary variables and set the quadratic objective.
+        problem.variables.add(types="B" * size)
+        problem.objective.set_quadratic(qubo_instance_to_sparsepairs(instance))
+
+        self.problem, self.size = problem, size
+        self.num_updated = len(self._keys)
+
+    def _update(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Sends the objective coefficients which differ from the current model."""
+        assert self.problem is not None and self.size is not None
+        union = np.union1d(self._keys, keys)
+        current = np.zeros(union.size)
+        current[np.searchsorted(union, self._keys)] = self._values
+        target = np.zeros(union.size)
+        target[np.searchsorted(union, keys)] = values
+
+        changed = np.flatnonzero(current != target)
+        rows, cols = np.divmod(union[changed], self.size)
+        if changed.size > 0:
+            self.problem.objective.set_quadratic_coefficients(
+                list(zip(rows.tolist(), cols.tolist(), target[changed].tolist()))
+            )
+        self.num_updated = int(changed.size)
+
+    def _set_parameters(self, problem: cplex.Cplex) -> None:
+        """Applies the CPLEX parameters of the configuration."""
+        problem.parameters.timelimit.set(self.config.get("cplex_maxtime", 600.0))
+        if self.config.get("cplex_mip_gap") is not None:
+            problem.parameters.mip.tolerances.mipgap.set(self.config["cplex_mip_gap"])
+        if self.config.get("cplex_mip_gap_abs") is not None:
+            problem.parameters.mip.tolerances.absmipgap.set(self.config["cplex_mip_gap_abs"])
+        if self.config.get("cplex_threads") is not None:
+            problem.parameters.threads.set(self.config["cplex_threads"])
+        if (
+            self.config.get("cplex_incumbent_callback") is not None
+            or self.config.get("stop_callback") is not None
+            or self.config.get("cplex_pool_size", 1) > 1
+        ):
+            # CPLEX only linearizes the non-convex objective of a QUBO by itself for a
+            # plain `solve`: callbacks and `populate` need the global optimality target.
+            problem.parameters.optimalitytarget.set(
+                problem.parameters.optimalitytarget.values.optimal_global
+            )
+
+    def _add_warm_start(self, problem: cplex.Cplex, size: int) -> None:
+        """Replaces the MIP starts by the previous incumbent and the configured ones."""
+        if problem.MIP_starts.get_num() > 0:
+            problem.MIP_starts.delete()
+
+        starts = [] if self._incumbent is None else [self._incumbent]
+        warm_start = self.config.get("cplex_warm_start")
+        if warm_start is not None:
+            bitstrings = torch.as_tensor(warm_start, dtype=torch.float32).reshape(-1, size)
+            starts += bitstrings.tolist()
+        if not starts:
+            return
+
+        indices = list(range(size))
+        effort = problem.MIP_starts.effort_level.auto
+        problem.MIP_starts.add(
+            [(cplex.SparsePair(ind=indices, val=start), effort) for start in starts]
+        )
+
+    def _collect_solution(
+        self, problem: cplex.Cplex, best_bound: float, gap: float
+    ) -> QUBOSolution:
+        """Reads the incumbent and the solution pool from a solved model."""
+        pool_size: int = self.config.get("cplex_pool_size", 1)
+        values = [problem.solution.get_values()]
+        costs = [problem.solution.get_objective_value()]
+        if pool_size > 1:
+            pool = problem.solution.pool
+            for index in range(pool.get_num()):
+                values.append(pool.get_values(index))
+                costs.append(pool.get_objective_value(index))
+
+        bitstrings, first = np.unique(
+            (np.asarray(values) > 0.5).astype(np.float32), axis=0, return_index=True
+        )
+        solution = QUBOSolution(
+            bitstrings=torch.from_numpy(bitstrings),
+            costs=torch.tensor(costs, dtype=torch.float32)[torch.from_numpy(first)],
+            best_bound=best_bound,
+            gap=gap,
+        )
+        solution.sort_by_cost()
+        solution.bitstrings = solution.bitstrings[:pool_size]
+        solution.costs = solution.costs[:pool_size]
+        return solution
+
+    def solve(self, instance: QUBOInstance) -> QUBOSolution:
+        """
+        Solves a QUBO instance, reusing the model of the previous solve if possible.
+
+        Args:
+            instance (QUBOInstance): The QUBO problem instance to solve.
+
+        Returns:
+            QUBOSolution: The best solutions found, with the best bound and the gap.
+        """
+        if instance.coefficients is None:
+            raise ValueError("The QUBO instance does not contain coefficients.")
+
+        N: int = instance.coefficients.shape[0]
+        if N == 0:
+            bitstring_tensor = torch.empty((0, 0), dtype=torch.float32)
+            cost_tensor = torch.empty((0,), dtype=torch.float32)
+            return QUBOSolution(bitstrings=bitstring_tensor, costs=cost_tensor)
+
+        keys, values = _objective_entries(instance)
+        if self.problem is None or self.size != N:
+            self._keys, self._values = keys, values
+            self._build(instance, N)
+        else:
+            self._update(keys, values)
+            self._keys, self._values = keys, values
+        problem = self.problem
+        assert problem is not None
+
+        self._add_warm_start(problem, N)
+        callback = self.config.get("cplex_incumbent_callback")
+        stop_callback = self.config.get("stop_callback")
+        if callback is not None or stop_callback is not None:
+            streamer = _IncumbentStreamer(callback, stop_callback)
+            problem.set_callback(streamer, streamer.contexts)
+
+        problem.solve()
+        self.optimal = problem.solution.get_status() in (
+            problem.solution.status.MIP_optimal,
+            problem.solution.status.optimal_tolerance,
+        )
+        # Read the bound before `populate`, which reports on its own search
+        best_bound = problem.solution.MIP.get_best_objective()
+        gap = problem.solution.MIP.get_mip_relative_gap()
+        self._incumbent = np.round(problem.solution.get_values()).tolist()
+
+        pool_size: int = self.config.get("cplex_pool_size", 1)
+        if pool_size > 1:
+            # Fill the solution pool with alternative solutions
+            problem.parameters.mip.pool.capacity.set(pool_size)
+            problem.parameters.mip.limits.populate.set(pool_size)
+            problem.populate_solution_pool()
+
+        return self._collect_solution(problem, best_bound, gap)
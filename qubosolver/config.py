@@ -3,7 +3,7 @@ from __future__ import annotations
 import inspect
 from abc import ABC
 from dataclasses import field
-from typing import Any, Callable
+from typing import Any, Callable, Literal
 
 import torch
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
@@ -12,7 +12,9 @@ from qoolqit._solvers.types import DeviceType
 
 from qubosolver.qubo_types import (
     EmbedderType,
+    GreedyStrategyType,
     LayoutType,
+    LocalSearchType,
     PulseType,
 )
 
@@ -22,6 +24,9 @@ BaseModel.model_config["arbitrary_types_allowed"] = True
 # Modules to be automatically added to the qubosolver namespace
 __all__: list[str] = [
     "ClassicalConfig",
+    "SamplerConfig",
+    "PortfolioConfig",
+    "HybridConfig",
     "EmbeddingConfig",
     "PulseShapingConfig",
     "BackendConfig",
@@ -35,6 +40,213 @@ class Config(BaseModel, ABC):
     model_config = ConfigDict(extra="forbid")
 
 
+class SamplerConfig(Config):
+    """A `SamplerConfig` instance defines the parameters of the sampling-based
+        classical solvers (simulated annealing, tabu search and parallel tempering).
+
+    Parameters left to None use the defaults of the samplers.
+
+    Attributes:
+        num_reads (int | None, optional): Number of samples (reads) drawn by D-Wave's
+            samplers, and of replicas of the native simulated annealing. Defaults to None,
+            one read for D-Wave's samplers and `DEFAULT_NUM_REPLICAS` replicas.
+        num_restarts (int | None, optional): Number of runs of the native tabu search.
+            Defaults to None (a single run).
+        num_temperatures (int | None, optional): Number of temperatures, hence of
+            replicas, of parallel tempering. Defaults to None (`DEFAULT_NUM_TEMPERATURES`).
+        top_k (int | None, optional): Number of lowest-energy bitstrings returned by the
+            exact solver. Defaults to None (the optimum only).
+        seed (int | None, optional): Seed of the sampler, for reproducible runs.
+            Defaults to None (random).
+        num_sweeps (int | None, optional): Number of sweeps per read of simulated
+            annealing. Defaults to None.
+        beta_range (tuple[float, float] | None, optional): Initial and final inverse
+            temperatures of simulated annealing. Defaults to None (derived from the QUBO).
+        beta_schedule_type (str, optional): Interpolation of the inverse temperature
+            between `beta_range` bounds, "linear" or "geometric". Defaults to "geometric".
+        timeout (int, optional): Maximal duration of each tabu search run, in milliseconds.
+            Defaults to 20.
+        tenure (int | None, optional): Tabu tenure, i.e. the number of iterations a flipped
+            variable stays tabu. Defaults to None (derived from the QUBO size).
+        exchange_interval (int | None, optional): Number of sweeps between replica
+            exchanges of parallel tempering. Defaults to None (every sweep).
+        time_limit (float | None, optional): Wall-clock budget of parallel tempering and
+            of the exact solver, and of each run of the native tabu search, in seconds.
+            Defaults to None (no limit).
+        target_energy (float | None, optional): Energy at which parallel tempering
+            stops. Defaults to None.
+        stagnation_sweeps (int | None, optional): Number of sweeps without improvement
+            after which parallel tempering stops. Defaults to None.
+        max_iterations (int | None, optional): Number of iterations of each run of the
+            native tabu search. Defaults to None (100 per variable).
+        num_workers (int | None, optional): Number of threads running the restarts of
+            the native tabu search. Defaults to None (chosen by the thread pool).
+    """
+
+    num_reads: int | None = None
+    num_restarts: int | None = None
+    num_temperatures: int | None = None
+    top_k: int | None = None
+    seed: int | None = None
+    num_sweeps: int | None = None
+    beta_range: tuple[float, float] | None = None
+    beta_schedule_type: Literal["linear", "geometric"] = "geometric"
+    timeout: int = 20
+    tenure: int | None = None
+    exchange_interval: int | None = None
+    time_limit: float | None = None
+    target_energy: float | None = None
+    stagnation_sweeps: int | None = None
+    max_iterations: int | None = None
+    num_workers: int | None = None
+
+    @field_validator(
+        "num_reads",
+        "num_restarts",
+        "num_temperatures",
+        "top_k",
+        "num_sweeps",
+        "timeout",
+        "tenure",
+        "exchange_interval",
+        "time_limit",
+        "stagnation_sweeps",
+        "max_iterations",
+        "num_workers",
+    )
+    @classmethod
+    def _check_positive(cls, val: int | float | None) -> int | float | None:
+        if val is not None and val <= 0:
+            raise ValueError("Sampler counts and durations should be positive.")
+        return val
+
+    @field_validator("seed")
+    @classmethod
+    def _check_seed(cls, val: int | None) -> int | None:
+        if val is not None and not 0 <= val < 2**32:
+            raise ValueError("`seed` should be in [0, 2**32).")
+        return val
+
+    def simulated_annealing_parameters(self) -> dict[str, Any]:
+        """Returns the keyword arguments of D-Wave's `SimulatedAnnealingSampler.sample`.
+
+        Returns:
+            dict[str, Any]: The parameters which are set.
+        """
+        parameters = {
+            "num_reads": self.num_reads,
+            "seed": self.seed,
+            "num_sweeps": self.num_sweeps,
+            "beta_range": self.beta_range,
+            "beta_schedule_type": self.beta_schedule_type,
+        }
+        return {key: value for key, value in parameters.items() if value is not None}
+
+    def tabu_parameters(self) -> dict[str, Any]:
+        """Returns the keyword arguments of D-Wave's `TabuSampler.sample`.
+
+        Returns:
+            dict[str, Any]: The parameters which are set.
+        """
+        parameters = {
+            "num_reads": self.num_reads,
+            "seed": self.seed,
+            "timeout": self.timeout,
+            "tenure": self.tenure,
+        }
+        return {key: value for key, value in parameters.items() if value is not None}
+
+    def native_tabu_parameters(self) -> dict[str, Any]:
+        """Returns the keyword arguments of the native `tabu_search`.
+
+        Returns:
+            dict[str, Any]: The parameters which are set.
+        """
+        parameters = {
+            "num_restarts": self.num_restarts,
+            "tenure": self.tenure,
+            "max_iterations": self.max_iterations,
+            "time_limit": self.time_limit,
+            "num_workers": self.num_workers,
+            "seed": self.seed,
+        }
+        return {key: value for key, value in parameters.items() if value is not None}
+
+    def parallel_tempering_parameters(self) -> dict[str, Any]:
+        """Returns the keyword arguments of the native `parallel_tempering`.
+
+        Returns:
+            dict[str, Any]: The parameters which are set.
+        """
+        parameters = {
+            "num_replicas": self.num_temperatures,
+            "num_sweeps": self.num_sweeps,
+            "beta_range": self.beta_range,
+            "exchange_interval": self.exchange_interval,
+            "time_limit": self.time_limit,
+            "target_energy": self.target_energy,
+            "stagnation_sweeps": self.stagnation_sweeps,
+            "seed": self.seed,
+        }
+        return {key: value for key, value in parameters.items() if value is not None}
+
+    def exact_parameters(self) -> dict[str, Any]:
+        """Returns the keyword arguments of the native `exact_solve`.
+
+        Returns:
+            dict[str, Any]: The parameters which are set.
+        """
+        parameters = {
+            "top_k": self.top_k,
+            "time_limit": self.time_limit,
+        }
+        return {key: value for key, value in parameters.items() if value is not None}
+
+
+class PortfolioConfig(Config):
+    """A `PortfolioConfig` instance defines how the portfolio classical solver
+        races several classical solvers.
+
+    Attributes:
+        solvers (list[str], optional): Types of the classical solvers run concurrently.
+            Defaults to `["cplex", "simulated_annealing", "tabu"]`.
+        time_limit (float, optional): Wall-clock budget shared by all solvers, in seconds.
+            Defaults to 60.
+        target_energy (float | None, optional): Energy at which the race stops.
+            Defaults to None (only a proof of optimality stops it).
+        target_gap (float, optional): Relative gap to `target_energy` within which the
+            race stops. Defaults to 0.
+    """
+
+    solvers: list[str] = ["cplex", "simulated_annealing", "tabu"]
+    time_limit: float = 60.0
+    target_energy: float | None = None
+    target_gap: float = 0.0
+
+    @field_validator("solvers")
+    @classmethod
+    def _check_solvers(cls, val: list[str]) -> list[str]:
+        if not val:
+            raise ValueError("The portfolio should contain at least one solver.")
+        if any(solver.lower() == "portfolio" for solver in val):
+            raise ValueError("A portfolio cannot contain itself.")
+        return val
+
+    @field_validator("time_limit")
+    @classmethod
+    def _check_time_limit(cls, val: float) -> float:
+        if val <= 0:
+            raise ValueError("`time_limit` should be positive.")
+        return val
+
+    @field_validator("target_gap")
+    @classmethod
+    def _check_target_gap(cls, val: float) -> float:
+        if val < 0:
+            raise ValueError("`target_gap` should be non-negative.")
+        return val
+
+
 class ClassicalConfig(Config):
     """A `ClassicalConfig` instance defines the classical
         part of a `SolverConfig`.
@@ -42,12 +254,58 @@ class ClassicalConfig(Config):
     Attributes:
         classical_solver_type (str, optional): Classical solver type. Defaults to "cplex".
         cplex_maxtime (float, optional): CPLEX maximum runtime. Defaults to 600s.
-        cplex_log_path (str, optional): CPLEX log path. Default to `solver.log`.
+        cplex_log_path (str | None, optional): CPLEX log path, or None to disable the log.
+            Default to `solver.log`.
+        cplex_warm_start (list[list[int]] | torch.Tensor | None, optional): Bitstrings
+            given to CPLEX as MIP starts. Defaults to None.
+        cplex_mip_gap (float | None, optional): Relative MIP gap at which CPLEX stops.
+            Defaults to None (CPLEX default).
+        cplex_mip_gap_abs (float | None, optional): Absolute MIP gap at which CPLEX stops.
+            Defaults to None (CPLEX default).
+        cplex_threads (int | None, optional): Number of threads of CPLEX.
+            Defaults to None (CPLEX default).
+        cplex_pool_size (int, optional): Maximal number of solutions returned from the
+            CPLEX solution pool. Defaults to 1.
+        cplex_incumbent_callback (callable | None, optional): Called with each improving
+            incumbent found by CPLEX, as a dictionary `d = {"bitstring": bitstring,
+            "cost": cost, "best_bound": best_bound, "time": time}`, hence should be
+            defined as: `def callback_fn(d: dict) -> None:`. Defaults to None.
+        stop_callback (callable | None, optional): Polled by CPLEX and the native
+            samplers ("simulated_annealing", "parallel_tempering" and "tabu") with the
+            best energy found so far; the solver stops early, returning its best
+            solutions, when it returns True. Defaults to None.
+        sampler (SamplerConfig, optional): Parameters of the sampling-based solvers.
+            Defaults to the samplers' defaults.
+        portfolio (PortfolioConfig, optional): Solvers and budget of the "portfolio"
+            solver type. Defaults to `PortfolioConfig()`.
     """
 
     classical_solver_type: str = "cplex"
     cplex_maxtime: float = 600.0
-    cplex_log_path: str = "solver.log"
+    cplex_log_path: str | None = "solver.log"
+    cplex_warm_start: list[list[int]] | torch.Tensor | None = None
+    cplex_mip_gap: float | None = None
+    cplex_mip_gap_abs: float | None = None
+    cplex_threads: int | None = None
+    cplex_pool_size: int = 1
+    cplex_incumbent_callback: Callable[[dict], None] | None = None
+    stop_callback: Callable[[float], bool] | None = None
+    sampler: SamplerConfig = SamplerConfig()
+    portfolio: PortfolioConfig = PortfolioConfig()
+
+    @field_validator("cplex_mip_gap", "cplex_mip_gap_abs")
+    @classmethod
+    def _check_gap(cls, val: float | None) -> float | None:
+        if val is not None and val < 0:
+            raise ValueError("CPLEX gap tolerances should be non-negative.")
+        return val
+
+    @field_validator("cplex_threads", "cplex_pool_size")
+    @classmethod
+    def _check_cplex_counts(cls, val: int | None) -> int | None:
+        if val is not None and val <= 0:
+            raise ValueError("`cplex_threads` and `cplex_pool_size` should be positive.")
+        return val
 
 
 class EmbeddingConfig(Config):
@@ -60,6 +318,17 @@ class EmbeddingConfig(Config):
             Defaults to `EmbedderType.GREEDY`.
         layout_greedy_embedder (LayoutType | str, optional): Layout type for the
             greedy embedder method. Defaults to `LayoutType.TRIANGULAR`.
+        greedy_lazy_mismatch (bool, optional): Whether the greedy embedder evaluates the
+            node-node vs trap-trap mismatches on demand from the trap interactions,
+            instead of storing all of them (n_nodes² × n_traps² floats). Defaults to False.
+        greedy_strategy (GreedyStrategyType | str, optional): Search strategy of the
+            greedy embedder, one pass per start node, all passes batched as tensors, or
+            a beam search. Defaults to `GreedyStrategyType.MULTI_START`.
+        greedy_beam_width (int, optional): Number of partial placements kept at each
+            step by the `BEAM` strategy. Defaults to 8.
+        greedy_num_workers (int | None, optional): Number of threads running the passes
+            of the start nodes with the `MULTI_START` strategy. None lets the thread
+            pool choose. Defaults to 1 (serial).
         blade_steps_per_round (int, optional): The number of steps
             for each layer of dimension for BLaDE.
             Defaults to 200.
@@ -82,6 +351,10 @@ class EmbeddingConfig(Config):
 
     embedding_method: Any = EmbedderType.GREEDY
     layout_greedy_embedder: LayoutType | str = LayoutType.TRIANGULAR
+    greedy_lazy_mismatch: bool = False
+    greedy_strategy: GreedyStrategyType = GreedyStrategyType.MULTI_START
+    greedy_num_workers: int | None = 1
+    greedy_beam_width: int = 8
     blade_steps_per_round: int | None = 200
     starting_positions: torch.Tensor | None = None
     blade_dimensions: list[int] = field(default_factory=lambda: [5, 4, 3, 2, 2, 2])
@@ -112,6 +385,13 @@ class EmbeddingConfig(Config):
         else:
             raise TypeError("Invalid embedding method type.")
 
+    @field_validator("greedy_num_workers", "greedy_beam_width")
+    @classmethod
+    def _check_greedy_counts(cls, val: int | None) -> int | None:
+        if val is not None and val <= 0:
+            raise ValueError("`greedy_num_workers` and `greedy_beam_width` should be positive.")
+        return val
+
     @field_validator("layout_greedy_embedder")
     @classmethod
     def _normalize_layout(cls, val: str | LayoutType) -> LayoutType:
@@ -227,6 +507,45 @@ class PulseShapingConfig(Config):
             raise ValueError("`initial_detuning_parameters` should be a list of 3 numbers.")
 
 
+class HybridConfig(Config):
+    """A `HybridConfig` instance defines the large-neighbourhood decomposition, which
+        improves an incumbent by solving subproblems of a large QUBO.
+
+    Attributes:
+        subproblem_size (int, optional): Maximal number of variables of a subproblem,
+            capped to the size supported by the quantum pipeline when it is used.
+            Defaults to 80.
+        max_passes (int, optional): Maximal number of passes over all the variables.
+            Defaults to 10.
+        stagnation_passes (int, optional): Number of passes without improvement after
+            which the search stops. Defaults to 2.
+        embedding_cache (bool, optional): Whether the embeddings of the subproblems are
+            reused for subproblems with the same sparsity pattern. Defaults to True.
+        seed (int | None, optional): Seed of the initial incumbent and of the
+            neighbourhoods diversifying the passes after a stagnation. Defaults to None.
+    """
+
+    subproblem_size: int = 80
+    max_passes: int = 10
+    stagnation_passes: int = 2
+    embedding_cache: bool = True
+    seed: int | None = None
+
+    @field_validator("subproblem_size", "max_passes", "stagnation_passes")
+    @classmethod
+    def _check_positive(cls, val: int) -> int:
+        if val <= 0:
+            raise ValueError("Subproblem sizes and pass counts should be positive.")
+        return val
+
+    @field_validator("seed")
+    @classmethod
+    def _check_seed(cls, val: int | None) -> int | None:
+        if val is not None and not 0 <= val < 2**32:
+            raise ValueError("`seed` should be in [0, 2**32).")
+        return val
+
+
 class SolverConfig(Config):
     """
     A `SolverConfig` instance defines how a QUBO problem should be solved.
@@ -252,8 +571,28 @@ class SolverConfig(Config):
 
         do_postprocessing (bool, optional): Whether we apply post-processing (`True`)
             or not (`False`).
+        postprocessing_strategy (LocalSearchType | str, optional): Local search used in
+            post-processing: `best_improvement` or `first_improvement` per sample,
+            `batched` to run best-improvement descent on all deduplicated samples at once,
+            or `tabu` to run a tabu search from each deduplicated sample.
+            Defaults to `LocalSearchType.BEST_IMPROVEMENT`.
         do_preprocessing (bool, optional): Whether we apply pre-processing (`True`)
             or not (`False`)
+        preprocessing_cache (bool, optional): Whether the fixations found by pre-processing
+            are cached, keyed by a fingerprint of the coefficients, and reused for identical
+            instances. Defaults to False.
+        preprocessing_cache_dir (str | None, optional): Directory where cached fixations
+            are also persisted on disk. Defaults to None (in-memory cache only).
+        decompose_components (bool, optional): Whether the (pre-processed) QUBO is split
+            into the connected components of its coupling graph, solved independently.
+            Defaults to False.
+        decomposition_workers (int | None, optional): Number of threads solving the
+            components. Defaults to None (chosen by the thread pool).
+        hybrid_decomposition (bool, optional): Whether the QUBO is solved by improving an
+            incumbent on subproblems, solved with the quantum or classical approach.
+            Defaults to False.
+        hybrid (HybridConfig, optional): Large-neighbourhood decomposition part
+            configuration of the solver.
     """
 
     config_name: str = ""
@@ -265,8 +604,22 @@ class SolverConfig(Config):
     classical: ClassicalConfig = ClassicalConfig()
     num_shots: int = 500
     do_postprocessing: bool = False
+    postprocessing_strategy: LocalSearchType = LocalSearchType.BEST_IMPROVEMENT
     do_preprocessing: bool = False
+    preprocessing_cache: bool = False
+    preprocessing_cache_dir: str | None = None
     activate_trivial_solutions: bool = True
+    decompose_components: bool = False
+    decomposition_workers: int | None = None
+    hybrid_decomposition: bool = False
+    hybrid: HybridConfig = HybridConfig()
+
+    @field_validator("decomposition_workers")
+    @classmethod
+    def _check_decomposition_workers(cls, val: int | None) -> int | None:
+        if val is not None and val <= 0:
+            raise ValueError("`decomposition_workers` should be positive.")
+        return val
 
     def __repr__(self) -> str:
         return self.config_name
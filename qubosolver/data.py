@@ -8,6 +8,7 @@ from torch.utils.data import Dataset
 
 from qubosolver.data_utils import generate_symmetric_mask
 from qubosolver.qubo_types import SolutionStatusType
+from qubosolver.utils.qubo_eval import calculate_qubo_costs
 
 if TYPE_CHECKING:
     pass
@@ -34,6 +35,13 @@ class QUBOSolution:
         costs (torch.Tensor):
             Tensor of shape (num_solutions,), containing the cost associated with each
             bitstring solution.
+        provenance (list[str] | None):
+            Name of the solver which found each bitstring, when solutions of several
+            solvers are merged. Optional, can be None.
+        best_bound (float | None):
+            Lower bound on the optimal cost proved by an exact solver. Optional, can be None.
+        gap (float | None):
+            Relative gap between the best cost and `best_bound`. Optional, can be None.
     """
 
     bitstrings: torch.Tensor
@@ -41,6 +49,9 @@ class QUBOSolution:
     counts: torch.Tensor | None = None
     probabilities: torch.Tensor | None = None
     solution_status: SolutionStatusType = SolutionStatusType.UNPROCESSED
+    provenance: list[str] | None = None
+    best_bound: float | None = None
+    gap: float | None = None
 
     def compute_costs(self, instance: Any) -> torch.Tensor:
         """
@@ -55,20 +66,19 @@ class QUBOSolution:
         # Retrieve the QUBO matrix from the QUBOInstance
         QUBO = instance.coefficients  # Assuming `coefficients` holds the QUBO matrix
 
-        costs = []
-        for bitstring in self.bitstrings:
-            if isinstance(bitstring, str):
-                z = torch.tensor([int(b) for b in bitstring], dtype=torch.float32)
-            elif isinstance(bitstring, torch.Tensor):
-                z = bitstring.detach().clone()
-            else:
-                z = torch.tensor(bitstring, dtype=torch.float32)
-            cost = torch.matmul(
-                z.permute(*torch.arange(z.ndim - 1, -1, -1)), torch.matmul(QUBO, z)
-            ).item()  # Use the QUBO matrix from the instance
-            costs.append(cost)
-
-        return torch.tensor(costs)
+        if isinstance(self.bitstrings, torch.Tensor):
+            bitstrings = self.bitstrings.detach()
+        else:
+            bitstrings = torch.tensor(
+                [
+                    [int(b) for b in bitstring] if isinstance(bitstring, str) else bitstring
+                    for bitstring in self.bitstrings
+                ],
+                dtype=torch.float32,
+            )
+
+        # Evaluate all bitstrings at once with the batched kernel
+        return calculate_qubo_costs(bitstrings, QUBO).to(torch.float32)
 
     def compute_probabilities(self) -> torch.Tensor:
         """
@@ -90,7 +100,7 @@ class QUBOSolution:
         """
         Sorts the QUBOSolution in-place by increasing cost.
 
-        Reorders bitstrings, costs, counts, and probabilities (if available)
+        Reorders bitstrings, costs, counts, probabilities and provenance (if available)
         based on the ascending order of the costs.
         """
 
@@ -101,6 +111,8 @@ class QUBOSolution:
             self.counts = self.counts[sorted_indices]
         if self.probabilities is not None:
             self.probabilities = self.probabilities[sorted_indices]
+        if self.provenance is not None:
+            self.provenance = [self.provenance[i] for i in sorted_indices.tolist()]
 
 
 class QUBODataset(Dataset):
@@ -119,3 +119,43 @@ def generate_symmetric_mask(
             mask[i, j] = True
             mask[j, i] = True
     return mask
+
+
+def convert_to_sparse_tensor(
+    data: list | dict | tuple | np.ndarray | torch.Tensor,
+    device: str = "cpu",
+    dtype: torch.dtype = torch.float32,
+) -> torch.Tensor:
+    """Convert QUBO coefficients to a coalesced sparse COO tensor.
+
+    Dictionaries of `(i, j) -> value` entries are converted directly from their keys
+    (mirroring off-diagonal entries), so that no dense matrix is built. Other inputs
+    go through `convert_to_tensor` first.
+
+    Args:
+        data (list | dict | tuple | np.ndarray | torch.Tensor): Coefficients.
+        device (str): Torch device.
+        dtype (torch.dtype): Data type of the values.
+
+    Returns:
+        torch.Tensor: Coalesced COO tensor of shape (size, size).
+    """
+    if isinstance(data, dict) and data and all(isinstance(k, tuple) for k in data.keys()):
+        keys = torch.tensor(list(data.keys()), dtype=torch.long, device=device).reshape(-1, 2)
+        values = torch.tensor(list(data.values()), dtype=dtype, device=device)
+        size = int(keys.max().item()) + 1
+        off_diagonal = keys[:, 0] != keys[:, 1]
+        indices = torch.cat((keys, keys[off_diagonal].flip(1))).T
+        values = torch.cat((values, values[off_diagonal]))
+
+        # Later entries override earlier ones on the same position, as for dense inputs
+        linear, inverse = torch.unique(indices[0] * size + indices[1], return_inverse=True)
+        unique_values = torch.zeros(linear.numel(), dtype=dtype, device=device)
+        unique_values[inverse] = values
+        unique_indices = torch.stack((linear // size, linear % size))
+        return torch.sparse_coo_tensor(
+            unique_indices, unique_values, (size, size), device=device
+        ).coalesce()
+
+    tensor = convert_to_tensor(data, device=device, dtype=dtype)
+    return tensor.to_sparse_coo().coalesce()  # type: ignore[no-any-return]
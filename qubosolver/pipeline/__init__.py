@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from .basesolver import BaseSolver
+from .decomposition import ComponentDecomposition, connected_components
 from .embedder import get_embedder
 from .fixtures import Fixtures
+from .preprocessing_cache import PreprocessingCache, get_preprocessing_cache
 from .pulse import get_pulse_shaper
+from .subproblems import EmbeddingCache, clamped_subproblem, impact_neighbourhoods
 from .targets import Pulse, Register
 
 __all__ = [
@@ -12,5 +15,12 @@ __all__ = [
     "get_pulse_shaper",
     "get_embedder",
     "BaseSolver",
+    "ComponentDecomposition",
+    "connected_components",
+    "EmbeddingCache",
+    "clamped_subproblem",
+    "impact_neighbourhoods",
     "Fixtures",
+    "PreprocessingCache",
+    "get_preprocessing_cache",
 ]
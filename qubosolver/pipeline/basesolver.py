@@ -11,6 +11,7 @@ from qubosolver import QUBOInstance
 from qubosolver.config import SolverConfig
 from qubosolver.data import QUBOSolution
 from qubosolver.qubo_types import SolutionStatusType
+from qubosolver.utils.sparse import is_sparse
 
 from .targets import Pulse, Register
 
@@ -135,6 +136,9 @@ class BaseSolver(ABC):
         coeffs = self.instance.coefficients  # torch.Tensor (n, n)
         n = self.instance.size
         device, dtype = coeffs.device, coeffs.dtype
+        if is_sparse(coeffs):
+            # implicit zeros satisfy both cases, only stored values need checking
+            coeffs = coeffs.to_sparse_coo().coalesce().values()
 
         # Case 1: all coeffs >= 0 → x = [0,...,0]
         if torch.all(coeffs >= 0):
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from copy import copy
+
+import numpy as np
+import torch
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components as scipy_connected_components
+
+from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.qubo_types import StorageType
+from qubosolver.utils.sparse import (
+    is_sparse,
+    sparse_diagonal,
+    sparse_entries,
+    storage_of,
+    to_storage,
+)
+
+
+def connected_components(coefficients: torch.Tensor) -> list[torch.Tensor]:
+    """
+    Returns the connected components of the coupling graph of a QUBO.
+
+    Two variables are adjacent when their off-diagonal coefficient is non-zero.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+
+    Returns:
+        list[torch.Tensor]: Sorted indices of the variables of each component,
+            largest components first.
+    """
+    size = coefficients.shape[0]
+    rows, cols, _ = (t.cpu().numpy() for t in sparse_entries(coefficients))
+    off_diagonal = rows != cols
+    graph = coo_matrix(
+        (np.ones(int(off_diagonal.sum())), (rows[off_diagonal], cols[off_diagonal])),
+        shape=(size, size),
+    )
+    _, labels = scipy_connected_components(graph, directed=False)
+    labels = torch.from_numpy(labels).long()
+    components = [torch.nonzero(labels == label).flatten() for label in labels.unique()]
+    return sorted(components, key=lambda component: (-len(component), int(component[0])))
+
+
+class ComponentDecomposition:
+    """
+    Splits a QUBO into the independent sub-QUBOs of its connected components.
+
+    Without couplings between them, the energy of a bitstring is the sum of the
+    energies of its restrictions to the components, which can thus be solved
+    separately. Isolated variables are solved directly: a variable without couplings
+    is 1 if and only if its diagonal coefficient is negative.
+    """
+
+    def __init__(self, instance: QUBOInstance):
+        """
+        Find the components of a QUBO instance.
+
+        Args:
+            instance (QUBOInstance): The QUBO instance to decompose.
+        """
+        if instance.coefficients is None:
+            raise ValueError("QUBO coefficients are not initialized.")
+        self.instance = instance
+        components = connected_components(instance.coefficients)
+
+        # Components with couplings, to be solved
+        self.components: list[torch.Tensor] = [c for c in components if len(c) > 1]
+        # Values of the isolated variables, at their positions (0 elsewhere)
+        self.fixed_values = torch.zeros(instance.coefficients.shape[0], dtype=torch.float32)
+        isolated = torch.cat(
+            [c for c in components if len(c) == 1] + [torch.empty(0, dtype=torch.long)]
+        )
+        diagonal = sparse_diagonal(instance.coefficients).cpu()
+        self.fixed_values[isolated] = (diagonal[isolated] < 0).to(torch.float32)
+        self._subinstances: list[QUBOInstance] | None = None
+
+    def subinstances(self) -> list[QUBOInstance]:
+        """
+        Returns the sub-QUBO of each component with couplings.
+
+        Returns:
+            list[QUBOInstance]: The restrictions of the instance to the components,
+                in the order of `components`.
+        """
+        if self._subinstances is not None:
+            return self._subinstances
+
+        Q = self.instance.coefficients
+        self._subinstances = []
+        for component in self.components:
+            indices = component.to(Q.device)
+            if is_sparse(Q):
+                coo = to_storage(Q, StorageType.COO)
+                coefficients = to_storage(
+                    coo.index_select(0, indices).index_select(1, indices), storage_of(Q)
+                )
+            else:
+                coefficients = Q[indices][:, indices]
+            # The coefficients of the instance are never modified: a shallow copy is enough
+            subinstance = copy(self.instance)
+            subinstance.coefficients = coefficients
+            subinstance.update_metrics()
+            self._subinstances.append(subinstance)
+        return self._subinstances
+
+    def combine(self, solutions: list[QUBOSolution]) -> QUBOSolution:
+        """
+        Assembles the solutions of the components into solutions of the instance.
+
+        Row r combines the r-th best bitstring of every component, or its last one for
+        the components with fewer bitstrings, so that the rows stay sorted by cost.
+        The best bounds of the components add up when all of them report one.
+
+        Args:
+            solutions (list[QUBOSolution]): A solution of each component, in the order
+                of `components`.
+
+        Returns:
+            QUBOSolution: The combined bitstrings, sorted by cost, and their costs.
+        """
+        solutions = [copy(solution) for solution in solutions]
+        for solution, subinstance in zip(solutions, self.subinstances()):
+            if solution.bitstrings.shape[0] == 0:
+                raise ValueError("A component of the decomposition has no solution.")
+            solution.costs = subinstance.evaluate_solutions(solution.bitstrings.float())
+            solution.sort_by_cost()
+
+        num_rows = max([solution.bitstrings.shape[0] for solution in solutions], default=1)
+        bitstrings = self.fixed_values.repeat(num_rows, 1)
+        rows = torch.arange(num_rows)
+        for solution, component in zip(solutions, self.components):
+            selected = rows.clamp(max=solution.bitstrings.shape[0] - 1)
+            bitstrings[:, component] = solution.bitstrings[selected].cpu().to(torch.float32)
+        costs = self.instance.evaluate_solutions(bitstrings).to(torch.float32)
+
+        best_bound, gap = None, None
+        bounds = [solution.best_bound for solution in solutions if solution.best_bound is not None]
+        if solutions and len(bounds) == len(solutions):
+            # The fixed isolated variables are optimal: their energy is exact
+            isolated_energy = float(
+                (self.fixed_values * sparse_diagonal(self.instance.coefficients).cpu()).sum()
+            )
+            best_bound = sum(bounds) + isolated_energy
+            best_cost = float(costs.min())
+            gap = abs(best_cost - best_bound) / (1e-10 + abs(best_cost))
+
+        return QUBOSolution(bitstrings=bitstrings, costs=costs, best_bound=best_bound, gap=gap)
@@ -88,7 +88,7 @@ class BLaDEmbedder(BaseEmbedder):
     def embed(self) -> TargetRegister:
 
         coords = em_blade(
-            qubo=BLaDEmbedder._preprocessing_qubo(self.instance.coefficients.numpy()),
+            qubo=BLaDEmbedder._preprocessing_qubo(self.instance.to_dense().numpy()),
             device=self.backend.device(),
             draw_steps=self.config.embedding.draw_steps,
             dimensions=self.config.embedding.blade_dimensions,
@@ -137,6 +137,10 @@ class GreedyEmbedder(BaseEmbedder):
             "layout": self.config.embedding.layout_greedy_embedder,
             "traps": int(self.config.embedding.traps),
             "spacing": float(self.config.embedding.spacing),
+            "lazy_mismatch": bool(self.config.embedding.greedy_lazy_mismatch),
+            "strategy": self.config.embedding.greedy_strategy,
+            "num_workers": self.config.embedding.greedy_num_workers,
+            "beam_width": int(self.config.embedding.greedy_beam_width),
             # animation controls (all read by Greedy)
             "draw_steps": bool(self.config.embedding.draw_steps),  # collect per-step data
             "animation": bool(self.config.embedding.draw_steps),  # render animation after run
@@ -155,7 +159,7 @@ class GreedyEmbedder(BaseEmbedder):
         printable["device"] = dev_str  # avoid dumping the whole object
         # --- Call Greedy (unchanged public signature)
         best, _, coords, _, _ = Greedy().launch_greedy(
-            Q=self.instance.coefficients,
+            Q=self.instance.to_dense(),
             params=params,
             # no extra kwargs; Greedy reads animation/draw/save_path from params
         )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Callable, Dict, List, cast
+from copy import copy
+from typing import Callable, Dict, List
 
 import dimod
 import numpy as np
@@ -9,8 +9,21 @@ import torch
 from dwave.preprocessing.lower_bounds import roof_duality
 
 from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.algorithms.local_search import (
+    IncrementalLocalSearch,
+    batched_local_search,
+    tabu_search,
+)
 from qubosolver.config import SolverConfig
-from qubosolver.qubo_types import SolutionStatusType
+from qubosolver.pipeline.preprocessing_cache import FixationResult, get_preprocessing_cache
+from qubosolver.qubo_types import LocalSearchType, SolutionStatusType, StorageType
+from qubosolver.utils.sparse import (
+    is_sparse,
+    sparse_diagonal,
+    sparse_entries,
+    storage_of,
+    to_storage,
+)
 
 
 def bit_flip_local_search(
@@ -52,7 +65,58 @@ def bit_flip_local_search(
     return s_current, current_objective
 
 
-def hansen_fixing(qubo: QUBOInstance) -> Dict[int, int]:
+def hansen_fixed_indices(
+    coefficients: torch.Tensor,
+    rows: torch.Tensor | None = None,
+    epsilon: float = 1e-8,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Applies the Hansen fixing rule to the rows of a QUBO matrix with tensor operations.
+
+    Variable i is fixed to 0 when Q_ii + 2 * sum_{j != i} min(0, Q_ij) >= 0, and to 1
+    when Q_ii + 2 * sum_{j != i} max(0, Q_ij) <= 0. The row sums of all examined rows
+    are computed in one pass.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        rows (torch.Tensor | None, optional): Indices of the rows to examine (worklist
+            mode). Defaults to None, which examines every row.
+        epsilon (float, optional): Tolerance to avoid floating-point precision issues.
+            Defaults to 1e-8.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Sorted indices of the variables fixed to 0
+            and of the variables fixed to 1.
+    """
+    size = coefficients.shape[0]
+    if rows is None:
+        rows = torch.arange(size, device=coefficients.device)
+    diagonal = sparse_diagonal(coefficients)[rows].to(torch.float64)
+
+    if is_sparse(coefficients):
+        entry_rows, entry_cols, values = sparse_entries(coefficients)
+        selected = torch.zeros(size, dtype=torch.bool, device=coefficients.device)
+        selected[rows] = True
+        off_diagonal = (entry_rows != entry_cols) & selected[entry_rows]
+        entry_rows, values = entry_rows[off_diagonal], values[off_diagonal].to(torch.float64)
+        q_minus = torch.zeros(size, dtype=torch.float64, device=coefficients.device)
+        q_plus = torch.zeros(size, dtype=torch.float64, device=coefficients.device)
+        q_minus.index_add_(0, entry_rows, values.clamp(max=0))
+        q_plus.index_add_(0, entry_rows, values.clamp(min=0))
+        q_minus, q_plus = q_minus[rows], q_plus[rows]
+    else:
+        Q = coefficients[rows]
+        # Off-diagonal sums: remove the diagonal contribution from the full row sums
+        q_minus = Q.clamp(max=0).sum(dim=1, dtype=torch.float64) - diagonal.clamp(max=0)
+        q_plus = Q.sum(dim=1, dtype=torch.float64) - diagonal - q_minus
+
+    to_zero = diagonal + 2 * q_minus >= -epsilon
+    to_one = ~to_zero & (diagonal + 2 * q_plus <= epsilon)
+    return rows[to_zero].sort().values, rows[to_one].sort().values
+
+
+def hansen_fixing(qubo: QUBOInstance, rows: torch.Tensor | None = None) -> Dict[int, int]:
     """
     Identifies and fixes variables in a QUBO instance based on threshold conditions.
 
@@ -61,6 +125,9 @@ def hansen_fixing(qubo: QUBOInstance) -> Dict[int, int]:
 
     Args:
         qubo (QUBOInstance): The QUBO instance containing the coefficients matrix.
+        rows (torch.Tensor | None, optional): Indices of the variables to examine. Only
+            the rows touched by the last reductions need to be re-examined.
+            Defaults to None, which examines every variable.
 
     Returns:
         Dict[int, int]: A dictionary mapping variable indices to fixed values (0 or 1).
@@ -68,23 +135,11 @@ def hansen_fixing(qubo: QUBOInstance) -> Dict[int, int]:
     if qubo.coefficients is None:
         raise ValueError("QUBO coefficients are not initialized.")
 
-    fixed_dict: Dict[int, int] = {}
-    size_raw = qubo.size
-    size: int = cast(int, size_raw)
-    epsilon: float = 1e-8  # Tolerance to avoid floating-point precision issues
+    fixed_to_zero, fixed_to_one = hansen_fixed_indices(qubo.coefficients, rows)
 
-    for i in range(size):
-        ci = qubo.coefficients[i, i].item()  # Diagonal element
-
-        q_minus = sum(min(0, qubo.coefficients[i, j].item()) for j in range(size) if j != i)
-        q_plus = sum(max(0, qubo.coefficients[i, j].item()) for j in range(size) if j != i)
-
-        if ci + q_minus * 2 >= -epsilon:
-            fixed_dict[i] = 0
-        elif ci + q_plus * 2 <= epsilon:
-            fixed_dict[i] = 1
-
-    return fixed_dict
+    fixed_dict: Dict[int, int] = dict.fromkeys(fixed_to_zero.tolist(), 0)
+    fixed_dict.update(dict.fromkeys(fixed_to_one.tolist(), 1))
+    return dict(sorted(fixed_dict.items()))
 
 
 def dwave_roof_duality_fixing(qubo_inst: QUBOInstance) -> Dict[int, int]:
@@ -104,7 +159,22 @@ def dwave_roof_duality_fixing(qubo_inst: QUBOInstance) -> Dict[int, int]:
         raise ValueError("QUBO coefficients are not initialized.")
 
     # Convert QUBO matrix to a Binary Quadratic Model (BQM) format
-    bqm = dimod.BinaryQuadraticModel.from_qubo(qubo_inst.coefficients.cpu().numpy())
+    if qubo_inst.is_sparse:
+        # Build the BQM from the non-zero entries without densifying
+        rows, cols, values = sparse_entries(qubo_inst.coefficients.cpu())
+        off_diagonal = rows != cols
+        bqm = dimod.BinaryQuadraticModel.from_numpy_vectors(
+            linear=sparse_diagonal(qubo_inst.coefficients.cpu()).numpy(),
+            quadratic=(
+                rows[off_diagonal].numpy(),
+                cols[off_diagonal].numpy(),
+                values[off_diagonal].numpy(),
+            ),
+            offset=0.0,
+            vartype=dimod.BINARY,
+        )
+    else:
+        bqm = dimod.BinaryQuadraticModel.from_qubo(qubo_inst.coefficients.cpu().numpy())
 
     # Apply roof duality to identify fixable variables
     _, raw_fixed = roof_duality(bqm, strict=True)
@@ -134,12 +204,39 @@ class Fixtures:
         self.instance = instance
         self.config = config
 
-        self.reduced_qubo: QUBOInstance = deepcopy(instance)
+        # Copy-on-write: the reduced instance shares the original one until
+        # a first variable is fixed (see `reduced_qubo`).
+        self._reduced_qubo: QUBOInstance | None = None
         self.fixation_rule_list: List[Callable[[QUBOInstance], Dict[int, int]]] = [
             hansen_fixing,
             dwave_roof_duality_fixing,
         ]
         self.fixed_var_dict_list: List[Dict[int, int]] = []
+        # Worklist of `hansen_fixing`: mask of the reduced variables whose row changed
+        # since the rule last examined it (None until the first examination).
+        self.hansen_worklist: torch.Tensor | None = None
+        # Index in the original instance of each variable of the reduced QUBO
+        self.kept_indices: torch.Tensor = torch.arange(instance.size or 0)
+        # Full-length template holding the values of the fixed variables (0 elsewhere)
+        self.fixed_values: torch.Tensor = torch.zeros(instance.size or 0, dtype=torch.float32)
+        # Constant energy of the fixed variables: x^T Q x = x_r^T Q_r x_r + fixed_energy
+        self.fixed_energy: float = 0.0
+        # Whether the last preprocessing reused a cached result
+        self.cache_hit: bool = False
+
+    @property
+    def reduced_qubo(self) -> QUBOInstance:
+        """Returns the reduced QUBO instance.
+
+        Until preprocessing fixes a variable, this is the original instance itself,
+        so that no copy of its coefficients is made.
+
+        Returns:
+            QUBOInstance: The reduced instance.
+        """
+        if self._reduced_qubo is None:
+            return self.instance
+        return self._reduced_qubo
 
     @property
     def n_fixed_variables(self) -> int:
@@ -154,26 +251,81 @@ class Fixtures:
         """
         Apply preprocessing steps to the QUBO instance before solving.
 
+        The fixation rules are applied until exhaustion. If `preprocessing_cache` is
+        enabled in the configuration, the fixations of an instance with the same
+        coefficients are reused instead, and recorded otherwise.
+
         Returns:
             QUBOInstance: The processed or annotated instance.
         """
 
-        # Check if postprocessing is enabled via the configuration.
-        if not hasattr(self.config, "do_postprocessing") or not self.config.do_postprocessing:
+        # Check if preprocessing is enabled via the configuration.
+        if not getattr(self.config, "do_preprocessing", False):
             return self.instance
 
+        cache = None
+        if getattr(self.config, "preprocessing_cache", False):
+            cache = get_preprocessing_cache(self.config.preprocessing_cache_dir)
+            key = cache.key(self.instance, self.fixation_rule_list)
+            result = cache.get(key)
+            if result is not None:
+                # Same coefficients and rules: reuse the fixations found previously
+                self.load_fixation_result(result)
+                self.cache_hit = True
+                return self.instance
+
         # Apply every rules until exhaustion
         self.apply_full_fixation_exhaust()
 
+        if cache is not None:
+            cache.put(key, self.fixation_result())
+
         return self.instance
 
+    def fixation_result(self) -> FixationResult:
+        """
+        Exports a copy of the fixations found by preprocessing, which later changes to
+        this object do not affect.
+
+        Returns:
+            FixationResult: The fixed variables, reduced coefficients and restoration data.
+        """
+        return FixationResult(
+            fixed_var_dict_list=[dict(fixed) for fixed in self.fixed_var_dict_list],
+            reduced_coefficients=(
+                self._reduced_qubo.coefficients.clone() if self._reduced_qubo is not None else None
+            ),
+            kept_indices=self.kept_indices.clone(),
+            fixed_values=self.fixed_values.clone(),
+            fixed_energy=self.fixed_energy,
+        )
+
+    def load_fixation_result(self, result: FixationResult) -> None:
+        """
+        Restores the fixations of a previous preprocessing of the same instance.
+
+        Args:
+            result (FixationResult): The fixations, as returned by `fixation_result`.
+        """
+        self.fixed_var_dict_list = [dict(fixed) for fixed in result.fixed_var_dict_list]
+        self._reduced_qubo = None
+        if result.reduced_coefficients is not None:
+            self._reduced_qubo = copy(self.instance)
+            self._reduced_qubo.coefficients = result.reduced_coefficients.clone()
+        self.kept_indices = result.kept_indices.clone()
+        self.fixed_values = result.fixed_values.clone()
+        self.fixed_energy = result.fixed_energy
+        # The rules were applied until exhaustion: no row is left to examine
+        self.hansen_worklist = torch.zeros(self.kept_indices.shape[0], dtype=torch.bool)
+
     def postprocess(self, solution: QUBOSolution) -> QUBOSolution:
         """
         Apply postprocessing steps to the QUBO solution after solving.
 
         This method iterates over all solutions in the bitstrings tensor and, for each solution,
-        performs a local bit-flip search to attempt to improve its objective value. The objective
-        is computed using the QUBOInstance's evaluate_solution method.
+        performs a local bit-flip search to attempt to improve its objective value. The search
+        uses an `IncrementalLocalSearch` engine built once for the instance, which updates the
+        flip gains in O(n) after each accepted flip.
 
         Args:
             solution (QUBOSolution): The raw solution from the solver.
@@ -189,26 +341,44 @@ class Fixtures:
         if solution.bitstrings.numel() == 0:
             return solution
 
-        # Define an objective function that uses the existing evaluate_solution method.
-        def qubo_objective(s_arr: np.ndarray) -> float:
-            # Convert the solution array to a list of integers
-            return self.instance.evaluate_solution(s_arr.tolist())
+        strategy = LocalSearchType(
+            getattr(self.config, "postprocessing_strategy", LocalSearchType.BEST_IMPROVEMENT)
+        )
+
+        if strategy == LocalSearchType.BATCHED:
+            # Improve all (deduplicated) solutions at once with tensor operations.
+            batched_bitstrings, batched_costs = batched_local_search(
+                self.instance.coefficients, solution.bitstrings
+            )
+            new_bitstrings_tensor = batched_bitstrings.to(torch.float32)
+            new_costs_tensor = batched_costs.to(torch.float32)
+        elif strategy == LocalSearchType.TABU:
+            # Polish each distinct solution with a tabu search started from it.
+            unique, inverse = torch.unique(solution.bitstrings, dim=0, return_inverse=True)
+            parameters = self.config.classical.sampler.native_tabu_parameters()
+            parameters.pop("num_restarts", None)
+            tabu_bitstrings, tabu_costs = tabu_search(
+                self.instance.coefficients, initial_states=unique, **parameters
+            )
+            new_bitstrings_tensor = tabu_bitstrings[inverse]
+            new_costs_tensor = tabu_costs[inverse]
+        else:
+            # Build the incremental local-search engine once for all solutions.
+            engine = IncrementalLocalSearch(self.instance.coefficients)
 
-        improved_bitstrings = []
-        improved_costs = []
-        num_solutions = solution.bitstrings.shape[0]
+            improved_bitstrings = []
+            improved_costs = []
+            bitstrings = solution.bitstrings.detach().cpu().numpy()
 
-        for idx in range(num_solutions):
-            # Get the current solution (row) as a numpy array of integers.
-            s_orig = solution.bitstrings[idx].detach().cpu().numpy().astype(int)
-            # Apply bit-flip local search to improve the solution.
-            s_improved, new_cost = bit_flip_local_search(qubo_objective, s_orig)
-            improved_bitstrings.append(s_improved)
-            improved_costs.append(new_cost)
+            for s_orig in bitstrings:
+                # Apply bit-flip local search to improve the solution.
+                s_improved, new_cost = engine.search(s_orig, strategy)
+                improved_bitstrings.append(s_improved)
+                improved_costs.append(new_cost)
 
-        # Create new tensors for the improved solutions and their costs.
-        new_bitstrings_tensor = torch.tensor(np.array(improved_bitstrings), dtype=torch.float32)
-        new_costs_tensor = torch.tensor(improved_costs, dtype=torch.float32)
+            # Create new tensors for the improved solutions and their costs.
+            new_bitstrings_tensor = torch.tensor(np.array(improved_bitstrings), dtype=torch.float32)
+            new_costs_tensor = torch.tensor(improved_costs, dtype=torch.float32)
 
         # Update the solution object.
         solution.bitstrings = new_bitstrings_tensor
@@ -225,9 +395,16 @@ class Fixtures:
         """
         Applies variable fixation to reduce the size of the QUBO problem.
 
-        This function modifies the QUBO coefficient matrix by:
-        - Removing rows and columns corresponding to fixed variables.
-        - Adjusting diagonal elements to account for fixed variables.
+        This function modifies the QUBO coefficient matrix in a single step by:
+        - Adjusting diagonal elements to account for variables fixed to 1, with one
+          matrix-vector product.
+        - Removing rows and columns corresponding to fixed variables, with one indexing
+          by the mask of kept variables.
+
+        `self.kept_indices` is updated so that it maps each variable of the reduced
+        QUBO to its index in the original instance, `self.fixed_values` records the
+        fixed values at their original positions and `self.fixed_energy` accumulates
+        the constant energy of the fixed variables.
 
         Args:
             fixed_dict (Dict[int, int]): A dictionary of fixed variable assignments.
@@ -237,26 +414,71 @@ class Fixtures:
         Returns:
             None: Modifies `self.reduced_qubo` in place.
         """
-        Q = self.reduced_qubo.coefficients.clone()
-
-        fixed_to_0 = {i for i, v in fixed_dict.items() if v == 0}
-        fixed_to_1 = {i for i, v in fixed_dict.items() if v == 1}
-        fixed_vars = sorted(fixed_to_0 | fixed_to_1, reverse=True)
-
-        for i in fixed_vars:
-            if i >= Q.shape[0]:
-                continue
-
-            if i in fixed_to_1:
-                for j in range(Q.shape[0]):
-                    if j != i:
-                        Q[j, j] += Q[i, j] * 2
+        Q = self.reduced_qubo.coefficients
+        size = Q.shape[0]
+
+        fixed_dict = {i: v for i, v in fixed_dict.items() if i < size}
+        if not fixed_dict:
+            return
+
+        fixed = torch.tensor(list(fixed_dict.keys()), dtype=torch.long, device=Q.device)
+        values = torch.tensor(list(fixed_dict.values()), dtype=Q.dtype, device=Q.device)
+        keep = torch.ones(size, dtype=torch.bool, device=Q.device)
+        keep[fixed] = False
+        kept = torch.nonzero(keep).flatten()
+
+        self._update_hansen_worklist(Q, keep)
+
+        # x_i = 1 adds 2 * Q_ij to the linear term (diagonal) of every other variable j
+        ones = torch.zeros(size, dtype=Q.dtype, device=Q.device)
+        ones[fixed] = values
+        field = torch.mv(Q, ones)
+        shift = (2 * field)[kept]
+        self.fixed_energy += float(torch.dot(ones, field))
+
+        if is_sparse(Q):
+            coo = to_storage(Q, StorageType.COO)
+            reduced = coo.index_select(0, kept).index_select(1, kept)
+            diagonal = torch.arange(kept.shape[0], device=Q.device).expand(2, -1)
+            reduced = reduced + torch.sparse_coo_tensor(
+                diagonal, shift, reduced.shape, dtype=Q.dtype, device=Q.device
+            )
+            reduced = to_storage(reduced, storage_of(Q))
+        else:
+            reduced = Q[kept][:, kept]
+            reduced.diagonal().add_(shift)
+
+        if self._reduced_qubo is None:
+            # First fixation: materialise the reduced instance. The original coefficients
+            # are never modified in place, so a shallow copy is enough.
+            self._reduced_qubo = copy(self.instance)
+        self._reduced_qubo.coefficients = reduced
+        self._reduced_qubo.update_metrics()
+        self.fixed_values[self.kept_indices[fixed.cpu()]] = values.cpu().to(torch.float32)
+        self.kept_indices = self.kept_indices[kept.cpu()]
+
+    def _update_hansen_worklist(self, Q: torch.Tensor, keep: torch.Tensor) -> None:
+        """
+        Marks the rows touched by a reduction for the next pass of `hansen_fixing`.
 
-            Q = torch.cat((Q[:i, :], Q[i + 1 :, :]), dim=0)
-            Q = torch.cat((Q[:, :i], Q[:, i + 1 :]), dim=1)
+        Fixing a variable only changes the rows of its neighbours, so the Hansen
+        conditions of the other rows are unchanged and need not be re-examined.
 
-        self.reduced_qubo.coefficients = Q
-        self.reduced_qubo.update_metrics()
+        Args:
+            Q (torch.Tensor): The coefficients before the reduction.
+            keep (torch.Tensor): Mask of the variables kept by the reduction.
+        """
+        if self.hansen_worklist is None:
+            return
+
+        is_fixed = ~keep.cpu()
+        touched = self.hansen_worklist.clone()
+        if is_sparse(Q):
+            rows, cols, _ = sparse_entries(Q.cpu())
+            touched[rows[is_fixed[cols]]] = True
+        else:
+            touched |= (Q[:, ~keep] != 0).any(dim=1).cpu()
+        self.hansen_worklist = touched[~is_fixed]
 
     def apply_rule(self, fixation_rule: Callable[[QUBOInstance], Dict[int, int]]) -> int:
         """
@@ -269,7 +491,18 @@ class Fixtures:
         Returns:
             int: The number of variables fixed by this rule.
         """
-        fixed = fixation_rule(self.reduced_qubo)
+        if fixation_rule is hansen_fixing:
+            # Worklist mode: only re-examine the rows touched by the last reductions
+            rows = None
+            if self.hansen_worklist is not None:
+                rows = torch.nonzero(self.hansen_worklist).flatten()
+                rows = rows.to(self.reduced_qubo.coefficients.device)
+            fixed = hansen_fixing(self.reduced_qubo, rows)
+            self.hansen_worklist = torch.zeros(
+                self.reduced_qubo.coefficients.shape[0], dtype=torch.bool
+            )
+        else:
+            fixed = fixation_rule(self.reduced_qubo)
         self.reduce_qubo(fixed)
 
         if fixed:
@@ -295,8 +528,10 @@ class Fixtures:
         """
         Restores fixed variables in the solution bitstrings after QUBO reduction.
 
-        This method reconstructs the full-length bitstrings by reinserting the fixed
-        variables at their original positions.
+        This method reconstructs the full-length bitstrings by scattering the reduced
+        bitstrings into the template of fixed values (`self.fixed_values`), at the
+        positions of the free variables (`self.kept_indices`). Costs are the costs on
+        the reduced QUBO plus the constant energy of the fixed variables.
 
         Args:
             solution (QUBOSolution): The solution object from the reduced QUBO problem.
@@ -307,27 +542,34 @@ class Fixtures:
         if not getattr(self.config, "do_preprocessing", False):
             return solution
 
-        bitstring_list = solution.bitstrings.tolist() or [[]]
-
-        def reinsert_fixed_variables(bitstring: List[int]) -> List[int]:
-            for fixation_dict in reversed(self.fixed_var_dict_list):
-                for position, bit_value in sorted(fixation_dict.items()):
-                    bitstring.insert(position, bit_value)
-            return bitstring
+        bitstrings = solution.bitstrings.to(torch.float32)
+        size = self.instance.size or 0
 
-        should_restore = not self.config.use_quantum or (
-            self.instance.size is not None and len(bitstring_list[0]) < self.instance.size
-        )
+        should_restore = not self.config.use_quantum or bitstrings.shape[-1] < size
 
         if should_restore:
-            bitstring_list = [reinsert_fixed_variables(bitstring) for bitstring in bitstring_list]
-
-        bitstrings = torch.tensor(bitstring_list, dtype=torch.float32)
+            if bitstrings.shape[0] == 0:
+                # If every variable was fixed, the fixed values are the solution
+                num_rows = 1 if self.kept_indices.numel() == 0 else 0
+                bitstrings = torch.empty((num_rows, self.kept_indices.numel()))
+
+            # The fixed variables only add a constant to the energy of the reduced QUBO
+            costs = self.reduced_qubo.evaluate_solutions(bitstrings) + self.fixed_energy
+
+            # Scatter the whole batch into copies of the full-length template
+            restored = self.fixed_values.to(bitstrings.device).repeat(bitstrings.shape[0], 1)
+            restored[:, self.kept_indices.to(bitstrings.device)] = bitstrings
+            bitstrings = restored
+        else:
+            costs = self.instance.evaluate_solutions(bitstrings)
+        costs = costs.to(torch.float32)
 
-        costs = torch.tensor(
-            [self.instance.evaluate_solution(sample.tolist()) for sample in bitstrings],
-            dtype=torch.float32,
-        )
+        # A bound on the reduced QUBO bounds the original one up to the fixed energy
+        best_bound, gap = solution.best_bound, solution.gap
+        if should_restore and best_bound is not None and costs.numel() > 0:
+            best_bound += self.fixed_energy
+            best_cost = float(costs.min())
+            gap = abs(best_cost - best_bound) / (1e-10 + abs(best_cost))
 
         return QUBOSolution(
             bitstrings=bitstrings,
@@ -335,4 +577,7 @@ class Fixtures:
             counts=solution.counts,
             probabilities=solution.probabilities,
             solution_status=SolutionStatusType.PREPROCESSED,
+            provenance=solution.provenance,
+            best_bound=best_bound,
+            gap=gap,
         )
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import torch
+
+from qubosolver.qubo_instance import QUBOInstance
+
+# Default number of fixation results kept in memory
+DEFAULT_CACHE_SIZE: int = 128
+
+
+@dataclass
+class FixationResult:
+    """
+    Outcome of the exhaustive application of fixation rules on a QUBO instance.
+
+    Attributes:
+        fixed_var_dict_list: The variables fixed at each rule application, with indices
+            relative to the QUBO reduced by the previous applications.
+        reduced_coefficients: Coefficients of the reduced QUBO, or None if no variable
+            was fixed.
+        kept_indices: Index in the original instance of each variable of the reduced QUBO.
+        fixed_values: Full-length template holding the values of the fixed variables.
+        fixed_energy: Constant energy of the fixed variables.
+    """
+
+    fixed_var_dict_list: List[Dict[int, int]]
+    reduced_coefficients: torch.Tensor | None
+    kept_indices: torch.Tensor
+    fixed_values: torch.Tensor
+    fixed_energy: float
+
+
+class PreprocessingCache:
+    """
+    LRU cache of fixation results, keyed by the fingerprint of the QUBO coefficients
+    and by the list of fixation rules applied.
+
+    Results are kept in memory and, if a directory is given, also written to disk so
+    that they survive across processes and sessions.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, directory: str | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int, optional): Maximal number of results kept in memory.
+                Defaults to `DEFAULT_CACHE_SIZE`.
+            directory (str | None, optional): Directory where results are persisted.
+                Defaults to None (in-memory only).
+        """
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: OrderedDict[str, FixationResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        instance: QUBOInstance, rules: Sequence[Callable[[QUBOInstance], Dict[int, int]]]
+    ) -> str:
+        """
+        Builds the cache key of an instance preprocessed with a list of rules.
+
+        Args:
+            instance (QUBOInstance): The original QUBO instance.
+            rules (Sequence[Callable]): The fixation rules, in application order.
+
+        Returns:
+            str: The cache key.
+        """
+        rule_names = ",".join(f"{rule.__module__}.{rule.__qualname__}" for rule in rules)
+        return hashlib.sha256(f"{instance.fingerprint()}|{rule_names}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.pt"
+
+    def get(self, key: str) -> FixationResult | None:
+        """
+        Looks a result up in memory, then on disk.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            FixationResult | None: The cached result, or None on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.directory is None or not self._path(key).exists():
+            return None
+        try:
+            result = FixationResult(**torch.load(self._path(key), weights_only=False))
+        except (OSError, RuntimeError, EOFError, TypeError):
+            # Unreadable or outdated entry: treat it as a miss
+            return None
+        self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: FixationResult) -> None:
+        """
+        Stores a result in memory and, if a directory is set, on disk.
+
+        Args:
+            key (str): The cache key.
+            result (FixationResult): The fixation result.
+        """
+        self._remember(key, result)
+        if self.directory is None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that readers never see a partial entry
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(descriptor)
+        try:
+            torch.save(result.__dict__, temporary)
+            os.replace(temporary, self._path(key))
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _remember(self, key: str, result: FixationResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empties the in-memory cache. Entries on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHES: Dict[str | None, PreprocessingCache] = {}
+
+
+def get_preprocessing_cache(directory: str | None = None) -> PreprocessingCache:
+    """
+    Returns the cache shared by all solvers of the process for a given directory.
+
+    Args:
+        directory (str | None, optional): Directory where results are persisted.
+            Defaults to None (in-memory only).
+
+    Returns:
+        PreprocessingCache: The shared cache.
+    """
+    if directory not in _CACHES:
+        _CACHES[directory] = PreprocessingCache(directory=directory)
+    return _CACHES[directory]
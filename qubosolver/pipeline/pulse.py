@@ -102,7 +102,7 @@ class AdiabaticPulseShaper(BasePulseShaper):
                     - float | None: The counts of each bitstring -> Not computed
         """
 
-        QUBO = instance.coefficients
+        QUBO = instance.to_dense()
         weights_list = torch.abs(torch.diag(QUBO)).tolist()
         max_node_weight = max(weights_list)
         norm_weights_list = [1 - (w / max_node_weight) for w in weights_list]
@@ -220,7 +220,7 @@ class OptimizedPulseShaper(BasePulseShaper):
             QUBOSolution: An instance of the qubo solution
         """
         # TODO: Harmonize the output of the pulse_shaper generate
-        QUBO = instance.coefficients
+        QUBO = instance.to_dense()
         self.register = register
         self.norm_weights_list = self._compute_norm_weights(QUBO)
 
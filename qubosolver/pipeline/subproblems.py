@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+import torch
+from scipy.sparse import csr_matrix
+
+from qubosolver.utils.sparse import gather_rows, sparse_entries
+
+from .targets import Register
+
+# Default number of embeddings kept by an `EmbeddingCache`
+DEFAULT_EMBEDDING_CACHE_SIZE: int = 128
+
+
+def clamped_subproblem(
+    coefficients: torch.Tensor, x: torch.Tensor, indices: torch.Tensor
+) -> torch.Tensor:
+    """
+    Returns the QUBO of a subset of variables, the other ones being clamped.
+
+    With the variables outside `indices` fixed to their values in x, the energy of x
+    is, up to a constant, the energy of x[indices] for the principal submatrix of
+    Q on `indices` whose diagonal is shifted by 2 * sum_{j not in indices} Q_ij x_j.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR). Prefer COO for repeated calls on sparse
+            coefficients.
+        x (torch.Tensor): Binary vector of shape (n,) holding the clamped values.
+        indices (torch.Tensor): Indices of the free variables, of shape (k,).
+
+    Returns:
+        torch.Tensor: Dense coefficients of the subproblem, of shape (k, k).
+    """
+    rows = gather_rows(coefficients, indices.to(coefficients.device))
+    clamped = x.to(rows.dtype).clone()
+    clamped[indices] = 0
+    field = torch.mv(rows, clamped.to(rows.device))
+    subproblem = rows[:, indices.to(rows.device)].clone()
+    subproblem.diagonal().add_(2 * field)
+    return subproblem
+
+
+def impact_neighbourhoods(
+    coefficients: torch.Tensor,
+    gains: torch.Tensor,
+    size: int,
+    generator: np.random.Generator | None = None,
+) -> list[torch.Tensor]:
+    """
+    Splits the variables into subproblems of strongly interacting, high-impact variables.
+
+    Variables are ranked by the energy change of their single flip, lowest first,
+    i.e. the flips which decrease the energy most or increase it least come first.
+    Each subproblem is grown from the first uncovered variable of the ranking by
+    repeatedly adding its uncovered neighbour in the coupling graph with the lowest
+    flip gain, and restarts from the ranking when it has no such neighbour. Coupled
+    variables thus move together, which clamping would otherwise prevent.
+
+    Args:
+        coefficients (torch.Tensor): Symmetric QUBO matrix of shape (n, n),
+            dense or sparse (COO or CSR).
+        gains (torch.Tensor): Energy change of the flip of each variable, of shape (n,).
+        size (int): Maximal number of variables of a subproblem.
+        generator (np.random.Generator | None, optional): When given, the subproblems
+            are grown from variables taken in a random order instead of the ranking,
+            which diversifies the neighbourhoods. Defaults to None.
+
+    Returns:
+        list[torch.Tensor]: Sorted indices of the variables of each subproblem.
+    """
+    num_variables = coefficients.shape[0]
+    rows, cols, _ = (t.cpu().numpy() for t in sparse_entries(coefficients))
+    off_diagonal = rows != cols
+    adjacency = csr_matrix(
+        (np.ones(int(off_diagonal.sum())), (rows[off_diagonal], cols[off_diagonal])),
+        shape=(num_variables, num_variables),
+    )
+    flip_gains = gains.cpu().numpy()
+    if generator is None:
+        order = np.argsort(flip_gains, kind="stable")
+    else:
+        order = generator.permutation(num_variables)
+
+    covered = np.zeros(num_variables, dtype=bool)
+    neighbourhoods = []
+    position = 0
+    num_covered = 0
+    while num_covered < num_variables:
+        neighbourhood: list[int] = []
+        # Uncovered neighbours of the neighbourhood, by flip gain
+        frontier: list[tuple[float, int]] = []
+        while len(neighbourhood) < size and num_covered < num_variables:
+            if frontier:
+                _, k = heapq.heappop(frontier)
+                if covered[k]:
+                    continue
+            else:
+                while covered[order[position]]:
+                    position += 1
+                k = int(order[position])
+            covered[k] = True
+            num_covered += 1
+            neighbourhood.append(k)
+            for j in adjacency.indices[adjacency.indptr[k] : adjacency.indptr[k + 1]]:
+                if not covered[j]:
+                    heapq.heappush(frontier, (float(flip_gains[j]), int(j)))
+        neighbourhoods.append(torch.tensor(sorted(neighbourhood), dtype=torch.long))
+    return neighbourhoods
+
+
+class EmbeddingCache:
+    """
+    LRU cache of the embeddings of subproblems, keyed by their sparsity pattern.
+
+    Subproblems with the same interaction graph reuse the same register, which
+    saves an embedding per subproblem when a decomposition revisits similar
+    neighbourhoods.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_EMBEDDING_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximal number of embeddings kept.
+                Defaults to `DEFAULT_EMBEDDING_CACHE_SIZE`.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Register] = OrderedDict()
+
+    @staticmethod
+    def key(coefficients: torch.Tensor) -> str:
+        """
+        Builds the cache key of a subproblem, from its size and the positions of its
+        non-zero off-diagonal coefficients.
+
+        Args:
+            coefficients (torch.Tensor): Coefficients of the subproblem.
+
+        Returns:
+            str: The cache key.
+        """
+        size = coefficients.shape[0]
+        rows, cols, _ = (entry.cpu().numpy() for entry in sparse_entries(coefficients))
+        off_diagonal = rows != cols
+        positions = rows[off_diagonal].astype(np.int64) * size + cols[off_diagonal]
+        digest = hashlib.sha256(f"pattern:{size}".encode())
+        digest.update(np.sort(positions).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Register | None:
+        """
+        Looks an embedding up.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Register | None: The cached register, or None on a miss.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: str, register: Register) -> None:
+        """
+        Stores an embedding.
+
+        Args:
+            key (str): The cache key.
+            register (Register): The register of the subproblem.
+        """
+        self._entries[key] = register
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -409,7 +409,8 @@ class QUBOAnalyzer:
             ValueError: If a bitstring's length does not match Q.shape[0].
         """
 
-        self.df[_COSTS] = self.df[_BITSTRINGS].apply(Q.evaluate_solution)
+        bitstrings = QUBOAnalyzer.bitstrings_to_tensor(self.df[_BITSTRINGS].tolist())
+        self.df[_COSTS] = Q.evaluate_solutions(bitstrings).tolist()
         return self.df
 
     def calculate_gaps(self, opt_cost: float, Q: QUBOInstance | None = None) -> pd.DataFrame:
@@ -434,7 +435,7 @@ class QUBOAnalyzer:
             self.df[_GAPS] = abs((self.df[_COSTS] - opt_cost) / opt_cost)
         else:
             if Q is not None:
-                self.df[_COSTS] = self.df[_BITSTRINGS].apply(Q.evaluate_solution)
+                self.calculate_costs(Q)
             else:
                 self.df[_GAPS] = abs((self.df[_COSTS] - opt_cost) / opt_cost)
         return self.df
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+from copy import deepcopy
+
 import torch
 from numpy.typing import ArrayLike
 
 from .data import QUBOSolution
-from .data_utils import convert_to_tensor
-from .qubo_types import DensityType
+from .data_utils import convert_to_sparse_tensor, convert_to_tensor
+from .qubo_types import DensityType, StorageType
 from .utils.density import (
     calculate_density,
     classify_density,
+    classify_storage,
 )
+from .utils.fingerprint import fingerprint_coefficients
+from .utils.qubo_eval import calculate_qubo_costs
+from .utils.sparse import is_sparse, sparse_entries, storage_of, to_storage
 
 
 class QUBOInstance:
@@ -19,6 +25,7 @@ class QUBOInstance:
     Attributes:
         coefficients (torch.Tensor):
             Tensor of shape (size, size), representing the QUBO coefficients.
+            Depending on `storage`, it is a dense, sparse COO or sparse CSR tensor.
         device (str):
             Device where tensors are allocated (e.g., "cpu" or "cuda").
         dtype (torch.dtype):
@@ -31,6 +38,9 @@ class QUBOInstance:
             Fraction of non-zero entries in the coefficient matrix.
         density_type (DensityType | None):
             Classification of the density (e.g., sparse, dense).
+        storage (StorageType):
+            Requested storage layout of the coefficients. With `StorageType.AUTO`,
+            the layout is chosen from the density of the coefficients.
     """
 
     def __init__(
@@ -38,6 +48,7 @@ class QUBOInstance:
         coefficients: dict | ArrayLike | None = None,
         device: str = "cpu",
         dtype: torch.dtype = torch.float32,
+        storage: StorageType | str = StorageType.DENSE,
     ):
         """
         Initializes a QUBOInstance.
@@ -49,9 +60,13 @@ class QUBOInstance:
                 Device where tensors are allocated (default: "cpu").
             dtype (torch.dtype):
                 Data type of the tensors (default: torch.float32).
+            storage (StorageType | str):
+                Storage layout of the coefficients: "dense", "coo", "csr" or "auto"
+                (default: "dense").
         """
         self.device = device
         self.dtype = dtype
+        self.storage = StorageType(storage)
         self.size: int | None
         self._coefficients: torch.Tensor | None = None
         self.solution: QUBOSolution | None = None
@@ -83,23 +98,58 @@ class QUBOInstance:
 
         Exits the program with an error message if a check fails.
         """
-        # Convert input to tensor
-        tensor = convert_to_tensor(coeffs, device=self.device, dtype=self.dtype)
+        # Convert input to tensor, straight to a sparse one if a sparse layout is requested
+        if self.storage in (StorageType.COO, StorageType.CSR) or (
+            self.storage == StorageType.AUTO and isinstance(coeffs, dict)
+        ):
+            tensor = convert_to_sparse_tensor(
+                coeffs, device=self.device, dtype=self.dtype  # type: ignore[arg-type]
+            )
+        else:
+            tensor = convert_to_tensor(
+                coeffs, device=self.device, dtype=self.dtype  # type: ignore[arg-type]
+            )
         size = tensor.shape[0]
 
         # Off-diagonal negativity check
-        off_diag = tensor.triu(diagonal=1)
-        if (off_diag < 0).any():
+        if is_sparse(tensor):
+            rows, cols, values = sparse_entries(tensor)
+            negative_off_diag = (values[rows < cols] < 0).any()
+        else:
+            negative_off_diag = (tensor.triu(diagonal=1) < 0).any()
+        if negative_off_diag:
             raise ValueError(
                 "Error: Negative off-diagonal coefficient detected. "
                 "All off-diagonal coefficients must be >= 0."
             )
 
-        # All checks passed, assign the tensor and update metrics
-        self._coefficients = tensor
+        # All checks passed, assign the tensor in its storage layout and update metrics
+        storage = self.storage
+        if storage == StorageType.AUTO:
+            storage = classify_storage(calculate_density(tensor, size))
+        self._coefficients = to_storage(tensor, storage)
         self.size = size
         self.update_metrics()
 
+    @property
+    def is_sparse(self) -> bool:
+        """
+        Whether the coefficients are stored in a sparse (COO or CSR) layout.
+
+        Returns:
+            bool: True if the coefficients are sparse.
+        """
+        return self._coefficients is not None and is_sparse(self._coefficients)
+
+    def to_dense(self) -> torch.Tensor:
+        """
+        Returns the coefficients as a dense tensor, whatever the storage layout.
+
+        Returns:
+            torch.Tensor: Dense tensor of shape (size, size).
+        """
+        return to_storage(self.coefficients, StorageType.DENSE)
+
     def set_coefficients(
         self, new_coefficients: dict[tuple[int, int], float] | None = None
     ) -> None:
@@ -119,6 +169,11 @@ class QUBOInstance:
 
         indices = torch.tensor(list(new_coefficients.keys()), dtype=torch.long, device=self.device)
         values = torch.tensor(list(new_coefficients.values()), dtype=self.dtype, device=self.device)
+        if self.is_sparse:
+            self._set_sparse_coefficients(indices, values)
+            self.update_metrics()
+            return
+
         self._coefficients[indices[:, 0], indices[:, 1]] = values  # type: ignore[index]
         off_diagonal_mask = indices[:, 0] != indices[:, 1]
         symmetric_indices = indices[off_diagonal_mask]
@@ -128,6 +183,40 @@ class QUBOInstance:
 
         self.update_metrics()
 
+    def _set_sparse_coefficients(self, indices: torch.Tensor, values: torch.Tensor) -> None:
+        """
+        Overwrites entries of sparse coefficients (and their symmetric counterparts)
+        by rebuilding the COO entry list, without densifying.
+
+        Args:
+            indices (torch.Tensor):
+                Tensor of shape (k, 2) with the (row, column) positions to set.
+            values (torch.Tensor):
+                Tensor of shape (k,) with the new values.
+        """
+        assert self._coefficients is not None and self.size is not None
+        layout = storage_of(self._coefficients)
+        current = to_storage(self._coefficients, StorageType.COO)
+
+        new_coefficients = convert_to_sparse_tensor(
+            {(int(i), int(j)): float(v) for (i, j), v in zip(indices.tolist(), values.tolist())},
+            device=self.device,
+            dtype=self.dtype,
+        )
+        new_indices = new_coefficients.indices()
+
+        old_linear = current.indices()[0] * self.size + current.indices()[1]
+        new_linear = new_indices[0] * self.size + new_indices[1]
+        keep = ~torch.isin(old_linear, new_linear)
+
+        merged = torch.sparse_coo_tensor(
+            torch.cat((current.indices()[:, keep], new_indices), dim=1),
+            torch.cat((current.values()[keep], new_coefficients.values())),
+            (self.size, self.size),
+            device=self.device,
+        )
+        self._coefficients = to_storage(merged, layout)
+
     def _expand_size(self, new_size: int) -> None:
         """
         Expands the size of the coefficient matrix to accommodate larger indices.
@@ -136,7 +225,14 @@ class QUBOInstance:
             new_size (int):
                 New size of the coefficient matrix.
         """
-        if self._coefficients is not None:
+        if self._coefficients is not None and self.is_sparse:
+            layout = storage_of(self._coefficients)
+            current = to_storage(self._coefficients, StorageType.COO)
+            expanded = torch.sparse_coo_tensor(
+                current.indices(), current.values(), (new_size, new_size), device=self.device
+            )
+            self._coefficients = to_storage(expanded, layout)
+        elif self._coefficients is not None:
             expanded_coefficients = torch.zeros(
                 (new_size, new_size), dtype=self.dtype, device=self.device
             )
@@ -178,6 +274,67 @@ class QUBOInstance:
         solution = solution_tensor
         return float(cost)
 
+    def evaluate_solutions(self, bitstrings: ArrayLike) -> torch.Tensor:
+        """
+        Evaluates a batch of solutions for the QUBO problem at once.
+
+        Args:
+            bitstrings (ArrayLike):
+                Solutions of shape (num_solutions, size) to evaluate.
+
+        Returns:
+            torch.Tensor:
+                Tensor of shape (num_solutions,) with the cost of each solution.
+
+        Raises:
+            ValueError: If the solution size does not match the QUBO size.
+        """
+        bitstrings_tensor = convert_to_tensor(
+            bitstrings, device=self.device, dtype=self.dtype  # type: ignore[arg-type]
+        )
+        if bitstrings_tensor.ndim == 1:
+            bitstrings_tensor = bitstrings_tensor.unsqueeze(0)
+        if self._coefficients is None or bitstrings_tensor.size(1) != self.size:
+            raise ValueError("Solution size does not match the QUBO problem size.")
+        return calculate_qubo_costs(bitstrings_tensor, self._coefficients)
+
+    def fingerprint(self) -> str:
+        """
+        Computes a content hash of the coefficients.
+
+        Identical coefficients give the same fingerprint, whatever their storage
+        layout or device. Values are hashed exactly, see `fingerprint_coefficients`.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest of the coefficients.
+
+        Raises:
+            ValueError: If the coefficients are not initialized.
+        """
+        if self._coefficients is None:
+            raise ValueError("QUBO coefficients are not initialized.")
+        return fingerprint_coefficients(self._coefficients)
+
+    def __deepcopy__(self, memo: dict) -> QUBOInstance:
+        """
+        Deep-copies the instance. Coefficients are cloned explicitly, since sparse CSR
+        tensors do not support `copy.deepcopy`.
+
+        Args:
+            memo (dict): Memo dictionary used by `copy.deepcopy`.
+
+        Returns:
+            QUBOInstance: An independent copy of the instance.
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        for key, value in self.__dict__.items():
+            if key == "_coefficients" and value is not None:
+                setattr(copied, key, value.clone())
+            else:
+                setattr(copied, key, deepcopy(value, memo))
+        return copied
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the QUBOInstance.
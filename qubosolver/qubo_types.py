@@ -30,6 +30,19 @@ class DensityType(StrEnum):
     HIGH = "high"
 
 
+class StorageType(StrEnum):
+    """
+    String-based Enums for the storage layout of QUBO coefficients.
+
+    `AUTO` selects a sparse layout when the coefficient density is low enough.
+    """
+
+    AUTO = "auto"
+    DENSE = "dense"
+    COO = "coo"
+    CSR = "csr"
+
+
 class QUBOType(StrEnum):
     """
     String-based Enums for categorizing different types of
@@ -59,6 +72,21 @@ class LayoutType(Enum):
     TRIANGULAR = TriangularLatticeLayout
 
 
+class GreedyStrategyType(StrEnum):
+    """
+    Search strategy of the greedy embedding method.
+
+    `MULTI_START` runs one greedy pass from each start node, possibly in parallel.
+    `BATCHED` advances the greedy passes of all start nodes together, as tensors.
+    `BEAM` keeps the best partial placements at each step, pruned by the best
+    complete embedding.
+    """
+
+    MULTI_START = "multi_start"
+    BATCHED = "batched"
+    BEAM = "beam"
+
+
 class PulseType(Enum):
     """
     Type of pulse shaping method used for solving the QUBO
@@ -68,6 +96,20 @@ class PulseType(Enum):
     OPTIMIZED = "optimized"
 
 
+class LocalSearchType(StrEnum):
+    """
+    Move-selection strategy of the bit-flip local search used in post-processing.
+
+    `BATCHED` runs best-improvement descent on all (deduplicated) samples at once.
+    `TABU` runs a tabu search from each (deduplicated) sample.
+    """
+
+    BEST_IMPROVEMENT = "best_improvement"
+    FIRST_IMPROVEMENT = "first_improvement"
+    BATCHED = "batched"
+    TABU = "tabu"
+
+
 class SolutionStatusType(StrEnum):
     """
     Type of solution status used for pre-post processing and trivial solution.
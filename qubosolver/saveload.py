@@ -29,12 +29,14 @@ def save_qubo_instance(instance: QUBOInstance, filepath: str) -> None:
             - Coefficients (N x N matrix)
             - Device (e.g., 'cpu' or 'cuda')
             - Data type (e.g., torch.float32)
+            - Storage layout (e.g., 'dense' or 'csr')
             - Solution (optional)
     """
     data = {
         "coefficients": instance.coefficients,  # N x N
         "device": instance.device,
         "dtype": instance.dtype,
+        "storage": str(instance.storage),
         "solution": instance.solution,
     }
     torch.save(data, filepath)
@@ -60,6 +62,7 @@ def load_qubo_instance(filepath: str) -> QUBOInstance:
         coefficients=data["coefficients"],
         device=data["device"],
         dtype=data["dtype"],
+        storage=data.get("storage", "dense"),
     )
     instance.solution = data["solution"]
     return instance
@@ -1,23 +1,36 @@
 from __future__ import annotations
 
+import warnings
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import torch
 
 # Import the classical solver factory from our classical_solver module.
 from qoolqit._solvers import get_backend
 
 from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.algorithms.local_search import IncrementalLocalSearch, tabu_search
 from qubosolver.classical_solver import get_classical_solver
 from qubosolver.config import SolverConfig
 from qubosolver.pipeline import (
     BaseSolver,
+    ComponentDecomposition,
+    EmbeddingCache,
     Fixtures,
     Pulse,
     Register,
+    clamped_subproblem,
     get_embedder,
     get_pulse_shaper,
+    impact_neighbourhoods,
 )
+from qubosolver.qubo_types import StorageType
+from qubosolver.utils.sparse import is_sparse, to_storage
+
+# Largest QUBO solved by the quantum pipeline
+MAX_QUANTUM_SIZE: int = 80
 
 
 class QuboSolver(BaseSolver):
@@ -27,12 +40,19 @@ class QuboSolver(BaseSolver):
     """
 
     def __init__(self, instance: QUBOInstance, config: SolverConfig | None = None):
-        super().__init__(instance, config)
         self._solver: BaseSolver
+        # Decomposing solvers are built first, as their components or subproblems are
+        # embedded with the traps set by the user, rather than grown to the size of the
+        # whole instance by `BaseSolver`
+        if config is not None and config.decompose_components:
+            self._solver = QuboSolverDecomposed(instance, config)
+        elif config is not None and config.hybrid_decomposition:
+            self._solver = QuboSolverHybrid(instance, config)
+        super().__init__(instance, config)
 
         if config is None:
             self._solver = QuboSolverClassical(instance, self.config)
-        else:
+        elif not config.decompose_components and not config.hybrid_decomposition:
             if config.use_quantum:
                 self._solver = QuboSolverQuantum(instance, config)
             else:
@@ -56,13 +76,21 @@ class QuboSolverQuantum(BaseSolver):
     embedding, pulse shaping, and quantum execution pipelines.
     """
 
-    def __init__(self, instance: QUBOInstance, config: SolverConfig | None = None):
+    def __init__(
+        self,
+        instance: QUBOInstance,
+        config: SolverConfig | None = None,
+        register: Register | None = None,
+    ):
         """
         Initialize the QuboSolver with the given problem and configuration.
 
         Args:
             instance (QUBOInstance): The QUBO problem to solve.
             config (SolverConfig): Solver settings including backend and device.
+            register (Register | None, optional): Embedding to use instead of computing
+                one, e.g. cached from an instance with the same interaction graph.
+                Defaults to None.
         """
         super().__init__(instance, config or SolverConfig(use_quantum=True))
         self._check_size_limit()
@@ -72,14 +100,18 @@ class QuboSolverQuantum(BaseSolver):
         self.embedder = get_embedder(self.instance, self.config, self.backend)
         self.pulse_shaper = get_pulse_shaper(self.instance, self.config, self.backend)
 
+        self._given_register = register
         self._register: Register | None = None
         self._pulse: Pulse | None = None
 
     def _check_size_limit(self) -> None:
-        if (self.instance._coefficients is not None) and self.instance.size > 80:  # type: ignore[operator]
+        if (
+            self.instance._coefficients is not None
+            and self.instance.size > MAX_QUANTUM_SIZE  # type: ignore[operator]
+        ):
             raise ValueError(
                 f"QUBO size {self.instance.size}×{self.instance.size}"
-                + " exceeds the maximum supported size of 80×80."
+                + f" exceeds the maximum supported size of {MAX_QUANTUM_SIZE}×{MAX_QUANTUM_SIZE}."
             )
 
     def embedding(self) -> Register:
@@ -89,6 +121,9 @@ class QuboSolverQuantum(BaseSolver):
         Returns:
             Register: Atom layout suitable for quantum hardware.
         """
+        if self._given_register is not None:
+            self._register = self._given_register
+            return self._register
         self.embedder.instance = self.instance
         self._register = self.embedder.embed()
         return self._register
@@ -219,14 +254,22 @@ class QuboSolverClassical(BaseSolver):
 
         # 2) else delegate to quantum or classical solver
         # Delegate the solving to the classical solver module.
-        # Convert the SolverConfig instance to a dictionary.
-        config_dict = self.config.__dict__
+        # Convert the SolverConfig instance to a dictionary, with the options of
+        # the classical part at the top level.
+        config_dict = {**self.config.__dict__, **self.config.classical.__dict__}
 
         if self.config.do_preprocessing:
             # Apply preprocessing and change the solved QUBO by the reduced one
             self.fixtures.preprocess()
             self.instance = self.fixtures.reduced_qubo
             self.n_fixed_variables_preprocessing = self.fixtures.n_fixed_variables
+            if config_dict.get("cplex_warm_start") is not None:
+                # Warm starts are given on the original variables: keep the unfixed ones
+                warm_start = torch.as_tensor(config_dict["cplex_warm_start"], dtype=torch.float32)
+                size = self.fixtures.instance.size or 0
+                config_dict["cplex_warm_start"] = warm_start.reshape(-1, size)[
+                    :, self.fixtures.kept_indices
+                ]
 
         classical_solver = get_classical_solver(self.instance, config_dict)
         solution = (
@@ -243,3 +286,261 @@ class QuboSolverClassical(BaseSolver):
             solution = self.fixtures.postprocess(solution)
 
         return solution
+
+
+class QuboSolverDecomposed(BaseSolver):
+    """
+    Solver splitting a QUBO into the connected components of its coupling graph.
+
+    After pre-processing, the reduced QUBO often splits into independent blocks. Each
+    component is solved on its own, in a thread pool of `decomposition_workers`
+    threads, with the quantum or classical solver of the configuration, and the
+    solutions are combined into one `QUBOSolution`. The quantum pipeline can thus
+    solve instances larger than `MAX_QUANTUM_SIZE` variables when each component fits.
+    """
+
+    def __init__(self, instance: QUBOInstance, config: SolverConfig):
+        # The components are solved without decomposition, pre- and post-processing,
+        # which apply to the whole instance. Each gets its own copy of the embedding
+        # configuration, whose traps `BaseSolver` grows to the size of its instance.
+        self.component_config = config.model_copy(
+            update={
+                "embedding": config.embedding.model_copy(),
+                "decompose_components": False,
+                "do_preprocessing": False,
+                "do_postprocessing": False,
+            }
+        )
+        super().__init__(instance, config)
+        self.fixtures = Fixtures(self.instance, self.config)
+
+    def embedding(self) -> Register:
+        # Each component is embedded separately, by its own solver.
+        return  # type: ignore[return-value]
+
+    def pulse(self, embedding: Register) -> tuple:
+        return  # type: ignore[return-value]
+
+    def _solve_component(self, component: QUBOInstance) -> QUBOSolution:
+        """Solves one component with a copy of the component configuration."""
+        config = self.component_config.model_copy(
+            update={"embedding": self.component_config.embedding.model_copy()}
+        )
+        return QuboSolver(component, config).solve()
+
+    def solve(self) -> QUBOSolution:
+        """
+        Pre-process, solve each component, combine the solutions and post-process.
+
+        Returns:
+            QUBOSolution: Final result on the whole instance.
+
+        Raises:
+            ValueError: If the quantum pipeline is used and a component has more than
+                `MAX_QUANTUM_SIZE` variables.
+        """
+        trivial = self._trivial_solution()
+        if trivial is not None and (
+            not self.config.use_quantum or self.config.activate_trivial_solutions
+        ):
+            return trivial
+
+        if self.config.do_preprocessing:
+            # Apply preprocessing and decompose the reduced QUBO
+            self.fixtures.preprocess()
+            self.instance = self.fixtures.reduced_qubo
+            self.n_fixed_variables_preprocessing = self.fixtures.n_fixed_variables
+
+        decomposition = ComponentDecomposition(self.instance)
+        if self.config.use_quantum:
+            largest = max([len(component) for component in decomposition.components], default=0)
+            if largest > MAX_QUANTUM_SIZE:
+                raise ValueError(
+                    f"QUBO component size {largest}×{largest} exceeds the maximum supported"
+                    + f" size of {MAX_QUANTUM_SIZE}×{MAX_QUANTUM_SIZE}."
+                )
+
+        components = decomposition.subinstances()
+        workers = self.config.decomposition_workers
+        if len(components) <= 1 or workers == 1:
+            solutions = [self._solve_component(component) for component in components]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                solutions = list(executor.map(self._solve_component, components))
+        solution = decomposition.combine(solutions)
+
+        if self.config.do_preprocessing:
+            # Post-process fixations of the preprocessing and restore the original QUBO
+            solution = self.fixtures.post_process_fixation(solution)
+            self.instance = self.fixtures.instance
+
+        if self.config.do_postprocessing:
+            solution = self.fixtures.postprocess(solution)
+
+        return solution
+
+
+class QuboSolverHybrid(BaseSolver):
+    """
+    Large-neighbourhood decomposition solver, in the spirit of qbsolv.
+
+    Starting from a tabu search incumbent, each pass splits the variables into
+    neighbourhoods of at most `HybridConfig.subproblem_size` strongly coupled
+    variables with the largest energy impact (see `impact_neighbourhoods`), the other
+    variables being clamped to the incumbent. Each subproblem is solved with the
+    quantum pipeline (embedding, pulse, execution), or with the classical solver of
+    the configuration when the quantum approach is not used or fails, and its
+    solution is accepted when it lowers the energy. A local search then polishes the
+    incumbent. After a pass without improvement, the neighbourhoods of the next one
+    are grown from random variables. The passes stop after `max_passes` passes or
+    `stagnation_passes` passes without improvement.
+
+    Embeddings are cached by the sparsity pattern of the subproblems, so that
+    subproblems with the same interaction graph are embedded once.
+    """
+
+    def __init__(self, instance: QUBOInstance, config: SolverConfig):
+        # The subproblems are solved without decomposition, pre- and post-processing,
+        # which apply to the whole instance. Each gets its own copy of the embedding
+        # configuration, whose traps `BaseSolver` grows to the size of its instance.
+        self.subproblem_config = config.model_copy(
+            update={
+                "embedding": config.embedding.model_copy(),
+                "decompose_components": False,
+                "hybrid_decomposition": False,
+                "do_preprocessing": False,
+                "do_postprocessing": False,
+            }
+        )
+        super().__init__(instance, config)
+        self.fixtures = Fixtures(self.instance, self.config)
+        self.embedding_cache: EmbeddingCache | None = (
+            EmbeddingCache() if config.hybrid.embedding_cache else None
+        )
+        # Energy of the incumbent after each pass, starting with the initial one
+        self.energies: list[float] = []
+
+    def embedding(self) -> Register:
+        # Each subproblem is embedded separately, see `embedding_cache`.
+        return  # type: ignore[return-value]
+
+    def pulse(self, embedding: Register) -> tuple:
+        return  # type: ignore[return-value]
+
+    def _solve_subproblem(self, subproblem: QUBOInstance) -> QUBOSolution:
+        """Solves a subproblem, with the quantum pipeline if configured."""
+        config = self.subproblem_config.model_copy(
+            update={"embedding": self.subproblem_config.embedding.model_copy()}
+        )
+        if config.use_quantum:
+            try:
+                key, register = None, None
+                if self.embedding_cache is not None:
+                    key = self.embedding_cache.key(subproblem.coefficients)
+                    register = self.embedding_cache.get(key)
+                quantum_solver = QuboSolverQuantum(subproblem, config, register=register)
+                solution = quantum_solver.solve()
+                cache = self.embedding_cache
+                if cache is not None and key is not None and register is None:
+                    if quantum_solver._register is not None:
+                        cache.put(key, quantum_solver._register)
+                return solution
+            except Exception as error:  # the classical solver takes over this subproblem
+                warnings.warn(f"Quantum subproblem solving failed, solving it classically: {error}")
+                config = config.model_copy(update={"use_quantum": False})
+        return QuboSolverClassical(subproblem, config).solve()
+
+    def _initial_state(self, coefficients: torch.Tensor) -> np.ndarray:
+        """Returns the initial incumbent, found by a tabu search."""
+        parameters = self.config.classical.sampler.native_tabu_parameters()
+        parameters.pop("num_restarts", None)
+        if self.config.hybrid.seed is not None:
+            parameters["seed"] = self.config.hybrid.seed
+        states, _ = tabu_search(coefficients, num_restarts=1, **parameters)
+        return states[0].numpy().astype(np.float64)
+
+    def solve(self) -> QUBOSolution:
+        """
+        Pre-process, improve an incumbent on subproblems, and post-process.
+
+        Returns:
+            QUBOSolution: The final incumbent on the whole instance.
+        """
+        trivial = self._trivial_solution()
+        if trivial is not None and (
+            not self.config.use_quantum or self.config.activate_trivial_solutions
+        ):
+            return trivial
+
+        if self.config.do_preprocessing:
+            # Apply preprocessing and decompose the reduced QUBO
+            self.fixtures.preprocess()
+            self.instance = self.fixtures.reduced_qubo
+            self.n_fixed_variables_preprocessing = self.fixtures.n_fixed_variables
+
+        coefficients = self.instance.coefficients
+        size = coefficients.shape[0]
+        if size == 0:
+            bitstrings = torch.empty((0, 0), dtype=torch.float32)
+            solution = QUBOSolution(bitstrings=bitstrings, costs=torch.empty(0))
+        else:
+            solution = self._improve(coefficients)
+
+        if self.config.do_preprocessing:
+            # Post-process fixations of the preprocessing and restore the original QUBO
+            solution = self.fixtures.post_process_fixation(solution)
+            self.instance = self.fixtures.instance
+
+        if self.config.do_postprocessing:
+            solution = self.fixtures.postprocess(solution)
+
+        return solution
+
+    def _improve(self, coefficients: torch.Tensor) -> QUBOSolution:
+        """Runs the passes of subproblem improvements from the initial incumbent."""
+        hybrid = self.config.hybrid
+        subproblem_size = hybrid.subproblem_size
+        if self.config.use_quantum:
+            subproblem_size = min(subproblem_size, MAX_QUANTUM_SIZE)
+        engine = IncrementalLocalSearch(coefficients)
+        # Subproblems gather rows of the coefficients, which is cheapest in COO
+        rows = coefficients
+        if is_sparse(coefficients):
+            rows = to_storage(coefficients, StorageType.COO)
+
+        generator = np.random.default_rng(hybrid.seed)
+        x = self._initial_state(coefficients)
+        energy = engine.energy(x)
+        self.energies = [energy]
+        stagnant = 0
+        for _ in range(hybrid.max_passes):
+            neighbourhoods = impact_neighbourhoods(
+                rows,
+                torch.from_numpy(engine.gains(x)),
+                subproblem_size,
+                generator=generator if stagnant > 0 else None,
+            )
+            for indices in neighbourhoods:
+                subproblem = QUBOInstance(
+                    coefficients=clamped_subproblem(rows, torch.from_numpy(x), indices)
+                )
+                solution = self._solve_subproblem(subproblem)
+                if solution.bitstrings.shape[0] == 0:
+                    continue
+                current = torch.from_numpy(x[indices.numpy()]).to(torch.float32)
+                candidates = torch.cat([current[None], solution.bitstrings.float().cpu()])
+                best = int(torch.argmin(subproblem.evaluate_solutions(candidates)))
+                if best > 0:
+                    x[indices.numpy()] = candidates[best].numpy()
+
+            x, new_energy = engine.search(x)
+            self.energies.append(new_energy)
+            stagnant = stagnant + 1 if new_energy >= energy - engine.tol else 0
+            energy = min(energy, new_energy)
+            if stagnant >= hybrid.stagnation_passes:
+                break
+
+        return QUBOSolution(
+            bitstrings=torch.from_numpy(x[None]).to(torch.float32),
+            costs=torch.tensor([engine.energy(x)], dtype=torch.float32),
+        )
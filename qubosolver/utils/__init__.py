@@ -3,12 +3,41 @@ from __future__ import annotations
 from .density import (
     calculate_density,
     classify_density,
+    classify_storage,
+)
+from .embedding_quality import (
+    EmbeddingQualityReport,
+    embedded_interactions,
+    embedding_mismatch,
+    embedding_quality_report,
+)
+from .fingerprint import fingerprint_coefficients
+from .qubo_eval import calculate_qubo_cost, calculate_qubo_costs
+from .sparse import (
+    gather_rows,
+    is_sparse,
+    sparse_diagonal,
+    sparse_entries,
+    storage_of,
+    to_storage,
 )
-from .qubo_eval import calculate_qubo_cost
 
 # Modules to be automatically added to the qubosolver.utils namespace
 __all__ = [
     "classify_density",
     "calculate_density",
+    "classify_storage",
     "calculate_qubo_cost",
+    "calculate_qubo_costs",
+    "EmbeddingQualityReport",
+    "embedded_interactions",
+    "embedding_mismatch",
+    "embedding_quality_report",
+    "fingerprint_coefficients",
+    "gather_rows",
+    "is_sparse",
+    "sparse_diagonal",
+    "sparse_entries",
+    "storage_of",
+    "to_storage",
 ]
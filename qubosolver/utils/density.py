@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import torch
 
-from qubosolver.qubo_types import DensityType
+from qubosolver.qubo_types import DensityType, StorageType
+from qubosolver.utils.sparse import is_sparse
 
 # Density thresholds
 SPARSE_THRESHOLD: tuple[float, float] = (0.0, 0.3)
 MEDIUM_THRESHOLD: tuple[float, float] = (0.3, 0.7)
 HIGH_THRESHOLD: tuple[float, float] = (0.7, 1.0)
 
+# Below this density, `StorageType.AUTO` stores coefficients in a sparse layout
+SPARSE_STORAGE_THRESHOLD: float = 0.05
+
 
 def classify_density(density: float) -> DensityType:
     """
@@ -32,11 +36,30 @@ def classify_density(density: float) -> DensityType:
         raise ValueError(f"Density {density} is outside the defined thresholds.")
 
 
+def classify_storage(density: float) -> StorageType:
+    """
+    Selects the storage layout of a QUBO coefficient matrix from its density.
+
+    Args:
+        density (float):
+            The density value of the coefficient matrix.
+
+    Returns:
+        StorageType:
+            `StorageType.CSR` if the density is below `SPARSE_STORAGE_THRESHOLD`,
+            `StorageType.DENSE` otherwise.
+    """
+    if density < SPARSE_STORAGE_THRESHOLD:
+        return StorageType.CSR
+    return StorageType.DENSE
+
+
 def calculate_density(coefficients: torch.Tensor | None, size: int | None) -> float:
     """
     Calculates the density of a QUBO coefficient matrix.
 
     Density is defined as the fraction of non-zero elements in the matrix.
+    Sparse (COO or CSR) tensors are handled without being densified.
 
     Args:
         coefficients (torch.Tensor | None):
@@ -52,5 +75,10 @@ def calculate_density(coefficients: torch.Tensor | None, size: int | None) -> fl
         return 0.0
 
     total_elements = size**2 if size else 0
-    non_zero_elements = torch.count_nonzero(coefficients).item()
+    if is_sparse(coefficients):
+        if coefficients.layout == torch.sparse_coo:
+            coefficients = coefficients.coalesce()
+        non_zero_elements = torch.count_nonzero(coefficients.values()).item()
+    else:
+        non_zero_elements = torch.count_nonzero(coefficients).item()
     return float(non_zero_elements / total_elements)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import torch
+
+
+def _as_tensor(values: Any) -> torch.Tensor:
+    """Returns values as a tensor, converting arrays and nested sequences."""
+    if isinstance(values, torch.Tensor):
+        return values
+    return torch.as_tensor(np.asarray(values))
+
+
+def embedded_interactions(coords: torch.Tensor | np.ndarray, device: Any) -> torch.Tensor:
+    """
+    Computes the interaction C / ||r_i - r_j||^6 between each pair of atoms.
+
+    Args:
+        coords (torch.Tensor | np.ndarray): Atom positions of shape (..., n, d), leading
+            dimensions indexing several embeddings.
+        device (Any): The device, whose `interaction_coeff` is C.
+
+    Returns:
+        torch.Tensor: Interactions of shape (..., n, n), 0 on the diagonal.
+    """
+    coords = _as_tensor(coords)
+    distances = torch.cdist(coords, coords, compute_mode="donot_use_mm_for_euclid_dist")
+    distances.diagonal(dim1=-2, dim2=-1).fill_(float("inf"))
+    interactions: torch.Tensor = device.interaction_coeff / distances**6
+    return interactions
+
+
+def embedding_mismatch(
+    Q: torch.Tensor | np.ndarray, coords: torch.Tensor | np.ndarray, device: Any
+) -> torch.Tensor:
+    """
+    Computes the mismatch sum_{i<j} |Q_ij - C / ||r_i - r_j||^6| between the QUBO
+    couplings and the interactions of an embedding.
+
+    Args:
+        Q (torch.Tensor | np.ndarray): QUBO matrix of shape (n, n).
+        coords (torch.Tensor | np.ndarray): Atom positions of shape (..., n, d), leading
+            dimensions indexing several embeddings.
+        device (Any): The device, whose `interaction_coeff` is C.
+
+    Returns:
+        torch.Tensor: The mismatch of each embedding, of shape (...).
+    """
+    Q = _as_tensor(Q)
+    rows, cols = torch.triu_indices(Q.shape[0], Q.shape[0], offset=1)
+    interactions = embedded_interactions(coords, device)[..., rows, cols]
+    return torch.abs(Q[rows, cols] - interactions).sum(-1)
+
+
+@dataclass
+class EmbeddingQualityReport:
+    """
+    How closely the interactions of an embedding reproduce the QUBO couplings.
+
+    Attributes:
+        total_mismatch: Sum over the pairs of |Q_ij - U_ij|, U being the interactions.
+        mean_mismatch: Mean of |Q_ij - U_ij| over the pairs.
+        max_mismatch: Largest |Q_ij - U_ij|.
+        worst_pair: The pair (i, j) with the largest mismatch.
+        relative_mismatch: ||Q - U|| / ||Q|| over the pairs (Frobenius norms).
+        min_distance: Smallest distance between two atoms.
+        max_distance: Largest distance between two atoms.
+    """
+
+    total_mismatch: float
+    mean_mismatch: float
+    max_mismatch: float
+    worst_pair: tuple[int, int]
+    relative_mismatch: float
+    min_distance: float
+    max_distance: float
+
+
+def embedding_quality_report(
+    Q: torch.Tensor | np.ndarray, coords: torch.Tensor | np.ndarray, device: Any
+) -> EmbeddingQualityReport:
+    """
+    Reports the mismatch and the atom distances of an embedding.
+
+    Args:
+        Q (torch.Tensor | np.ndarray): QUBO matrix of shape (n, n), with n >= 2.
+        coords (torch.Tensor | np.ndarray): Atom positions of shape (n, d).
+        device (Any): The device, whose `interaction_coeff` is C.
+
+    Returns:
+        EmbeddingQualityReport: The quality of the embedding.
+    """
+    Q = _as_tensor(Q).to(torch.float64)
+    coords = _as_tensor(coords).to(torch.float64)
+    rows, cols = torch.triu_indices(Q.shape[0], Q.shape[0], offset=1)
+    couplings = Q[rows, cols]
+    interactions = embedded_interactions(coords, device)[rows, cols]
+    mismatches = torch.abs(couplings - interactions)
+    distances = torch.cdist(coords, coords)[rows, cols]
+    worst = int(torch.argmax(mismatches))
+    return EmbeddingQualityReport(
+        total_mismatch=float(mismatches.sum()),
+        mean_mismatch=float(mismatches.mean()),
+        max_mismatch=float(mismatches[worst]),
+        worst_pair=(int(rows[worst]), int(cols[worst])),
+        relative_mismatch=float(
+            torch.linalg.norm(couplings - interactions) / torch.linalg.norm(couplings)
+        ),
+        min_distance=float(distances.min()),
+        max_distance=float(distances.max()),
+    )
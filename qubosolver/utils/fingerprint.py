@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+import torch
+
+from qubosolver.utils.sparse import is_sparse, sparse_entries
+
+# Number of rows hashed at once, which bounds the memory used for dense matrices
+FINGERPRINT_BLOCK_ROWS: int = 1024
+
+
+def fingerprint_coefficients(coefficients: torch.Tensor) -> str:
+    """
+    Computes a content hash of a QUBO coefficient tensor.
+
+    The hash only depends on the size and on the non-zero entries of the matrix, so the
+    same coefficients give the same fingerprint whatever their storage layout
+    (dense, COO or CSR) or device. Values are hashed exactly after a cast to float64:
+    copies of a matrix in two dtypes only share a fingerprint when its values are
+    exactly representable in both.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor of shape (size, size).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the coefficients.
+    """
+    size = coefficients.shape[0]
+    digest = hashlib.sha256(f"qubo:{size}".encode())
+
+    if is_sparse(coefficients):
+        rows, cols, values = (entry.numpy() for entry in sparse_entries(coefficients.cpu()))
+        block_starts = np.arange(0, size + FINGERPRINT_BLOCK_ROWS, FINGERPRINT_BLOCK_ROWS)
+        bounds = np.searchsorted(rows, block_starts)
+
+    # The non-zero entries are hashed by blocks of rows, as their row-major position
+    # within the block followed by their values
+    for block, start in enumerate(range(0, size, FINGERPRINT_BLOCK_ROWS)):
+        if is_sparse(coefficients):
+            first, last = bounds[block], bounds[block + 1]
+            positions = (rows[first:last] - start) * size + cols[first:last]
+            block_values = values[first:last]
+        else:
+            dense_block = coefficients[start : start + FINGERPRINT_BLOCK_ROWS].cpu().numpy()
+            positions = np.flatnonzero(dense_block)
+            block_values = dense_block.ravel()[positions]
+        digest.update(positions.astype(np.int64).tobytes())
+        digest.update(block_values.astype(np.float64).tobytes())
+
+    return digest.hexdigest()
@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import torch
 
+from qubosolver.utils.sparse import is_sparse
+
+# Number of bitstrings evaluated at once by `calculate_qubo_costs`
+DEFAULT_COST_CHUNK_SIZE: int = 4096
+
 
 def calculate_qubo_cost(bitstring: str, QUBO: torch.Tensor) -> float:
     """Apply the default qubo evaluation b Q b^T.
@@ -19,3 +24,41 @@ def calculate_qubo_cost(bitstring: str, QUBO: torch.Tensor) -> float:
     qz = torch.matmul(QUBO, z)
     res = torch.dot(z, qz).item()
     return float(res)
+
+
+def calculate_qubo_costs(
+    bitstrings: torch.Tensor,
+    QUBO: torch.Tensor,
+    chunk_size: int = DEFAULT_COST_CHUNK_SIZE,
+) -> torch.Tensor:
+    """Apply the qubo evaluation to a whole batch of bitstrings, `(B @ Q * B).sum(1)`.
+
+    Bitstrings are processed by chunks of `chunk_size` rows, so that the
+    intermediate `(chunk_size, n)` product bounds the memory usage.
+    Sparse (COO or CSR) coefficients are supported.
+
+    Args:
+        bitstrings (torch.Tensor): Tensor of shape (num_bitstrings, n) of 0/1 values.
+        QUBO (torch.Tensor): QUBO coefficients of shape (n, n).
+        chunk_size (int, optional): Number of bitstrings per chunk.
+            Defaults to DEFAULT_COST_CHUNK_SIZE.
+
+    Returns:
+        torch.Tensor: Tensor of shape (num_bitstrings,) with the cost of each bitstring.
+            Empty if no bitstring is given.
+    """
+    if bitstrings.numel() == 0 and QUBO.shape[0] > 0:
+        # No bitstring at all, whatever the shape of the empty input
+        return torch.empty(0, dtype=QUBO.dtype, device=QUBO.device)
+    if bitstrings.ndim == 1:
+        bitstrings = bitstrings.unsqueeze(0)
+    bitstrings = bitstrings.to(dtype=QUBO.dtype, device=QUBO.device)
+    sparse = is_sparse(QUBO)
+
+    costs = torch.empty(bitstrings.shape[0], dtype=QUBO.dtype, device=QUBO.device)
+    for start in range(0, bitstrings.shape[0], chunk_size):
+        chunk = bitstrings[start : start + chunk_size]
+        # Q is symmetric, so (Q @ B^T)^T == B @ Q also for sparse layouts
+        products = torch.matmul(QUBO, chunk.T).T if sparse else torch.matmul(chunk, QUBO)
+        costs[start : start + chunk_size] = (products * chunk).sum(dim=1)
+    return costs
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import torch
+
+from qubosolver.qubo_types import StorageType
+
+
+def is_sparse(coefficients: torch.Tensor) -> bool:
+    """
+    Checks whether a coefficient tensor uses a sparse (COO or CSR) layout.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor.
+
+    Returns:
+        bool: True if the tensor is not stored as a strided (dense) tensor.
+    """
+    return coefficients.layout != torch.strided
+
+
+def storage_of(coefficients: torch.Tensor) -> StorageType:
+    """
+    Returns the storage layout of a coefficient tensor.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor.
+
+    Returns:
+        StorageType: `StorageType.DENSE`, `StorageType.COO` or `StorageType.CSR`.
+    """
+    if coefficients.layout == torch.sparse_coo:
+        return StorageType.COO
+    if coefficients.layout == torch.sparse_csr:
+        return StorageType.CSR
+    return StorageType.DENSE
+
+
+def to_storage(coefficients: torch.Tensor, storage: StorageType) -> torch.Tensor:
+    """
+    Converts a coefficient tensor to the requested storage layout.
+
+    COO tensors are always returned coalesced so that their entries are unique.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor, dense or sparse.
+        storage (StorageType): Target storage. `StorageType.AUTO` is not accepted here.
+
+    Returns:
+        torch.Tensor: The tensor in the target layout.
+    """
+    if storage == StorageType.DENSE:
+        return coefficients.to_dense() if is_sparse(coefficients) else coefficients
+    if storage == StorageType.COO:
+        return coefficients.to_sparse_coo().coalesce()  # type: ignore[no-any-return]
+    if storage == StorageType.CSR:
+        if coefficients.layout == torch.sparse_coo:
+            coefficients = coefficients.coalesce()
+        return coefficients.to_sparse_csr()
+    raise ValueError(f"Cannot convert coefficients to storage '{storage}'.")
+
+
+def sparse_entries(
+    coefficients: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Returns the non-zero entries of a coefficient tensor as index/value arrays.
+
+    Works on dense, COO and CSR tensors without ever densifying sparse ones.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor.
+
+    Returns:
+        tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+            Row indices, column indices and values of the non-zero entries.
+    """
+    if coefficients.layout == torch.strided:
+        rows, cols = torch.nonzero(coefficients, as_tuple=True)
+        return rows, cols, coefficients[rows, cols]
+
+    coo = coefficients.to_sparse_coo().coalesce()
+    rows, cols = coo.indices()
+    values = coo.values()
+    non_zero = values != 0
+    return rows[non_zero], cols[non_zero], values[non_zero]
+
+
+def sparse_diagonal(coefficients: torch.Tensor) -> torch.Tensor:
+    """
+    Extracts the diagonal of a (possibly sparse) square coefficient tensor.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor of shape (size, size).
+
+    Returns:
+        torch.Tensor: Dense tensor of shape (size,) holding the diagonal.
+    """
+    if coefficients.layout == torch.strided:
+        return torch.diagonal(coefficients)
+
+    rows, cols, values = sparse_entries(coefficients)
+    on_diagonal = rows == cols
+    diagonal = torch.zeros(
+        coefficients.shape[0], dtype=coefficients.dtype, device=coefficients.device
+    )
+    diagonal[rows[on_diagonal]] = values[on_diagonal]
+    return diagonal
+
+
+def gather_rows(coefficients: torch.Tensor, rows: torch.Tensor) -> torch.Tensor:
+    """
+    Gathers rows of a (possibly sparse) coefficient tensor into a dense tensor.
+
+    For repeated calls on sparse coefficients, pass a COO tensor to avoid a
+    layout conversion at each call.
+
+    Args:
+        coefficients (torch.Tensor): The coefficient tensor of shape (size, size).
+        rows (torch.Tensor): Indices of the rows to gather, of shape (k,).
+
+    Returns:
+        torch.Tensor: Dense tensor of shape (k, size).
+    """
+    if coefficients.layout == torch.strided:
+        return coefficients[rows]
+    if coefficients.layout != torch.sparse_coo:
+        coefficients = coefficients.to_sparse_coo()
+    return torch.index_select(coefficients, 0, rows).to_dense()
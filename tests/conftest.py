@@ -2,6 +2,8 @@
 # functions common to every test
 from __future__ import annotations
 
+from typing import Callable
+
 import pytest
 import torch
 from qoolqit._solvers.data import BackendConfig
@@ -125,3 +127,19 @@ def qubo_instance_for_embedding() -> QUBOInstance:
             dtype=torch.int32,
         )
     )
+
+
+@pytest.fixture
+def random_qubo() -> Callable[[int, float, torch.Generator], torch.Tensor]:
+    """
+    Random QUBO matrices with non-negative couplings of a given density.
+    """
+
+    def build(size: int, density: float, generator: torch.Generator) -> torch.Tensor:
+        Q = torch.rand((size, size), generator=generator)
+        Q = Q * (torch.rand((size, size), generator=generator) < density)
+        Q = Q + Q.T
+        Q.diagonal().copy_(-2.0 * torch.rand(size, generator=generator))
+        return Q
+
+    return build
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from typing import Callable
+
 import pytest
 import torch
 
 from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.classical_solver import CplexSession, get_classical_solver
 from qubosolver.config import ClassicalConfig, SolverConfig
 from qubosolver.solver import QuboSolver
 
+RandomQubo = Callable[[int, float, torch.Generator], torch.Tensor]
+
 
 def test_qubo_solver_classical_cplex() -> None:
     # Create a simple 2x2 QUBO instance.
@@ -47,5 +52,103 @@ def test_qubo_solver_classical_cplex() -> None:
     assert pytest.approx(actual_cost, rel=1e-3) == expected_cost
 
 
+def test_cplex_options_and_bound(random_qubo: RandomQubo) -> None:
+    instance = QUBOInstance(random_qubo(20, 0.3, torch.Generator().manual_seed(0)))
+    incumbents: list[dict] = []
+    classical_config = ClassicalConfig(
+        cplex_log_path=None,
+        cplex_warm_start=[[0] * 20],
+        cplex_mip_gap=0.0,
+        cplex_threads=1,
+        cplex_pool_size=3,
+        cplex_incumbent_callback=incumbents.append,
+    )
+    config = {**classical_config.__dict__}
+    solver = get_classical_solver(instance, config)
+    solution = solver.solve()
+
+    assert solver.optimal
+    assert 1 <= solution.bitstrings.shape[0] <= 3
+    assert torch.all(solution.costs[:-1] <= solution.costs[1:])
+    assert torch.allclose(
+        solution.costs, instance.evaluate_solutions(solution.bitstrings), atol=1e-4
+    )
+    assert solution.best_bound == pytest.approx(float(solution.costs[0]), abs=1e-4)
+    assert solution.gap == pytest.approx(0.0, abs=1e-6)
+
+    # The incumbents are streamed in improving order, from the warm start
+    costs = [incumbent["cost"] for incumbent in incumbents]
+    assert costs[0] == pytest.approx(0.0)
+    assert costs == sorted(costs, reverse=True)
+    assert costs[-1] == pytest.approx(float(solution.costs[0]), abs=1e-4)
+
+
+def test_cplex_stop_callback(random_qubo: RandomQubo) -> None:
+    instance = QUBOInstance(random_qubo(20, 0.3, torch.Generator().manual_seed(0)))
+    polled: list[float] = []
+
+    def stop(cost: float) -> bool:
+        polled.append(cost)
+        return cost <= 0.0
+
+    # The warm start already reaches the target, so the solve is aborted with it
+    classical_config = ClassicalConfig(
+        cplex_log_path=None, cplex_warm_start=[[0] * 20], cplex_threads=1, stop_callback=stop
+    )
+    solver = get_classical_solver(instance, {**classical_config.__dict__})
+    solution = solver.solve()
+
+    assert polled and polled[-1] <= 0.0
+    assert not solver.optimal
+    assert float(solution.costs[0]) <= 0.0
+
+
+def test_cplex_bound_with_preprocessing(random_qubo: RandomQubo) -> None:
+    instance = QUBOInstance(random_qubo(20, 0.3, torch.Generator().manual_seed(0)))
+    # Make variable 0 fixed to 1 by preprocessing, which fixes some of its neighbours
+    coefficients = instance.coefficients.clone()
+    coefficients[0, 0] = -100.0
+    instance = QUBOInstance(coefficients=coefficients)
+    classical_config = ClassicalConfig(cplex_log_path=None, cplex_warm_start=[[1] * 20])
+    config = SolverConfig(use_quantum=False, classical=classical_config, do_preprocessing=True)
+    solution = QuboSolver(instance, config).solve()
+
+    assert solution.best_bound == pytest.approx(float(solution.costs[0]), abs=1e-4)
+    assert solution.costs[0] == pytest.approx(
+        float(instance.evaluate_solutions(solution.bitstrings)[0]), abs=1e-4
+    )
+
+
+def test_cplex_session_updates_changed_coefficients(random_qubo: RandomQubo) -> None:
+    instance = QUBOInstance(random_qubo(20, 0.3, torch.Generator().manual_seed(0)))
+    config = {"cplex_log_path": None}
+    with CplexSession(config) as session:
+        session.solve(instance)
+        assert session.num_updated == int(torch.count_nonzero(instance.coefficients.triu()))
+
+        # Change one diagonal and one off-diagonal pair, and remove another pair
+        coefficients = instance.coefficients.clone()
+        coefficients[3, 3] = -5.0
+        coefficients[1, 2] = coefficients[2, 1] = 0.75
+        i, j = map(int, torch.nonzero(coefficients.triu(1))[-1])
+        coefficients[i, j] = coefficients[j, i] = 0.0
+        changed = QUBOInstance(coefficients=coefficients)
+        problem = session.problem
+        solution = session.solve(changed)
+
+        assert session.problem is problem
+        assert session.num_updated == 2 + int(instance.coefficients[1, 2] != 0.75)
+        assert session.optimal
+        expected = get_classical_solver(changed, config).solve()
+        assert solution.costs[0] == pytest.approx(float(expected.costs[0]), abs=1e-4)
+
+        # A different size rebuilds the model
+        solution = session.solve(
+            QUBOInstance(random_qubo(10, 0.3, torch.Generator().manual_seed(0)))
+        )
+        assert session.problem is not problem
+        assert solution.bitstrings.shape == (1, 10)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -13,6 +13,7 @@ from qubosolver.config import (
 )
 from qubosolver.pipeline.embedder import GreedyEmbedder, get_embedder
 from qubosolver.solver import QuboSolver
+from qubosolver.utils import embedding_mismatch, embedding_quality_report
 
 
 def test_custom_embedder(simple_qubo_instance: QUBOInstance) -> None:
@@ -40,8 +41,9 @@ def test_greedy_embedder(qubo_instance_for_embedding: QUBOInstance) -> None:
     solver = QuboSolver(qubo_instance_for_embedding, config)
     positions = solver.embedding()
 
+    # All start nodes give embeddings of equal mismatch: the first one is kept
     expected_greedy_positions = torch.tensor(
-        [[2.0000, 3.4641], [0.0000, 0.0000], [-2.0000, 3.4641], [4.0000, 0.0000]],
+        [[0.0000, 0.0000], [4.0000, 0.0000], [-2.0000, 3.4641], [2.0000, 3.4641]],
         dtype=torch.float16,
     ).tolist()
 
@@ -95,10 +97,10 @@ def test_greedy_max_radial_distance_constraint_with_extra_traps(
         ).tolist(),
         torch.tensor(
             [
-                [12.5000, -21.6562],
                 [0.0000, 0.0000],
-                [-25.0000, 0.0000],
                 [-12.5000, -21.6562],
+                [-25.0000, 0.0000],
+                [-12.5000, 21.6562],
             ],
             dtype=torch.float16,
         ).tolist(),
@@ -124,3 +126,33 @@ def test_greedy_max_radial_distance_constraint_with_extra_traps(
             x, y = coordinate.as_tensor().clone().detach().to(dtype=torch.float16).tolist()
             x_, y_ = expected_greedy_positions[scenario_idx][qubit_id]
             assert (x == x_) and (y == y_)
+
+
+def test_embedding_mismatch_and_quality_report() -> None:
+    device = DeviceType.DIGITAL_ANALOG_DEVICE.value
+    generator = torch.Generator().manual_seed(0)
+    Q = 10 * torch.rand((5, 5), generator=generator, dtype=torch.float64)
+    Q = Q + Q.T
+    coords = 5 * torch.randn((3, 5, 2), generator=generator, dtype=torch.float64)
+
+    expected = torch.tensor(
+        [
+            sum(
+                abs(Q[i, j] - device.interaction_coeff / torch.norm(c[i] - c[j]) ** 6)
+                for i in range(5)
+                for j in range(i + 1, 5)
+            )
+            for c in coords
+        ],
+        dtype=torch.float64,
+    )
+    assert torch.allclose(embedding_mismatch(Q, coords, device), expected)
+    assert torch.allclose(embedding_mismatch(Q.numpy(), coords[0].numpy(), device), expected[0])
+
+    report = embedding_quality_report(Q, coords[0], device)
+    assert report.total_mismatch == pytest.approx(float(expected[0]))
+    assert report.mean_mismatch == pytest.approx(float(expected[0]) / 10)
+    i, j = report.worst_pair
+    worst = abs(Q[i, j] - device.interaction_coeff / torch.norm(coords[0, i] - coords[0, j]) ** 6)
+    assert i < j and report.max_mismatch == pytest.approx(float(worst))
+    assert 0 < report.min_distance <= report.max_distance
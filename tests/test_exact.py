@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import pytest
+import torch
+
+from qubosolver import QUBOInstance
+from qubosolver.algorithms.exact import branch_and_bound, brute_force, exact_solve
+from qubosolver.classical_solver import get_classical_solver
+from qubosolver.config import SamplerConfig
+
+RandomQubo = Callable[[int, float, torch.Generator], torch.Tensor]
+
+
+def _lowest_energies(Q: torch.Tensor, k: int) -> torch.Tensor:
+    n = Q.shape[0]
+    states = ((torch.arange(2**n)[:, None] >> torch.arange(n)) & 1).double()
+    energies = ((states @ Q.double()) * states).sum(1)
+    return torch.sort(energies).values[:k].float()
+
+
+@pytest.mark.parametrize("size", [1, 7, 14])
+@pytest.mark.parametrize("block_size", [4, 16])
+def test_exact_searches_match_enumeration(size: int, block_size: int) -> None:
+    generator = torch.Generator().manual_seed(size)
+    Q = torch.randn((size, size), generator=generator)
+    Q = Q + Q.T
+    expected = _lowest_energies(Q, 5)
+
+    for search in (brute_force, branch_and_bound):
+        bitstrings, costs, complete = search(Q, top_k=5, block_size=block_size)
+        assert complete
+        assert torch.allclose(costs, expected, atol=1e-4)
+        energies = ((bitstrings.double() @ Q.double()) * bitstrings.double()).sum(1)
+        assert torch.allclose(energies.float(), costs, atol=1e-4)
+        assert torch.unique(bitstrings, dim=0).shape[0] == bitstrings.shape[0]
+
+
+def test_exact_solver(random_qubo: RandomQubo) -> None:
+    Q = random_qubo(12, 0.4, torch.Generator().manual_seed(2))
+    instance = QUBOInstance(coefficients=Q.to_sparse())
+
+    sampler = SamplerConfig(top_k=4)
+    solver = get_classical_solver(instance, {"classical_solver_type": "exact", "sampler": sampler})
+    solution = solver.solve()
+    assert solver.optimal
+    assert torch.allclose(solution.costs, _lowest_energies(Q, 4), atol=1e-5)
+
+    # Branch-and-bound finds the same states as enumeration
+    bitstrings, costs, complete = exact_solve(Q, top_k=4, max_enumeration_size=4)
+    assert complete
+    assert torch.allclose(costs, solution.costs, atol=1e-5)
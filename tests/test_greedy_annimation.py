@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+import pytest
 import torch
 from qoolqit._solvers.types import DeviceType
 
-from qubosolver.algorithms.greedy.greedy import Greedy
-from qubosolver.qubo_types import LayoutType
+from qubosolver.algorithms.greedy.greedy import Greedy, LazyMismatch
+from qubosolver.qubo_types import GreedyStrategyType, LayoutType
 
 
 def _toy_qubo() -> torch.Tensor:
@@ -89,3 +90,93 @@ def test_greedy_animation_calls_renderer(monkeypatch: Any) -> None:
     Greedy().launch_greedy(Q=Q, params=params)
 
     assert called["count"] >= 1
+
+
+def test_greedy_lazy_mismatch_matches_dense() -> None:
+    Q = _toy_qubo()
+    n = Q.shape[0]
+    params = _base_params(n)
+    greedy = Greedy()
+    _, coordinates = greedy.get_predefined_coordinates(params)
+
+    Z = greedy.precompute_coefficients(Q, coordinates, params)
+    lazy = greedy.lazy_coefficients(Q, coordinates, params)
+    assert lazy.shape == Z.shape
+    for index in [(0, 1, 2, 3), (4, 2, 0, 8), (1, 3, 5, 5)]:
+        assert torch.equal(lazy[index], Z[index])
+    placed, placed_traps, traps = torch.tensor([1, 3]), torch.tensor([0, 4]), torch.tensor([2, 5])
+    expected = Z[2][placed][:, traps][:, :, placed_traps].diagonal(dim1=0, dim2=2).sum(1)
+    assert torch.allclose(lazy.candidate_sums(2, placed, placed_traps, traps).float(), expected)
+
+    results = [
+        Greedy().launch_greedy(Q=Q, params={**params, "lazy_mismatch": lazy_mismatch})
+        for lazy_mismatch in (False, True)
+    ]
+    assert results[0][0][0] == results[1][0][0]
+    assert torch.equal(results[0][2], results[1][2])
+
+
+def test_greedy_vectorized_reductions() -> None:
+    Q = _toy_qubo()
+    n = Q.shape[0]
+    params = _base_params(n)
+    greedy = Greedy()
+    _, coordinates = greedy.get_predefined_coordinates(params)
+    Z = greedy.precompute_coefficients(Q, coordinates, params)
+
+    positioned = {0, 3}
+    assert greedy.get_best(Q, positioned, set(range(n))) == 4  # Q[4, 0] + Q[4, 3] is largest
+
+    positioned_coords = {j: tuple(greedy.MAPPING_POSITIONS_COORDS[t]) for j, t in [(0, 1), (3, 4)]}
+    all_traps, used_traps = set(range(n + 4)), {1, 4}
+    choice, _, min_val, candidates = greedy.optimize_position(
+        Z, 2, positioned, positioned_coords, all_traps, used_traps, return_candidates=True
+    )
+    expected = {p: float(Z[2, 0, p, 1] + Z[2, 3, p, 4]) for p in all_traps - used_traps}
+    assert {p for p, _ in candidates} == set(expected)
+    assert all(abs(value - expected[p]) < 1e-4 for p, value in candidates)
+    assert abs(min_val - min(expected.values())) < 1e-4 and expected[choice] == min(
+        expected.values()
+    )
+
+
+def test_greedy_parallel_and_batched_starts() -> None:
+    Q = _toy_qubo()
+    n = Q.shape[0]
+    params = _base_params(n)
+
+    greedy = Greedy()
+    greedy.get_predefined_coordinates(params)
+    assert len(greedy.MAPPING_COORDS_POSITIONS) == n + 4
+    assert len(Greedy.MAPPING_COORDS_POSITIONS) == 0  # the layout is per instance
+    with pytest.raises(TypeError):
+        greedy.MAPPING_COORDS_POSITIONS[(0.0, 0.0)] = 0  # type: ignore[index]
+
+    serial = Greedy().launch_greedy(Q=Q, params=params)
+    for extra in ({"num_workers": 3}, {"strategy": GreedyStrategyType.BATCHED}):
+        result = Greedy().launch_greedy(Q=Q, params={**params, **extra})
+        assert result[0][0] == serial[0][0]
+        assert torch.equal(result[2], serial[2])
+        assert float(result[0][1]["distance"]) == pytest.approx(float(serial[0][1]["distance"]))
+
+
+def test_greedy_beam_search() -> None:
+    Q = _toy_qubo()
+    n = Q.shape[0]
+    params = {**_base_params(n), "strategy": GreedyStrategyType.BEAM}
+
+    greedy = Greedy()
+    layout, coordinates = greedy.get_predefined_coordinates(params)
+    U = greedy.precompute_interactions(coordinates, params)
+    incumbent: dict = {}
+    start = int(torch.argmax(Q.abs().sum(1)))
+    greedy.greedy_algorithm(LazyMismatch(Q, U), Q, layout, start, incumbent, params)
+
+    for beam_width in (1, 4):
+        best, _, coords, _, _ = Greedy().launch_greedy(
+            Q=Q, params={**params, "beam_width": beam_width}
+        )
+        assert tuple(coords.shape) == (n, 2)
+        assert len({tuple(c) for c in coords.tolist()}) == n
+        # never worse than the greedy pass bounding the search
+        assert float(best[1]["distance"]) <= float(incumbent[start]["distance"]) + 1e-3
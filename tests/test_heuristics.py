@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import time
+from typing import Callable
+
 import pytest
 import torch
 
 from qubosolver import QUBOInstance, QUBOSolution
-from qubosolver.config import ClassicalConfig, SolverConfig
+from qubosolver.classical_solver import get_classical_solver
+from qubosolver.config import ClassicalConfig, PortfolioConfig, SamplerConfig, SolverConfig
 from qubosolver.solver import QuboSolver
 
+RandomQubo = Callable[[int, float, torch.Generator], torch.Tensor]
+
 
 def test_qubo_solver_dwave_SA() -> None:
     # Create a simple 2x2 QUBO instance.
@@ -72,5 +78,179 @@ def test_qubo_solver_dwave_tabu() -> None:
     assert pytest.approx(actual_cost, rel=1e-3) == expected_cost
 
 
+@pytest.mark.parametrize("solver_type", ["dwave_sa", "dwave_tabu"])
+def test_seeded_sampler_parameters(solver_type: str, random_qubo: RandomQubo) -> None:
+    Q = random_qubo(12, 1.0, torch.Generator().manual_seed(0))
+    instance = QUBOInstance(coefficients=Q)
+
+    sampler = SamplerConfig(num_reads=4, seed=1234, num_sweeps=50, timeout=5)
+    config = SolverConfig(
+        use_quantum=False,
+        classical=ClassicalConfig(classical_solver_type=solver_type, sampler=sampler),
+    )
+
+    first = QuboSolver(instance, config).solve()
+    second = QuboSolver(instance, config).solve()
+
+    assert first.bitstrings.shape == (4, 12)
+    if solver_type == "dwave_sa":
+        # Tabu search is time-limited, so only simulated annealing is fully deterministic
+        assert torch.equal(first.bitstrings, second.bitstrings)
+    assert torch.allclose(first.costs, instance.evaluate_solutions(first.bitstrings))
+
+
+def test_sampler_parameters_from_dict() -> None:
+    instance = QUBOInstance(coefficients=torch.eye(3))
+    solver = get_classical_solver(
+        instance, {"classical_solver_type": "dwave_sa", "sampler": {"num_reads": 3, "seed": 7}}
+    )
+    assert solver.sampler_config.simulated_annealing_parameters() == {
+        "num_reads": 3,
+        "seed": 7,
+        "beta_schedule_type": "geometric",
+    }
+    assert solver.solve().bitstrings.shape == (3, 3)
+
+    with pytest.raises(ValueError):
+        SamplerConfig(num_reads=0)
+
+    # Each solver reads its own count, which the others leave to their defaults
+    sampler = SamplerConfig(num_reads=3, num_restarts=4, num_temperatures=5, top_k=6)
+    assert sampler.native_tabu_parameters()["num_restarts"] == 4
+    assert sampler.parallel_tempering_parameters()["num_replicas"] == 5
+    assert sampler.exact_parameters()["top_k"] == 6
+    sampler = SamplerConfig(num_reads=3)
+    assert "num_restarts" not in sampler.native_tabu_parameters()
+    assert "num_replicas" not in sampler.parallel_tempering_parameters()
+    assert "top_k" not in sampler.exact_parameters()
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_native_simulated_annealing(sparse: bool, random_qubo: RandomQubo) -> None:
+    Q = random_qubo(12, 0.4, torch.Generator().manual_seed(0))
+    instance = QUBOInstance(coefficients=Q.to_sparse() if sparse else Q)
+
+    sampler = SamplerConfig(num_reads=50, num_sweeps=200, seed=3)
+    config = {"classical_solver_type": "simulated_annealing", "sampler": sampler}
+    first = get_classical_solver(instance, config).solve()
+    second = get_classical_solver(instance, config).solve()
+
+    assert torch.equal(first.bitstrings, second.bitstrings)
+    assert first.counts is not None and int(first.counts.sum()) == 50
+    assert torch.unique(first.bitstrings, dim=0).shape[0] == first.bitstrings.shape[0]
+    assert torch.all(first.costs[:-1] <= first.costs[1:])
+    reference = QUBOInstance(coefficients=Q).evaluate_solutions(first.bitstrings)
+    assert torch.allclose(first.costs, reference, atol=1e-5)
+
+    # Compare with the exhaustive optimum
+    states = (torch.arange(2**12)[:, None] >> torch.arange(12)) & 1
+    optimum = QUBOInstance(coefficients=Q).evaluate_solutions(states.float()).min()
+    assert first.costs[0] == pytest.approx(float(optimum), abs=1e-5)
+
+
+def test_parallel_tempering(random_qubo: RandomQubo) -> None:
+    Q = random_qubo(14, 0.5, torch.Generator().manual_seed(1))
+    instance = QUBOInstance(coefficients=Q)
+    states = ((torch.arange(2**14)[:, None] >> torch.arange(14)) & 1).float()
+    optimum = float(instance.evaluate_solutions(states).min())
+
+    sampler = SamplerConfig(num_temperatures=8, num_sweeps=300, seed=5)
+    config = {"classical_solver_type": "parallel_tempering", "sampler": sampler}
+    solution = get_classical_solver(instance, config).solve()
+    assert solution.counts is not None and int(solution.counts.sum()) == 8
+    assert solution.costs[0] == pytest.approx(optimum, abs=1e-5)
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+    assert torch.equal(
+        solution.bitstrings, get_classical_solver(instance, config).solve().bitstrings
+    )
+
+    # Reaching the target energy stops the search early
+    sampler = SamplerConfig(
+        num_temperatures=8, num_sweeps=10**6, seed=5, target_energy=optimum + 1e-4
+    )
+    config = {"classical_solver_type": "parallel_tempering", "sampler": sampler}
+    assert get_classical_solver(instance, config).solve().costs[0] == pytest.approx(optimum)
+
+
+def test_native_tabu_search() -> None:
+    Q = torch.tensor([[-2.0, 1.0, 0.0], [1.0, -2.0, 3.0], [0.0, 3.0, -1.0]])
+    instance = QUBOInstance(coefficients=Q)
+    sampler = SamplerConfig(num_restarts=4, seed=0, max_iterations=50)
+    solution = get_classical_solver(
+        instance, {"classical_solver_type": "tabu", "sampler": sampler}
+    ).solve()
+
+    assert solution.counts is not None and int(solution.counts.sum()) == 4
+    assert torch.equal(solution.bitstrings[0], torch.tensor([1.0, 0.0, 1.0]))
+    assert solution.costs[0] == pytest.approx(-3.0)
+
+
+def test_native_stop_callback(random_qubo: RandomQubo) -> None:
+    instance = QUBOInstance(random_qubo(16, 0.4, torch.Generator().manual_seed(2)))
+    sampler = SamplerConfig(
+        num_reads=4, num_restarts=4, num_temperatures=4, num_sweeps=10**6, max_iterations=10**6
+    )
+    for solver_type in ("simulated_annealing", "parallel_tempering", "tabu"):
+        polled: list[float] = []
+
+        def stop(energy: float) -> bool:
+            polled.append(energy)
+            return len(polled) >= 10
+
+        config = {"classical_solver_type": solver_type, "sampler": sampler, "stop_callback": stop}
+        solution = get_classical_solver(instance, config).solve()
+        assert 10 <= len(polled) <= 40
+        assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+
+
+def test_portfolio_solver(random_qubo: RandomQubo) -> None:
+    Q = random_qubo(16, 0.4, torch.Generator().manual_seed(2))
+    instance = QUBOInstance(coefficients=Q)
+    sampler = SamplerConfig(num_reads=4, num_restarts=4, seed=0)
+
+    # Heuristics only: all solvers report, and their solutions are merged
+    portfolio = PortfolioConfig(solvers=["simulated_annealing", "tabu"], time_limit=30.0)
+    solver = get_classical_solver(
+        instance, {"classical_solver_type": "portfolio", "portfolio": portfolio, "sampler": sampler}
+    )
+    solution = solver.solve()
+    assert solution.provenance is not None
+    assert set(solution.provenance) == {"simulated_annealing", "tabu"}
+    assert len(solution.provenance) == solution.bitstrings.shape[0]
+    assert torch.all(solution.costs[:-1] <= solution.costs[1:])
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+
+    # A proof of optimality by CPLEX cancels the race
+    portfolio = PortfolioConfig(solvers=["cplex", "simulated_annealing"], time_limit=30.0)
+    solver = get_classical_solver(
+        instance, {"classical_solver_type": "portfolio", "portfolio": portfolio, "sampler": sampler}
+    )
+    solution = solver.solve()
+    assert solver.optimal
+    assert solution.provenance is not None and "cplex" in solution.provenance
+    assert solution.costs[0] == pytest.approx(float(solution.costs.min()))
+
+    # The incumbent is shared while the solvers run: the first one to reach the target
+    # stops them all, long before the end of their runs
+    states = ((torch.arange(2**16)[:, None] >> torch.arange(16)) & 1).float()
+    optimum = float(instance.evaluate_solutions(states).min())
+    portfolio = PortfolioConfig(
+        solvers=["tabu", "parallel_tempering"], time_limit=60.0, target_energy=optimum + 1e-4
+    )
+    sampler = SamplerConfig(num_restarts=4, seed=0, num_sweeps=10**9, max_iterations=10**6)
+    solver = get_classical_solver(
+        instance, {"classical_solver_type": "portfolio", "portfolio": portfolio, "sampler": sampler}
+    )
+    start = time.perf_counter()
+    solution = solver.solve()
+    assert time.perf_counter() - start < 30.0
+    assert solution.provenance is not None
+    assert set(solution.provenance) <= {"tabu", "parallel_tempering"}
+    assert solution.costs[0] == pytest.approx(optimum, abs=1e-5)
+
+    with pytest.raises(ValueError):
+        PortfolioConfig(solvers=["portfolio"])
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+
+from qubosolver import QUBOInstance, QUBOSolution
+from qubosolver.algorithms.local_search import (
+    IncrementalLocalSearch,
+    batched_local_search,
+    tabu_search,
+)
+from qubosolver.config import SolverConfig
+from qubosolver.pipeline.fixtures import Fixtures, bit_flip_local_search
+from qubosolver.qubo_types import LocalSearchType
+
+
+def _random_instance(n: int, seed: int, storage: str = "dense") -> QUBOInstance:
+    generator = torch.Generator().manual_seed(seed)
+    Q = torch.rand((n, n), generator=generator)
+    Q = Q + Q.T
+    Q.diagonal().copy_(-8.0 * torch.rand(n, generator=generator))
+    return QUBOInstance(Q, storage=storage)
+
+
+@pytest.mark.parametrize("storage", ["dense", "csr"])
+def test_gains_match_flip_energies(storage: str) -> None:
+    instance = _random_instance(8, seed=1, storage=storage)
+    engine = IncrementalLocalSearch(instance.coefficients)
+    x = np.array([1, 0, 1, 1, 0, 0, 1, 0])
+
+    energy = instance.evaluate_solution(x.tolist())
+    expected = []
+    for i in range(len(x)):
+        flipped = x.copy()
+        flipped[i] = 1 - flipped[i]
+        expected.append(instance.evaluate_solution(flipped.tolist()) - energy)
+
+    assert engine.energy(x) == pytest.approx(energy, abs=1e-4)
+    assert engine.gains(x) == pytest.approx(expected, abs=1e-4)
+
+
+@pytest.mark.parametrize("storage", ["dense", "coo"])
+def test_best_improvement_matches_bit_flip_local_search(storage: str) -> None:
+    instance = _random_instance(12, seed=2, storage=storage)
+    engine = IncrementalLocalSearch(instance.coefficients)
+    rng = np.random.default_rng(0)
+
+    for _ in range(10):
+        x = rng.integers(0, 2, 12)
+        expected_x, expected_cost = bit_flip_local_search(
+            lambda s: instance.evaluate_solution(s.tolist()), x, shuffle=False
+        )
+        improved_x, cost = engine.search(x, LocalSearchType.BEST_IMPROVEMENT)
+        assert np.array_equal(improved_x, expected_x)
+        assert cost == pytest.approx(expected_cost, abs=1e-4)
+
+
+def test_first_improvement_reaches_local_optimum() -> None:
+    instance = _random_instance(12, seed=3)
+    engine = IncrementalLocalSearch(instance.coefficients)
+    rng = np.random.default_rng(1)
+
+    x = rng.integers(0, 2, 12)
+    improved_x, cost = engine.search(x, LocalSearchType.FIRST_IMPROVEMENT, rng=rng)
+
+    assert cost <= instance.evaluate_solution(x.tolist()) + 1e-6
+    assert cost == pytest.approx(instance.evaluate_solution(improved_x.tolist()), abs=1e-4)
+    assert (engine.gains(improved_x) >= -1e-6).all()
+
+
+@pytest.mark.parametrize("storage", ["dense", "csr"])
+def test_batched_matches_per_sample_search(storage: str) -> None:
+    instance = _random_instance(12, seed=4, storage=storage)
+    engine = IncrementalLocalSearch(instance.coefficients)
+    generator = torch.Generator().manual_seed(5)
+
+    bitstrings = torch.randint(0, 2, (20, 12), generator=generator).float()
+    # Repeated shots are optimized once and scattered back in input order
+    bitstrings = torch.cat([bitstrings, bitstrings[:5]])
+    improved, costs = batched_local_search(instance.coefficients, bitstrings)
+
+    assert improved.shape == bitstrings.shape
+    for x, improved_x, cost in zip(bitstrings.numpy(), improved.numpy(), costs):
+        expected_x, expected_cost = engine.search(x, LocalSearchType.BEST_IMPROVEMENT)
+        assert np.array_equal(improved_x, expected_x)
+        assert float(cost) == pytest.approx(expected_cost, abs=1e-4)
+
+
+def test_postprocess_batched_strategy() -> None:
+    instance = _random_instance(10, seed=6)
+    config = SolverConfig(do_postprocessing=True, postprocessing_strategy=LocalSearchType.BATCHED)
+    bitstrings = torch.randint(0, 2, (8, 10), generator=torch.Generator().manual_seed(7)).float()
+    solution = QUBOSolution(bitstrings, instance.evaluate_solutions(bitstrings))
+
+    improved = Fixtures(instance, config).postprocess(solution)
+
+    assert (improved.costs <= solution.costs + 1e-4).all()
+    assert torch.allclose(
+        improved.costs, instance.evaluate_solutions(improved.bitstrings), atol=1e-4
+    )
+
+
+@pytest.mark.parametrize("storage", ["dense", "coo"])
+def test_tabu_search_reaches_optimum(storage: str) -> None:
+    instance = _random_instance(12, seed=8, storage=storage)
+    states = ((torch.arange(2**12)[:, None] >> torch.arange(12)) & 1).float()
+    optimum = float(instance.evaluate_solutions(states).min())
+
+    bitstrings, costs = tabu_search(
+        instance.coefficients, num_restarts=4, max_iterations=200, num_workers=2, seed=3
+    )
+    again, _ = tabu_search(
+        instance.coefficients, num_restarts=4, max_iterations=200, num_workers=2, seed=3
+    )
+
+    assert bitstrings.shape == (4, 12)
+    assert torch.equal(bitstrings, again)
+    assert torch.allclose(costs, instance.evaluate_solutions(bitstrings), atol=1e-4)
+    assert float(costs.min()) == pytest.approx(optimum, abs=1e-4)
+
+
+def test_postprocess_tabu_strategy() -> None:
+    instance = _random_instance(10, seed=6)
+    config = SolverConfig(do_postprocessing=True, postprocessing_strategy=LocalSearchType.TABU)
+    bitstrings = torch.randint(0, 2, (8, 10), generator=torch.Generator().manual_seed(7)).float()
+    bitstrings[1] = bitstrings[0]
+    solution = QUBOSolution(bitstrings, instance.evaluate_solutions(bitstrings))
+
+    improved = Fixtures(instance, config).postprocess(solution)
+
+    assert improved.bitstrings.shape == bitstrings.shape
+    assert torch.equal(improved.bitstrings[0], improved.bitstrings[1])
+    assert (improved.costs <= solution.costs + 1e-4).all()
+    assert torch.allclose(
+        improved.costs, instance.evaluate_solutions(improved.bitstrings), atol=1e-4
+    )
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import torch
 
 from qubosolver import QUBOInstance, QUBOSolution
 from qubosolver.config import SolverConfig
+from qubosolver.pipeline import PreprocessingCache
 from qubosolver.pipeline.fixtures import (
     Fixtures,
     dwave_roof_duality_fixing,
+    hansen_fixed_indices,
     hansen_fixing,
 )
 from qubosolver.qubo_types import SolutionStatusType
@@ -28,6 +32,9 @@ def test_apply_full_and_post_process_fixation() -> None:
 
     assert fix_class.fixed_var_dict_list == [{0: 1, 3: 1}, {0: 0, 1: 0}]
     assert fix_class.n_fixed_variables > 0
+    # The Hansen worklist follows the reduced instance
+    assert fix_class.hansen_worklist is not None
+    assert fix_class.hansen_worklist.shape[0] == fix_class.reduced_qubo.coefficients.shape[0]
 
     assert isinstance(fix_class.reduced_qubo, QUBOInstance)
 
@@ -42,6 +49,28 @@ def test_apply_full_and_post_process_fixation() -> None:
     assert val_red == -153
 
 
+def test_post_process_fixation_restores_costs() -> None:
+    generator = torch.Generator().manual_seed(0)
+    matrix = torch.rand((12, 12), generator=generator)
+    matrix = matrix + matrix.T
+    matrix.diagonal().copy_(-6.0 * torch.rand(12, generator=generator))
+    qubo = QUBOInstance(matrix)
+
+    fix_class = Fixtures(qubo, SolverConfig(do_preprocessing=True))
+    fix_class.reduce_qubo({0: 1, 4: 0, 7: 1})
+    fix_class.fixed_var_dict_list.append({0: 1, 4: 0, 7: 1})
+    fix_class.reduce_qubo({2: 1})
+    fix_class.fixed_var_dict_list.append({2: 1})
+
+    reduced = torch.randint(0, 2, (6, 8), generator=generator).float()
+    restored = fix_class.post_process_fixation(QUBOSolution(reduced, torch.zeros(6)))
+
+    assert restored.bitstrings.shape == (6, 12)
+    assert (restored.bitstrings[:, [0, 4, 7, 3]] == torch.tensor([1.0, 0.0, 1.0, 1.0])).all()
+    assert torch.equal(restored.bitstrings[:, fix_class.kept_indices], reduced)
+    assert torch.allclose(restored.costs, qubo.evaluate_solutions(restored.bitstrings), atol=1e-4)
+
+
 def test_hansen_fixing() -> None:
     matrix_reducible = torch.tensor([[-10, 1], [1, -10]], dtype=torch.int32)
 
@@ -62,6 +91,23 @@ def test_hansen_fixing() -> None:
     assert empty_fixed_var == {}
 
 
+def test_hansen_fixing_sparse_and_worklist() -> None:
+    matrix = torch.tensor(
+        [[-98, 2, 13, 1], [2, -12, 20, 15], [13, 20, -34, 7], [1, 15, 7, -57]],
+        dtype=torch.float32,
+    )
+
+    assert hansen_fixing(QUBOInstance(matrix, storage="coo")) == {0: 1, 3: 1}
+    assert hansen_fixing(QUBOInstance(matrix, storage="csr")) == {0: 1, 3: 1}
+
+    fixed_to_zero, fixed_to_one = hansen_fixed_indices(matrix)
+    assert fixed_to_zero.tolist() == []
+    assert fixed_to_one.tolist() == [0, 3]
+
+    # Worklist mode only examines the given rows
+    assert hansen_fixing(QUBOInstance(matrix), rows=torch.tensor([1, 2, 3])) == {3: 1}
+
+
 def test_dwave_roof_duality_fixing() -> None:
     matrix_reducible = torch.tensor([[-10, 1], [1, -10]], dtype=torch.int32)
 
@@ -100,6 +146,17 @@ def test_reduce_qubo() -> None:
         torch.tensor([[22, 20], [20, 6]], dtype=torch.int32),
     )
 
+    assert fix_class.kept_indices.tolist() == [1, 2]
+
+    sparse_fix_class = Fixtures(QUBOInstance(matrix, storage="coo"), config)
+    sparse_fix_class.reduce_qubo({0: 1, 3: 1})
+
+    assert sparse_fix_class.reduced_qubo.is_sparse
+    assert torch.equal(
+        sparse_fix_class.reduced_qubo.to_dense(),
+        torch.tensor([[22.0, 20.0], [20.0, 6.0]]),
+    )
+
     fix_class_not_reduced = Fixtures(qubo, config)
 
     fix_class_not_reduced.reduce_qubo({})
@@ -113,6 +170,24 @@ def test_reduce_qubo() -> None:
     )
 
 
+def test_reduced_qubo_is_copy_on_write() -> None:
+    matrix = torch.tensor(
+        [[-98, 2, 13, 1], [2, -12, 20, 15], [13, 20, -34, 7], [1, 15, 7, -57]],
+        dtype=torch.float32,
+    )
+    qubo = QUBOInstance(matrix)
+    fix_class = Fixtures(qubo, SolverConfig(do_preprocessing=True))
+
+    # No copy until a variable is fixed
+    assert fix_class.reduced_qubo is qubo
+    fix_class.reduce_qubo({})
+    assert fix_class.reduced_qubo is qubo
+
+    fix_class.reduce_qubo({0: 1, 3: 1})
+    assert fix_class.reduced_qubo is not qubo
+    assert torch.equal(qubo.coefficients, matrix)
+
+
 def test_apply_rule() -> None:
     matrix = torch.tensor(
         [[-98, 2, 13, 1], [2, -12, 20, 15], [13, 20, -34, 7], [1, 15, 7, -57]],
@@ -237,3 +312,65 @@ def test_classical_prepostprocessing(
     solution = solver.solve()
     assert solution.solution_status == SolutionStatusType.PREPOSTPROCESSED
     assert len(solution.bitstrings[0]) == qubo_instance_for_preprocessing.size
+
+
+def test_preprocess_follows_do_preprocessing() -> None:
+    matrix = torch.tensor(
+        [[-98, 2, 13, 1], [2, -12, 20, 15], [13, 20, -34, 7], [1, 15, 7, -57]],
+        dtype=torch.float32,
+    )
+
+    # Preprocessing runs without postprocessing
+    fix_class = Fixtures(QUBOInstance(matrix), SolverConfig(do_preprocessing=True))
+    fix_class.preprocess()
+    assert fix_class.fixed_var_dict_list == [{0: 1, 3: 1}, {0: 0, 1: 0}]
+
+    # Postprocessing alone does not trigger it
+    fix_class = Fixtures(QUBOInstance(matrix), SolverConfig(do_postprocessing=True))
+    fix_class.preprocess()
+    assert fix_class.fixed_var_dict_list == []
+
+
+def test_preprocessing_cache(tmp_path: Path) -> None:
+    matrix = torch.tensor(
+        [[-98, 2, 13, 1], [2, -12, 20, 15], [13, 20, -34, 7], [1, 15, 7, -57]],
+        dtype=torch.float32,
+    )
+    config = SolverConfig(
+        do_preprocessing=True,
+        do_postprocessing=True,
+        preprocessing_cache=True,
+        preprocessing_cache_dir=str(tmp_path),
+    )
+
+    first = Fixtures(QUBOInstance(matrix), config)
+    first.preprocess()
+    assert not first.cache_hit
+
+    # The fingerprint does not depend on the storage layout
+    second = Fixtures(QUBOInstance(matrix, storage="coo"), config)
+    second.preprocess()
+    assert second.cache_hit
+    assert second.fixed_var_dict_list == first.fixed_var_dict_list
+    assert second.fixed_energy == first.fixed_energy
+
+    # The cache keeps its own copy of the tensors
+    first.fixed_values.fill_(-1.0)
+    first.kept_indices.fill_(0)
+    reused = Fixtures(QUBOInstance(matrix), config)
+    reused.preprocess()
+    assert reused.cache_hit
+    assert torch.equal(reused.fixed_values, second.fixed_values)
+    assert torch.equal(reused.kept_indices, second.kept_indices)
+
+    # Results persisted on disk are found by a fresh cache
+    cache = PreprocessingCache(directory=str(tmp_path))
+    result = cache.get(cache.key(QUBOInstance(matrix), first.fixation_rule_list))
+    assert result is not None
+    assert result.fixed_var_dict_list == first.fixed_var_dict_list
+
+    # Any change in the coefficients is a miss
+    matrix[1, 2] = matrix[2, 1] = 21
+    third = Fixtures(QUBOInstance(matrix), config)
+    third.preprocess()
+    assert not third.cache_hit
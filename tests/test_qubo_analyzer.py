@@ -5,6 +5,7 @@ import torch
 
 from qubosolver.data import QUBOSolution
 from qubosolver.qubo_analyzer import QUBOAnalyzer
+from qubosolver.qubo_instance import QUBOInstance
 
 
 # @VV: I didn't get, should I define it as a fixture?
@@ -97,3 +98,9 @@ def test_add_probs(analyzer: QUBOAnalyzer) -> None:
 def test_calculate_gaps(analyzer: QUBOAnalyzer) -> None:
     df = analyzer.calculate_gaps(opt_cost=1.0)
     assert "gaps" in df.columns
+
+
+def test_calculate_costs(analyzer: QUBOAnalyzer) -> None:
+    Q = QUBOInstance(torch.tensor([[-1.0, 0.5, 0.2], [0.5, -2.0, 0.3], [0.2, 0.3, -3.0]]))
+    df = analyzer.calculate_costs(Q)
+    assert df["costs"].tolist() == pytest.approx([-2.0, -3.6])
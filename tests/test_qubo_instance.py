@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pytest
+import torch
+
+from qubosolver import QUBOInstance
+from qubosolver.classical_solver.classical_solver_conversion_tools import (
+    qubo_instance_to_dimod_bqm,
+    qubo_instance_to_sparsepairs,
+)
+from qubosolver.data import QUBOSolution
+from qubosolver.qubo_types import StorageType
+from qubosolver.utils.qubo_eval import calculate_qubo_costs
+
+
+@pytest.fixture
+def sparse_coefficients() -> dict[tuple[int, int], float]:
+    return {(0, 0): -2.0, (1, 1): -1.0, (0, 3): 3.0, (2, 3): 1.5, (4, 4): 2.0}
+
+
+@pytest.mark.parametrize("storage", ["coo", "csr"])
+def test_sparse_storage_matches_dense(
+    sparse_coefficients: dict[tuple[int, int], float], storage: str
+) -> None:
+    dense = QUBOInstance(sparse_coefficients)
+    sparse = QUBOInstance(sparse_coefficients, storage=storage)
+
+    assert sparse.is_sparse
+    assert not dense.is_sparse
+    assert sparse.size == dense.size == 5
+    assert sparse.density == dense.density
+    assert sparse.density_type == dense.density_type
+    assert torch.equal(sparse.to_dense(), dense.coefficients)
+
+    for solution in ([1, 0, 0, 1, 0], [1, 1, 1, 1, 1], [0, 1, 1, 0, 1]):
+        assert sparse.evaluate_solution(solution) == dense.evaluate_solution(solution)
+
+
+def test_sparse_negative_off_diagonal_raises() -> None:
+    with pytest.raises(ValueError, match="Negative off-diagonal coefficient detected."):
+        QUBOInstance({(0, 0): 1.0, (0, 1): -1.0}, storage=StorageType.COO)
+
+
+def test_sparse_set_coefficients(sparse_coefficients: dict[tuple[int, int], float]) -> None:
+    dense = QUBOInstance(sparse_coefficients)
+    sparse = QUBOInstance(sparse_coefficients, storage=StorageType.CSR)
+
+    updates = {(0, 3): 0.5, (1, 2): 4.0, (6, 6): -3.0}
+    dense.set_coefficients(updates)
+    sparse.set_coefficients(updates)
+
+    assert sparse.coefficients.layout == torch.sparse_csr
+    assert sparse.size == dense.size == 7
+    assert sparse.density == dense.density
+    assert torch.equal(sparse.to_dense(), dense.coefficients)
+
+
+def test_auto_storage_uses_density() -> None:
+    size = 100
+    diagonal = {(i, i): -1.0 for i in range(size)}
+    low_density = QUBOInstance(diagonal, storage="auto")
+    assert low_density.is_sparse
+
+    high_density = QUBOInstance(torch.ones(4, 4), storage="auto")
+    assert not high_density.is_sparse
+
+
+def test_sparse_conversions(sparse_coefficients: dict[tuple[int, int], float]) -> None:
+    dense = QUBOInstance(sparse_coefficients)
+    sparse = QUBOInstance(sparse_coefficients, storage=StorageType.COO)
+
+    assert qubo_instance_to_dimod_bqm(sparse) == qubo_instance_to_dimod_bqm(dense)
+
+    sparse_pairs = qubo_instance_to_sparsepairs(sparse)
+    dense_pairs = qubo_instance_to_sparsepairs(dense)
+    assert [(p.ind, p.val) for p in sparse_pairs] == [(p.ind, p.val) for p in dense_pairs]
+
+
+def test_conversions_from_nonzero_entries(
+    sparse_coefficients: dict[tuple[int, int], float],
+) -> None:
+    instance = QUBOInstance(sparse_coefficients)
+
+    bqm = qubo_instance_to_dimod_bqm(instance)
+    assert list(bqm.variables) == [0, 1, 2, 3, 4]
+    assert dict(bqm.linear) == {0: -2.0, 1: -1.0, 2: 0.0, 3: 0.0, 4: 2.0}
+    assert dict(bqm.quadratic) == {(3, 0): 3.0, (3, 2): 1.5}
+
+    sparse_pairs = qubo_instance_to_sparsepairs(instance)
+    assert [(p.ind, p.val) for p in sparse_pairs] == [
+        ([0, 3], [-4.0, 6.0]),
+        ([1], [-2.0]),
+        ([3], [3.0]),
+        ([0, 2], [6.0, 3.0]),
+        ([4], [4.0]),
+    ]
+
+
+@pytest.mark.parametrize("storage", ["dense", "csr"])
+def test_evaluate_solutions_matches_evaluate_solution(storage: str) -> None:
+    generator = torch.Generator().manual_seed(0)
+    coefficients = torch.rand((6, 6), generator=generator)
+    coefficients = coefficients + coefficients.T
+    coefficients.diagonal().sub_(2.0)
+    instance = QUBOInstance(coefficients, storage=storage)
+
+    bitstrings = torch.randint(0, 2, (50, 6), generator=generator)
+    expected = torch.tensor([instance.evaluate_solution(b) for b in bitstrings])
+
+    assert torch.allclose(instance.evaluate_solutions(bitstrings), expected)
+    assert torch.allclose(calculate_qubo_costs(bitstrings, instance.coefficients, 7), expected)
+
+    with pytest.raises(ValueError, match="Solution size does not match"):
+        instance.evaluate_solutions(torch.zeros((2, 5)))
+
+
+def test_calculate_qubo_costs_without_bitstrings() -> None:
+    instance = QUBOInstance(torch.tensor([[-1.0, 2.0], [2.0, -1.0]]))
+
+    assert calculate_qubo_costs(torch.empty(0), instance.coefficients).shape == (0,)
+    assert calculate_qubo_costs(torch.empty((0, 2)), instance.coefficients).shape == (0,)
+    assert QUBOSolution(torch.empty(0), torch.empty(0)).compute_costs(instance).shape == (0,)
+
+    # A single bitstring of an empty QUBO has no cost
+    empty = torch.empty((0, 0))
+    assert torch.equal(calculate_qubo_costs(torch.empty((1, 0)), empty), torch.zeros(1))
+
+
+def test_fingerprint(sparse_coefficients: dict[tuple[int, int], float]) -> None:
+    fingerprints = {
+        QUBOInstance(sparse_coefficients, storage=storage).fingerprint()
+        for storage in ("dense", "coo", "csr")
+    }
+    fingerprints.add(QUBOInstance(sparse_coefficients, dtype=torch.float64).fingerprint())
+    assert len(fingerprints) == 1
+
+    changed = dict(sparse_coefficients)
+    changed[(2, 3)] = 1.0
+    assert QUBOInstance(changed).fingerprint() not in fingerprints
+
+    # Values are hashed exactly: 0.1 rounded to float32 is not 0.1 in float64
+    inexact = dict(sparse_coefficients)
+    inexact[(2, 3)] = 0.1
+    assert (
+        QUBOInstance(inexact).fingerprint()
+        != QUBOInstance(inexact, dtype=torch.float64).fingerprint()
+    )
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+from typing import Callable
+
+import numpy as np
 import pytest
 import torch
 from qoolqit._solvers.data import BackendConfig
 
-from qubosolver.config import EmbeddingConfig, SolverConfig
+from qubosolver.algorithms.exact import exact_solve
+from qubosolver.config import (
+    ClassicalConfig,
+    EmbeddingConfig,
+    HybridConfig,
+    SamplerConfig,
+    SolverConfig,
+)
+from qubosolver.pipeline import EmbeddingCache, clamped_subproblem, impact_neighbourhoods
 from qubosolver.qubo_types import EmbedderType
 from qubosolver.solver import QUBOInstance, QuboSolver, QuboSolverClassical
 
+RandomQubo = Callable[[int, float, torch.Generator], torch.Tensor]
+
 
 @pytest.fixture
 def simple_qubo_instance() -> QUBOInstance:
@@ -56,3 +69,116 @@ def test_run_local_backends(
     )
     solutions = solver.solve()
     assert solutions.costs.min() == torch.tensor(-4.4000)
+
+
+def _block_instance(num_isolated: int) -> QUBOInstance:
+    # Two coupled blocks of 3 and 2 variables, then isolated variables
+    Q = torch.zeros((5 + num_isolated, 5 + num_isolated))
+    Q[:3, :3] = torch.tensor([[-1.0, 2.0, 0.5], [2.0, -2.0, 1.0], [0.5, 1.0, -1.5]])
+    Q[3:5, 3:5] = torch.tensor([[-1.0, 3.0], [3.0, -2.0]])
+    Q.diagonal()[5:] = torch.linspace(-1.0, 1.0, num_isolated)
+    return QUBOInstance(coefficients=Q)
+
+
+def test_component_decomposition_classical() -> None:
+    instance = _block_instance(4)
+    classical = ClassicalConfig(cplex_log_path=None)
+    config = SolverConfig(decompose_components=True, decomposition_workers=2, classical=classical)
+    solver = QuboSolver(instance, config)
+    solution = solver.solve()
+    # The components are embedded by their own solvers
+    assert solver.embedding() is None
+
+    expected = QuboSolver(instance, SolverConfig(classical=classical)).solve()
+    assert solution.costs[0] == pytest.approx(float(expected.costs[0]))
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+    assert solution.best_bound == pytest.approx(float(solution.costs[0]), abs=1e-4)
+    assert solution.bitstrings[0, 5:].tolist() == [1.0, 1.0, 0.0, 0.0]
+
+
+def test_component_decomposition_quantum_size_limit() -> None:
+    # Larger than the quantum limit, but each component fits
+    instance = _block_instance(80)
+    config = SolverConfig(use_quantum=True, decompose_components=True, num_shots=50)
+    solution = QuboSolver(instance, config).solve()
+    assert solution.bitstrings.shape == (solution.costs.shape[0], 85)
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+
+    Q = instance.coefficients.clone()
+    Q[:81, :81] += 0.01 * (1 - torch.eye(81))
+    with pytest.raises(ValueError, match="component size 81"):
+        QuboSolver(QUBOInstance(coefficients=Q), config).solve()
+
+
+def test_clamped_subproblem_and_embedding_cache(random_qubo: RandomQubo) -> None:
+    generator = torch.Generator().manual_seed(3)
+    Q = random_qubo(10, 0.5, generator)
+    instance = QUBOInstance(coefficients=Q)
+    x = (torch.rand(10, generator=generator) < 0.5).float()
+    indices = torch.tensor([1, 4, 5, 8])
+
+    for coefficients in (Q, Q.to_sparse()):
+        subproblem = QUBOInstance(coefficients=clamped_subproblem(coefficients, x, indices))
+        # The energy differences of the free variables are the same in both QUBOs
+        states = ((torch.arange(16)[:, None] >> torch.arange(4)) & 1).float()
+        full = x.repeat(16, 1)
+        full[:, indices] = states
+        energies = instance.evaluate_solutions(full)
+        sub_energies = subproblem.evaluate_solutions(states)
+        assert torch.allclose(energies - energies[0], sub_energies - sub_energies[0], atol=1e-5)
+
+    gains = torch.rand(10, generator=generator)
+    for rng in (None, np.random.default_rng(0)):
+        neighbourhoods = impact_neighbourhoods(Q, gains, 4, generator=rng)
+        assert all(len(neighbourhood) <= 4 for neighbourhood in neighbourhoods)
+        assert torch.equal(torch.cat(neighbourhoods).sort().values, torch.arange(10))
+    assert int(torch.argmin(gains)) in impact_neighbourhoods(Q, gains, 4)[0]
+
+    cache = EmbeddingCache(max_entries=1)
+    key = cache.key(Q)
+    assert cache.key(2 * Q) == key
+    assert cache.key(Q[:9, :9]) != key
+    assert cache.get(key) is None
+    cache.put(key, "register")  # type: ignore[arg-type]
+    assert cache.get(key) == "register" and cache.hits == 1 and cache.misses == 1
+
+
+def test_hybrid_decomposition(random_qubo: RandomQubo) -> None:
+    Q = random_qubo(30, 0.2, torch.Generator().manual_seed(4))
+    instance = QUBOInstance(coefficients=Q)
+    optimum = float(exact_solve(Q)[1][0])
+
+    # The sampler only caps the initial tabu search: the exact solver solves the
+    # subproblems, which have to improve on a poor incumbent
+    config = SolverConfig(
+        hybrid_decomposition=True,
+        hybrid=HybridConfig(subproblem_size=10, stagnation_passes=3, seed=0),
+        classical=ClassicalConfig(
+            classical_solver_type="exact", sampler=SamplerConfig(max_iterations=5)
+        ),
+    )
+    solver = QuboSolver(instance, config)
+    solution = solver.solve()
+    assert solver.embedding() is None
+    energies = solver._solver.energies  # type: ignore[attr-defined]
+    assert all(later <= earlier + 1e-6 for earlier, later in zip(energies, energies[1:]))
+    assert energies[-1] < energies[0]
+    assert solution.costs[0] == pytest.approx(optimum, abs=1e-4)
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+
+
+def test_hybrid_decomposition_quantum(random_qubo: RandomQubo) -> None:
+    Q = random_qubo(12, 0.3, torch.Generator().manual_seed(0))
+    instance = QUBOInstance(coefficients=Q)
+    config = SolverConfig(
+        use_quantum=True,
+        num_shots=50,
+        hybrid_decomposition=True,
+        hybrid=HybridConfig(subproblem_size=4, max_passes=1, seed=1),
+    )
+    solver = QuboSolver(instance, config)
+    solution = solver.solve()
+    assert solution.bitstrings.shape == (1, 12)
+    assert torch.allclose(solution.costs, instance.evaluate_solutions(solution.bitstrings))
+    cache = solver._solver.embedding_cache  # type: ignore[attr-defined]
+    assert len(cache) <= cache.misses and cache.hits + cache.misses >= 3